@@ -1,11 +1,74 @@
 # booking/admin.py
+from django import forms
 from django.contrib import admin
+from django.db.models import Count
+from django.http import HttpResponseRedirect
+from django.utils import timezone
 from django.utils.html import format_html
-from . import models
+from . import campaigns, models, sharding
+from .paginators import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    수백만 행 테이블용 관리자 기본 설정
+    - 전체 개수는 플래너 통계로 추정 (정확한 COUNT(*) 대신)
+    - 검색 시 "전체 N건" 표시를 위한 두 번째 COUNT(*) 생략
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class ShardedModelAdmin(admin.ModelAdmin):
+    """
+    샤드 모델 관리 화면 - 샤딩(booking/sharding.py) 사용 시 한 번에 샤드 하나
+    - 목록 / 자동완성은 목록 상단에서 선택한 샤드 (?shard=별칭 -> 세션에 저장, 기본: 첫 번째 샤드)
+    - 수정 / 삭제 화면은 URL의 ID로 샤드를 찾음 (ShardMiddleware)
+    - 추가한 객체는 입력한 지점 / 테마 / 예약의 샤드에 저장
+    """
+    change_list_template = 'admin/booking/sharded_change_list.html'
+    # 새 객체의 샤드를 정하는 입력 필드 (앞에서부터 값이 있는 필드 사용)
+    shard_fields = (
+        ('branch', sharding.shard_for_branch),
+        ('theme', sharding.shard_for_id),
+        ('reservation', sharding.shard_for_id),
+    )
+
+    def changelist_view(self, request, extra_context=None):
+        if sharding.ADMIN_SHARD_PARAM in request.GET:
+            # 목록 필터가 아니므로 세션에 저장하고 파라미터 없이 다시 요청 (ChangeList는 모르는 파라미터를 오류로 처리)
+            sharding.select_admin_shard(request, request.GET[sharding.ADMIN_SHARD_PARAM])
+            params = request.GET.copy()
+            del params[sharding.ADMIN_SHARD_PARAM]
+            return HttpResponseRedirect(f'{request.path}?{params.urlencode()}' if params else request.path)
+        if sharding.enabled():
+            extra_context = {**(extra_context or {}), 'shards': sharding.shards(), 'current_shard': sharding.current_shard()}
+        return super().changelist_view(request, extra_context)
+
+    def _shard_from_post(self, request):
+        for field, lookup in self.shard_fields:
+            value = request.POST.get(field, '')
+            if value.isdigit():
+                return lookup(value)
+        return None
+
+    def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
+        if sharding.enabled() and object_id is None and request.method == 'POST':
+            # 입력한 지점 / 테마의 샤드에서 검증하고 저장 (관련 객체 선택지 확인 포함)
+            with sharding.use_shard(self._shard_from_post(request)):
+                return super().changeform_view(request, object_id, form_url, extra_context)
+        return super().changeform_view(request, object_id, form_url, extra_context)
+
+    def response_add(self, request, obj, post_url_continue=None):
+        # 추가한 객체가 보이도록 목록의 샤드를 객체의 샤드로 변경
+        if sharding.enabled():
+            sharding.select_admin_shard(request, obj._state.db)
+        return super().response_add(request, obj, post_url_continue)
+
 
 # 1. Member (회원)
 @admin.register(models.Member)
-class MemberAdmin(admin.ModelAdmin):
+class MemberAdmin(LargeTableAdmin):
     list_display = ('login_id', 'name', 'phone', 'role', 'created_at')
     list_filter = ('role', 'created_at')
     search_fields = ('login_id', 'name', 'phone')
@@ -34,19 +97,26 @@ class BranchAdmin(admin.ModelAdmin):
     list_display = ('branch_name', 'location', 'phone', 'is_active', 'theme_count')
     list_filter = ('is_active',)
     search_fields = ('branch_name', 'location')
+
+    def get_queryset(self, request):
+        # 테마 수는 목록 조회 쿼리에서 함께 집계 (행마다 COUNT 쿼리 X)
+        return super().get_queryset(request).annotate(theme_count=Count('theme'))
     
     def theme_count(self, obj):
         """해당 지점의 테마 개수"""
-        return obj.theme_set.count()
+        return obj.theme_count
     theme_count.short_description = '테마 수'
+    theme_count.admin_order_field = 'theme_count'
 
 # 3. Theme (테마)
 @admin.register(models.Theme)
-class ThemeAdmin(admin.ModelAdmin):
+class ThemeAdmin(ShardedModelAdmin):
     list_display = ('name', 'branch', 'genre', 'difficulty', 'price', 'discount_rate', 'status_badge', 'is_active')
     list_filter = ('branch', 'genre', 'difficulty', 'is_active', 'status')
     search_fields = ('name', 'branch__branch_name', 'genre')
     ordering = ('branch', 'name')
+    list_select_related = ('branch',)
+    readonly_fields = ('campaign',)  # 가격 캠페인(booking/campaigns.py)이 적용 / 해제
     
     # 필드 그룹화
     fieldsets = (
@@ -54,7 +124,7 @@ class ThemeAdmin(admin.ModelAdmin):
             'fields': ('branch', 'name', 'genre', 'difficulty', 'duration')
         }),
         ('가격 정보', {
-            'fields': ('price', 'discount_rate')
+            'fields': ('price', 'discount_rate', 'campaign')
         }),
         ('설명 및 상태', {
             'fields': ('description', 'status', 'is_active')
@@ -77,12 +147,14 @@ class ThemeAdmin(admin.ModelAdmin):
 
 # 4. Reservation (예약)
 @admin.register(models.Reservation)
-class ReservationAdmin(admin.ModelAdmin):
+class ReservationAdmin(ShardedModelAdmin, LargeTableAdmin):
     list_display = ('reservation_id', 'member_name', 'theme', 'reservation_time', 'status_badge', 'total_price', 'num_of_participants')
+    # 날짜 필터는 date_hierarchy 대신 list_filter 사용 (date_hierarchy는 연/월 목록을 전체 테이블에서 집계)
     list_filter = ('status', 'reservation_time', 'theme__branch')
-    search_fields = ('member__name', 'theme__name', 'reservation_id')
+    search_fields = ('member__name', 'theme__name', '=reservation_id')
     ordering = ('-reservation_time',)
-    date_hierarchy = 'reservation_time'  # 날짜별 필터링
+    list_select_related = ('member', 'theme', 'theme__branch')
+    autocomplete_fields = ('member', 'theme')
     
     readonly_fields = ('reservation_id',)
     
@@ -107,23 +179,25 @@ class ReservationAdmin(admin.ModelAdmin):
 
 # 5. Payment (결제)
 @admin.register(models.Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(ShardedModelAdmin, LargeTableAdmin):
     list_display = ('payment_id', 'reservation', 'amount', 'payment_method', 'payment_status', 'paid_at')
     list_filter = ('payment_status', 'payment_method', 'paid_at')
-    search_fields = ('reservation__reservation_id', 'reservation__member__name')
-    ordering = ('-paid_at',)
-    date_hierarchy = 'paid_at'
+    search_fields = ('=reservation__reservation_id', 'reservation__member__name')
+    ordering = ('-payment_id',)  # 결제 순서 = PK 순서 (PK 인덱스로 정렬)
+    list_select_related = ('reservation__member', 'reservation__theme')
+    autocomplete_fields = ('reservation',)
     
     readonly_fields = ('payment_id', 'paid_at')
 
 # 6. Review (리뷰)
 @admin.register(models.Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(ShardedModelAdmin, LargeTableAdmin):
     list_display = ('review_id', 'member_name', 'theme_name', 'rating_stars', 'created_at')
     list_filter = ('rating', 'created_at')
-    search_fields = ('member__name', 'reservation__theme__name', 'comment')
-    ordering = ('-created_at',)
-    date_hierarchy = 'created_at'
+    search_fields = ('member__name', 'theme__name', 'comment')
+    ordering = ('-review_id',)  # 작성 순서 = PK 순서 (PK 인덱스로 정렬)
+    list_select_related = ('member', 'theme')
+    autocomplete_fields = ('reservation', 'member')
     
     readonly_fields = ('review_id', 'created_at')
     
@@ -132,7 +206,7 @@ class ReviewAdmin(admin.ModelAdmin):
     member_name.short_description = '작성자'
     
     def theme_name(self, obj):
-        return obj.reservation.theme.name
+        return obj.theme.name if obj.theme else '-'
     theme_name.short_description = '테마'
     
     def rating_stars(self, obj):
@@ -142,12 +216,15 @@ class ReviewAdmin(admin.ModelAdmin):
 
 # 7. Schedule (직원 스케줄)
 @admin.register(models.Schedule)
-class ScheduleAdmin(admin.ModelAdmin):
+class ScheduleAdmin(ShardedModelAdmin):
     list_display = ('work_date', 'member', 'branch', 'work_time', 'assigned_theme')
-    list_filter = ('work_date', 'branch', 'member')
+    # 직원 필터는 스케줄이 있는 직원만 표시 (전체 회원 목록 X)
+    list_filter = ('work_date', 'branch', ('member', admin.RelatedOnlyFieldListFilter))
     search_fields = ('member__name', 'branch__branch_name')
     ordering = ('-work_date', 'start_time')
     date_hierarchy = 'work_date'
+    list_select_related = ('member', 'branch', 'assigned_theme__branch')
+    autocomplete_fields = ('member', 'branch', 'assigned_theme')
     
     def work_time(self, obj):
         return f"{obj.start_time.strftime('%H:%M')} ~ {obj.end_time.strftime('%H:%M')}"
@@ -161,17 +238,21 @@ class NoticeAdmin(admin.ModelAdmin):
     search_fields = ('title', 'content')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
+    list_select_related = ('member', 'target_branch')
+    autocomplete_fields = ('member', 'target_branch')
     
     readonly_fields = ('created_at',)
 
 # 9. IssueReport (시설 문제 보고)
 @admin.register(models.IssueReport)
-class IssueReportAdmin(admin.ModelAdmin):
+class IssueReportAdmin(ShardedModelAdmin):
     list_display = ('report_id', 'theme', 'reported_by', 'status_badge', 'reported_at')
     list_filter = ('status', 'theme__branch', 'reported_at')
     search_fields = ('theme__name', 'reported_by_member__name', 'issue_description')
     ordering = ('-reported_at',)
     date_hierarchy = 'reported_at'
+    list_select_related = ('theme__branch', 'reported_by_member')
+    autocomplete_fields = ('theme', 'reported_by_member')
     
     readonly_fields = ('report_id', 'reported_at')
     
@@ -212,6 +293,7 @@ class BranchAssignmentAdmin(admin.ModelAdmin):
     list_filter = ('branch', 'member__role', 'assigned_at')
     search_fields = ('member__name', 'member__login_id', 'branch__branch_name')
     ordering = ('branch', 'member')
+    list_select_related = ('branch', 'member')
     
     # 배정일은 자동 생성되므로 읽기 전용으로 설정
     readonly_fields = ('assigned_at',)
@@ -230,4 +312,102 @@ class BranchAssignmentAdmin(admin.ModelAdmin):
             kwargs["queryset"] = models.Member.objects.filter(
                 role__in=['BranchManager', 'ThemeManager']
             ).order_by('name')
-        return super().formfield_for_foreignkey(db_field, request, **kwargs)
\ No newline at end of file
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+# 11. PriceRule (요일/시간대별 가격 규칙)
+@admin.register(models.PriceRule)
+class PriceRuleAdmin(ShardedModelAdmin):
+    list_display = ('name', 'branch', 'theme', 'weekdays', 'start_hour', 'end_hour', 'adjust_rate', 'is_active')
+    list_filter = ('is_active', 'branch')
+    search_fields = ('name', 'theme__name', 'branch__branch_name')
+    list_select_related = ('branch', 'theme__branch')
+    autocomplete_fields = ('branch', 'theme')
+
+# 22. PriceCampaign (가격 캠페인)
+class PriceCampaignAdminForm(forms.ModelForm):
+    # 테마는 샤드 DB에 있으므로 모든 샤드의 테마를 선택지로 만들고 ID 목록으로 저장
+    themes = forms.TypedMultipleChoiceField(
+        coerce=int, required=False, label='적용 테마',
+        widget=forms.SelectMultiple(attrs={'size': 15}),
+    )
+
+    class Meta:
+        model = models.PriceCampaign
+        fields = ('name', 'branches', 'themes', 'rule', 'discount_rate', 'starts_at', 'ends_at')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.status != 'Scheduled':
+            del self.fields['themes']
+            return
+        themes = sharding.gather_queryset(models.Theme.objects.filter(is_active=True).select_related('branch'))
+        self.fields['themes'].choices = [(t.theme_id, str(t)) for t in sorted(themes, key=str)]
+        self.fields['themes'].initial = self.instance.theme_ids
+
+    def clean(self):
+        cleaned_data = super().clean()
+        starts_at, ends_at = cleaned_data.get('starts_at'), cleaned_data.get('ends_at')
+        if starts_at and ends_at and ends_at <= starts_at:
+            raise forms.ValidationError("종료 시각은 시작 시각 이후여야 합니다.")
+        if 'themes' in self.fields and not cleaned_data.get('branches') and not cleaned_data.get('themes'):
+            raise forms.ValidationError("적용할 지점이나 테마를 선택하세요.")
+        return cleaned_data
+
+    def save(self, commit=True):
+        if 'themes' in self.fields:
+            self.instance.theme_ids = self.cleaned_data['themes']
+        return super().save(commit)
+
+
+@admin.register(models.PriceCampaign)
+class PriceCampaignAdmin(admin.ModelAdmin):
+    form = PriceCampaignAdminForm
+    list_display = ('name', 'rule', 'discount_rate', 'starts_at', 'ends_at', 'status', 'theme_count')
+    list_filter = ('status', 'rule')
+    search_fields = ('name',)
+    filter_horizontal = ('branches',)
+    actions = ['start_now', 'end_now']
+
+    def get_readonly_fields(self, request, obj=None):
+        # 시작한 캠페인은 대상 / 할인율을 바꾸지 않음 (종료 시 복원할 값이 달라지므로)
+        if obj is not None and obj.status != 'Scheduled':
+            return ('name', 'branches', 'theme_ids', 'rule', 'discount_rate', 'starts_at', 'ends_at')
+        return ()
+
+    def get_fields(self, request, obj=None):
+        if obj is not None and obj.status != 'Scheduled':
+            return ('name', 'branches', 'theme_ids', 'rule', 'discount_rate', 'starts_at', 'ends_at')
+        return super().get_fields(request, obj)
+
+    @admin.action(description='선택한 예정 캠페인 지금 시작')
+    def start_now(self, request, queryset):
+        count = 0
+        for campaign in queryset.filter(status='Scheduled'):
+            campaign.starts_at = min(campaign.starts_at, timezone.now())
+            campaign.save(update_fields=['starts_at'])
+            count += campaigns.start_campaign(campaign)
+        self.message_user(request, f"테마 {count}개에 캠페인 할인율을 적용했습니다.")
+
+    @admin.action(description='선택한 진행 중 캠페인 지금 종료')
+    def end_now(self, request, queryset):
+        count = 0
+        for campaign in queryset.filter(status='Active'):
+            campaign.ends_at = min(campaign.ends_at, timezone.now())
+            campaign.save(update_fields=['ends_at'])
+            count += campaigns.end_campaign(campaign)
+        self.message_user(request, f"테마 {count}개의 할인율을 복원했습니다.")
+
+# 23. ThemePriceHistory (테마 가격 변경 이력 - 조회 전용)
+@admin.register(models.ThemePriceHistory)
+class ThemePriceHistoryAdmin(ShardedModelAdmin, LargeTableAdmin):
+    list_display = ('theme', 'previous_discount_rate', 'discount_rate', 'previous_price', 'price', 'reason', 'campaign_id', 'changed_at')
+    list_filter = ('reason', 'changed_at')
+    search_fields = ('theme__name',)
+    list_select_related = ('theme__branch',)
+    ordering = ('-changed_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,257 @@
+# booking/admission.py
+"""
+과부하 보호 (예약 오픈 시 봇 / 반복 요청 대응)
+
+- 토큰 버킷 요청 제한: 회원별 / IP별 / 로그인 ID별 (RATE_LIMITS)
+  비밀번호 해시, 예약 트랜잭션을 실행하기 전에 바로 429 + Retry-After 응답
+- 예약 처리 동시 실행 제한 (BOOKING_CONCURRENCY, 모든 서버 합계)
+  자리가 없으면 짧은 대기열(번호표 순서)에서 BOOKING_QUEUE_TIMEOUT 초까지 기다리고, 그래도 없으면 429
+- 상태는 모두 캐시에 저장하고 원자적 연산(add / incr / decr)으로만 갱신
+  (여러 서버가 Redis 캐시(REDIS_URL)를 공유하면 모든 서버에 함께 적용됨 - 기본 LocMem은 프로세스별, booking.W001)
+
+토큰 버킷은 키 하나(정수)로 저장:
+  값 = 지금까지 사용한 토큰 수 + 생성 시점까지 채워진 토큰 수 (초당 rate 개씩, 시각 기준)
+  남은 토큰 = burst + 현재 시각 * rate - 값
+  -> incr 한 번으로 차감과 확인을 같이 하고, 부족하면 decr로 되돌림
+"""
+import logging
+import math
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = 'admission:bucket:{}:{}:{}'
+QUEUE_TAIL_KEY = 'admission:{}:tail'
+QUEUE_HEAD_KEY = 'admission:{}:head'
+SLOT_KEY = 'admission:{}:slot:{}'
+WAIT_STEP = 0.02
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enabled():
+    return _setting('ADMISSION_ENABLED', True)
+
+
+def client_ip(request):
+    """
+    RATE_LIMIT_IP_HEADER (프록시 뒤라면 'HTTP_X_FORWARDED_FOR')
+    X-Forwarded-For의 앞쪽 주소는 클라이언트가 임의로 넣을 수 있으므로, 신뢰하는 프록시 수
+    (RATE_LIMIT_TRUSTED_PROXY_HOPS)만큼 오른쪽에서 센 주소 = 가장 바깥 프록시가 덧붙인 주소를 사용
+    """
+    value = request.META.get(_setting('RATE_LIMIT_IP_HEADER', 'REMOTE_ADDR'), '') or request.META.get('REMOTE_ADDR', '')
+    hops = [hop.strip() for hop in value.split(',') if hop.strip()]
+    if not hops:
+        return ''
+    # 주소가 프록시 수보다 적으면 일부 프록시를 거치지 않은 요청 -> 가장 왼쪽(가장 먼저 기록된) 주소
+    return hops[-min(max(_setting('RATE_LIMIT_TRUSTED_PROXY_HOPS', 1), 1), len(hops))]
+
+
+def too_many_requests(retry_after, message='요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'):
+    response = HttpResponse(message, status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+# ----------------------------------------------------------------------
+# 토큰 버킷
+# ----------------------------------------------------------------------
+def take_token(name, scope, identity, burst, period):
+    """
+    토큰 하나 사용 (burst개까지 모아 둘 수 있고 period초마다 burst개 충전)
+    반환: 0이면 허용, 아니면 다시 시도할 수 있을 때까지의 초
+    """
+    rate = burst / period
+    now = time.time() * rate
+    key = BUCKET_KEY.format(name, scope, identity)
+    # 가득 찬 버킷이 모두 빠진 뒤 period가 지나면 다시 가득 차므로 그 뒤에는 키가 없어도 같음
+    timeout = math.ceil(period) + 1
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        cache.add(key, int(now), timeout)
+        try:
+            used = cache.incr(key)
+        except ValueError:
+            return 0  # 캐시를 쓸 수 없으면 제한하지 않음
+    capacity = burst + now
+    if used > capacity:
+        cache.decr(key)
+        return (used - capacity) / rate
+
+    # 오래 쉬어서 burst보다 많이 쌓인 토큰은 버림
+    excess = int(capacity - used - burst)
+    if excess > 0:
+        cache.incr(key, excess)
+    cache.touch(key, timeout)
+    return 0
+
+
+def check_rate_limits(name, identities):
+    """identities = {범위: 값} 중 RATE_LIMITS[name]에 정의된 범위를 모두 확인 -> 가장 긴 대기 시간 (0이면 허용)"""
+    limits = _setting('RATE_LIMITS', {}).get(name, {})
+    retry_after = 0
+    for scope, (burst, period) in limits.items():
+        identity = identities.get(scope)
+        if identity:
+            retry_after = max(retry_after, take_token(name, scope, identity, burst, period))
+    return retry_after
+
+
+def rate_limit(name, identities, methods=('POST',)):
+    """
+    뷰 데코레이터 - identities(request) -> {범위: 값}
+    예) @rate_limit('login', lambda request: {'ip': client_ip(request), 'login_id': request.POST.get('username')})
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if enabled() and request.method in methods:
+                retry_after = check_rate_limits(name, identities(request))
+                if retry_after:
+                    logger.info("rate limited: %s %s", name, client_ip(request))
+                    metrics.admission_rejected(f'rate_limit:{name}')
+                    return too_many_requests(retry_after)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def member_and_ip(request):
+    return {
+        'ip': client_ip(request),
+        'member': request.user.pk if request.user.is_authenticated else None,
+    }
+
+
+def login_id_and_ip(request):
+    return {
+        'ip': client_ip(request),
+        'login_id': (request.POST.get('username') or '').strip().lower()[:100],
+    }
+
+
+# ----------------------------------------------------------------------
+# 동시 실행 제한 + 대기열
+# ----------------------------------------------------------------------
+class Gate:
+    """
+    name 경로를 동시에 capacity개까지만 실행
+    - 자리 = 만료 시간이 있는 캐시 키 (cache.add로 차지, 서버가 죽어도 lease 후 자동 반환)
+    - 대기열 = 번호표(tail incr)와 처리된 번호(head), 먼저 온 순서대로 입장
+      (앞에서 capacity개 번호까지 자리를 시도 - 포기한 번호도 head를 올리므로 앞 번호가 사라져도 멈추지 않음)
+    - 번호를 받은 프로세스가 죽으면 head를 올리지 못해 번호가 남음
+      -> 대기열이 남아 있는데 자리가 모두 비어 있으면 남은 번호로 보고 head를 tail로 맞춤 (_reset_stale_queue)
+    """
+
+    def __init__(self, name, capacity, queue_size, timeout, lease):
+        self.name = name
+        self.capacity = capacity
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.lease = lease
+
+    def _try_slot(self):
+        offset = random.randrange(self.capacity)
+        for i in range(self.capacity):
+            key = SLOT_KEY.format(self.name, (offset + i) % self.capacity)
+            if cache.add(key, 1, self.lease):
+                return key
+        return None
+
+    def _reset_stale_queue(self, head_key, tail):
+        """
+        살아 있는 대기자가 있으면 앞 capacity개 번호 중 누군가는 자리를 차지하고 있어야 함
+        -> 자리가 모두 비어 있으면 대기열에 남은 번호는 죽은 프로세스의 번호 (대기 중인 요청은 다음 확인 때 바로 입장)
+        """
+        slot_keys = [SLOT_KEY.format(self.name, i) for i in range(self.capacity)]
+        if cache.get_many(slot_keys):
+            return False
+        logger.warning("admission queue %s reset: stale tickets up to %d", self.name, tail)
+        cache.set(head_key, tail, None)
+        return True
+
+    def _leave_queue(self):
+        try:
+            cache.incr(QUEUE_HEAD_KEY.format(self.name))
+        except ValueError:
+            pass
+
+    def acquire(self):
+        """자리 키 또는 None (대기열이 가득 찼거나 시간 초과)"""
+        # 대기자가 없으면 바로 시도
+        head_key, tail_key = QUEUE_HEAD_KEY.format(self.name), QUEUE_TAIL_KEY.format(self.name)
+        counters = cache.get_many([head_key, tail_key])
+        tail, head = counters.get(tail_key, 0), counters.get(head_key, 0)
+        if tail <= head or self._reset_stale_queue(head_key, tail):
+            slot = self._try_slot()
+            if slot:
+                return slot
+
+        cache.add(tail_key, 0, None)
+        ticket = cache.incr(tail_key)
+        # 캐시가 초기화되어 head가 없으면 지금 번호 바로 앞으로 맞춤
+        cache.add(head_key, ticket - 1, None)
+        head = cache.get(head_key, ticket - 1)
+        if ticket - head > self.queue_size:
+            self._leave_queue()
+            return None
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            if ticket <= head + self.capacity:
+                slot = self._try_slot()
+                if slot:
+                    self._leave_queue()
+                    return slot
+            if time.monotonic() >= deadline:
+                self._leave_queue()
+                return None
+            time.sleep(WAIT_STEP)
+            head = cache.get(head_key, ticket - 1)
+
+    def release(self, slot):
+        cache.delete(slot)
+
+
+def booking_gate():
+    return Gate(
+        'booking',
+        capacity=_setting('BOOKING_CONCURRENCY', 8),
+        queue_size=_setting('BOOKING_QUEUE_SIZE', 32),
+        timeout=_setting('BOOKING_QUEUE_TIMEOUT', 2.0),
+        lease=_setting('BOOKING_SLOT_LEASE_SECONDS', 30),
+    )
+
+
+def admit_booking(view_func):
+    """
+    예약 생성 / 결제 확정 POST 보호 (@login_required 와 @sharding.atomic 사이에 둘 것 - 대기 중에는 트랜잭션을 열지 않음)
+    회원별 / IP별 요청 제한 -> 동시 실행 제한 순서로 확인
+    """
+    @rate_limit('reservation', member_and_ip)
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not enabled() or request.method != 'POST':
+            return view_func(request, *args, **kwargs)
+        gate = booking_gate()
+        slot = gate.acquire()
+        if slot is None:
+            logger.info("booking queue full or timed out: member=%s", request.user.pk)
+            metrics.admission_rejected('booking_queue')
+            return too_many_requests(gate.timeout, '예약 요청이 몰리고 있습니다. 잠시 후 다시 시도해주세요.')
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            gate.release(slot)
+    return wrapper
@@ -0,0 +1,272 @@
+# booking/api.py
+"""
+읽기 전용 JSON API (v1) - 모바일 앱 / 제휴 서비스용
+
+- 모든 응답에 버전 스탬프 기반 ETag / Last-Modified 부여 -> 변경이 없으면 본 쿼리 없이 304
+- fields=a,b,c 로 필요한 필드만 선택
+- limit / after 키셋 페이지네이션 (다음 페이지 커서는 next)
+"""
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import BadRequest
+from django.http import Http404, JsonResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+from . import sharding
+from .models import Branch, Theme, Reservation, ThemePrice, SlotHold
+from .pricing import slot_start, upcoming_price_range, lowest_upcoming_price
+from .reviews import rating_summary, review_page
+from .object_cache import get_theme_or_404
+from .stamps import latest_stamp
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# 현재 시각에 따라 내용이 바뀌는 응답 (지난 슬롯 제외한 최저 가격, 슬롯 예약 가능 여부)
+TIME_DEPENDENT_VIEWS = {'api-themes', 'api-theme-detail', 'api-theme-availability'}
+
+
+# ----------------------------------------------------------------------
+# 조건부 GET (ETag / Last-Modified)
+# ----------------------------------------------------------------------
+def _stamp_names(request, **kwargs):
+    """요청 경로별로 응답 내용에 영향을 주는 스탬프 이름"""
+    theme_id = kwargs.get('theme_id')
+    name = request.resolver_match.url_name
+    if name == 'api-branches':
+        return ['branches']
+    if name == 'api-themes':
+        return ['themes', 'branches']
+    if name == 'api-theme-detail':
+        return ['themes', f'theme:{theme_id}', f'theme:{theme_id}:slots', f'theme:{theme_id}:reviews']
+    if name == 'api-theme-availability':
+        return ['themes', f'theme:{theme_id}:slots']
+    if name == 'api-theme-reviews':
+        return [f'theme:{theme_id}:reviews']
+    return ['themes']
+
+
+def _stamp(request, **kwargs):
+    # etag / last_modified 함수가 각각 호출되므로 요청 단위로 한 번만 조회
+    if not hasattr(request, '_api_stamp'):
+        stamp = latest_stamp(*_stamp_names(request, **kwargs))
+        if request.resolver_match.url_name in TIME_DEPENDENT_VIEWS:
+            # 데이터 변경이 없어도 가격 슬롯(정시)이 바뀌면 새 버전 (이전 시간대의 ETag로 304를 받지 않도록)
+            stamp = max(stamp, int(slot_start(timezone.now()).timestamp() * 1000))
+        request._api_stamp = stamp
+    return request._api_stamp
+
+
+def _etag(request, **kwargs):
+    # 같은 리소스라도 쿼리 파라미터(fields, 페이지 등)가 다르면 다른 표현
+    params = hashlib.md5(request.GET.urlencode().encode()).hexdigest()[:12]
+    return f"v1-{_stamp(request, **kwargs)}-{params}"
+
+
+def _last_modified(request, **kwargs):
+    return datetime.fromtimestamp(_stamp(request, **kwargs) / 1000, tz=dt_timezone.utc)
+
+
+def api_view(view):
+    """GET 전용 + 조건부 GET + 캐시 헤더"""
+    @require_GET
+    @condition(etag_func=_etag, last_modified_func=_last_modified)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        # 프록시/클라이언트는 매번 재검증 (변경이 없으면 304)
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        return response
+    wrapper.__name__ = view.__name__
+    wrapper.__doc__ = view.__doc__
+    return wrapper
+
+
+# ----------------------------------------------------------------------
+# 공통 헬퍼
+# ----------------------------------------------------------------------
+def _select_fields(request, items):
+    """fields 파라미터로 지정한 필드만 남김"""
+    fields = [f for f in request.GET.get('fields', '').split(',') if f]
+    if not fields:
+        return items
+    return [{k: v for k, v in item.items() if k in fields} for item in items]
+
+
+def _int_param(request, name):
+    """정수 쿼리 파라미터 (없으면 None, 숫자가 아니면 400)"""
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(f"{name} 파라미터는 숫자여야 합니다.")
+
+
+def _paginate(request, queryset, key, descending=False):
+    """키셋 페이지네이션 - (현재 페이지 객체 목록, 다음 커서)"""
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        after = request.GET.get('after')
+        after = int(after) if after else None
+    except ValueError:
+        raise Http404("잘못된 페이지 파라미터입니다.")
+    limit = max(limit, 1)
+
+    if after is not None:
+        queryset = queryset.filter(**{f'{key}__lt' if descending else f'{key}__gt': after})
+
+    def shard_page():
+        page = list(queryset.order_by(f'-{key}' if descending else key)[:limit + 1])
+        next_cursor = getattr(page[limit - 1], key) if len(page) > limit else None
+        return page[:limit], next_cursor
+
+    # 샤딩(booking/sharding.py) 시 샤드별 페이지를 키 순서로 합침
+    return sharding.gather_page(
+        shard_page, key=attrgetter(key), limit=limit, encode=attrgetter(key), ascending=not descending,
+    )
+
+
+def _theme_json(theme):
+    return {
+        'theme_id': theme.theme_id,
+        'branch_id': theme.branch_id,
+        'branch_name': theme.branch.branch_name,
+        'name': theme.name,
+        'genre': theme.genre,
+        'difficulty': theme.difficulty,
+        'duration': theme.duration,
+        'price': int(theme.price),
+        'final_price': int(theme.final_price),
+        'lowest_price': int(theme.lowest_price) if getattr(theme, 'lowest_price', None) is not None else None,
+        'status': theme.status,
+    }
+
+
+# ----------------------------------------------------------------------
+# 엔드포인트
+# ----------------------------------------------------------------------
+@api_view
+def branch_list_api(request):
+    """지점 목록"""
+    branches = Branch.objects.filter(is_active=True).order_by('branch_id')
+    items = [
+        {'branch_id': b.branch_id, 'branch_name': b.branch_name, 'location': b.location, 'phone': b.phone}
+        for b in branches
+    ]
+    return JsonResponse({'results': _select_fields(request, items)})
+
+
+@api_view
+def theme_list_api(request):
+    """테마 목록 (branch, genre, difficulty 필터)"""
+    themes = Theme.objects.filter(is_active=True).select_related('branch').annotate(
+        lowest_price=lowest_upcoming_price()
+    )
+    branch_id, difficulty = _int_param(request, 'branch'), _int_param(request, 'difficulty')
+    if branch_id is not None:
+        themes = themes.filter(branch_id=branch_id)
+    if request.GET.get('genre'):
+        themes = themes.filter(genre=request.GET['genre'])
+    if difficulty is not None:
+        themes = themes.filter(difficulty=difficulty)
+
+    page, next_cursor = _paginate(request, themes, 'theme_id')
+    return JsonResponse({
+        'results': _select_fields(request, [_theme_json(t) for t in page]),
+        'next': next_cursor,
+    })
+
+
+@api_view
+def theme_detail_api(request, theme_id):
+    """테마 상세 + 리뷰 요약"""
+    theme = get_theme_or_404(theme_id, is_active=True)
+    summary = rating_summary(theme)
+    theme.lowest_price = upcoming_price_range(theme)['min_price']
+    item = _theme_json(theme)
+    item['description'] = theme.description
+    item['review_count'] = summary['count']
+    item['avg_rating'] = summary['avg'] if summary['count'] else None
+    return JsonResponse(_select_fields(request, [item])[0])
+
+
+@api_view
+def theme_availability_api(request, theme_id):
+    """날짜별 슬롯 가격 / 예약 가능 여부 (?date=YYYY-MM-DD, 기본: 오늘)"""
+    theme = get_theme_or_404(theme_id, is_active=True)
+    try:
+        day = datetime.strptime(request.GET['date'], '%Y-%m-%d').date() if request.GET.get('date') else timezone.localdate()
+    except ValueError:
+        raise Http404("날짜 형식은 YYYY-MM-DD 입니다.")
+
+    tz = timezone.get_current_timezone()
+    day_start = timezone.make_aware(datetime(day.year, day.month, day.day), tz)
+    day_end = day_start + timedelta(days=1)
+
+    prices = dict(ThemePrice.objects.filter(
+        theme=theme, slot_start__gte=day_start, slot_start__lt=day_end,
+    ).values_list('slot_start', 'price'))
+    booked = {
+        slot_start(t) for t in Reservation.objects.filter(
+            theme=theme,
+            reservation_time__gte=day_start,
+            reservation_time__lt=day_end,
+            status__in=['Confirmed', 'CheckedIn'],
+        ).values_list('reservation_time', flat=True)
+    }
+    now = timezone.now()
+    # 다른 고객이 결제 중(선점)인 슬롯도 예약 불가 (booking/holds.py)
+    held = {
+        slot_start(t) for t in SlotHold.objects.filter(
+            theme=theme, slot_time__gte=day_start, slot_time__lt=day_end, expires_at__gt=now,
+        ).values_list('slot_time', flat=True)
+    }
+
+    slots = []
+    for hour in getattr(settings, 'PRICE_CALENDAR_HOURS', range(10, 24)):
+        start = timezone.make_aware(datetime(day.year, day.month, day.day, hour), tz)
+        price = prices.get(start)
+        slots.append({
+            'slot_start': start.isoformat(),
+            'price': int(price) if price is not None else int(theme.final_price),
+            'available': theme.status == 'Ready' and start > now and start not in booked and start not in held,
+        })
+    return JsonResponse({'theme_id': theme.theme_id, 'date': day.isoformat(), 'slots': _select_fields(request, slots)})
+
+
+@api_view
+def theme_reviews_api(request, theme_id):
+    """리뷰 요약(별점 분포 포함) + 리뷰 목록 (sort=newest|helpful, after=커서)"""
+    theme = get_theme_or_404(theme_id, is_active=True)
+    try:
+        limit = max(min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_LIMIT), 1)
+    except ValueError:
+        raise Http404("잘못된 페이지 파라미터입니다.")
+    summary = rating_summary(theme)
+    page, next_cursor = review_page(
+        theme, sort=request.GET.get('sort', 'newest'), cursor=request.GET.get('after'), limit=limit,
+    )
+    items = [
+        {
+            'review_id': r.review_id,
+            'member_name': r.member.name if r.member else None,
+            'rating': r.rating,
+            'comment': r.comment,
+            'helpful_count': r.helpful_count,
+            'created_at': r.created_at.isoformat(),
+        }
+        for r in page
+    ]
+    return JsonResponse({
+        'review_count': summary['count'],
+        'avg_rating': summary['avg'] if summary['count'] else None,
+        'histogram': {bar['rating']: bar['count'] for bar in summary['histogram']},
+        'results': _select_fields(request, items),
+        'next': next_cursor,
+    })
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BookingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'booking'
+
+    def ready(self):
+        # 시그널 핸들러 / 시스템 체크 등록
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,339 @@
+# booking/archive.py
+"""
+오래된 종료 예약 보관 (cold storage)
+
+- 보관 기준일(ARCHIVE_RETENTION_DAYS)이 지난 이용 완료 / 취소 / 노쇼 예약을 결제, 리뷰(도움돼요 포함)와 함께
+  zstd 압축 JSONL 세그먼트 파일로 옮기고 예약 / 결제 / 리뷰 테이블에서 삭제
+- 색인 테이블(ArchivedReservation)에는 회원, 테마, 시간, 상태와 세그먼트 내 위치만 남김
+  -> 마이페이지 지난 예약은 색인으로 이어서 조회하고, 필요한 줄만 세그먼트에서 읽음
+- 통계에 필요한 값은 테마별 누적값(ThemeArchiveTotals)에 더해 두고, 리뷰 요약 / 전체 통계에서 합산
+- 배치마다 짧은 트랜잭션 (SKIP LOCKED) -> 예약 테이블을 오래 잠그지 않음
+- restore_reservations()로 원래 테이블에 그대로 복원 (원래 PK, 작성일 유지)
+
+cron(`python manage.py archive_reservations`) 또는 스케줄러(`run_scheduler`)에서 주기적으로 실행합니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import secrets
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+import zstandard
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import (
+    Member, Reservation, ReviewHelpful,
+    ArchiveSegment, ArchivedReservation, ThemeArchiveTotals,
+)
+from . import events, sharding
+from .object_cache import get_themes
+from .reviews import refresh_rating_summary
+from .stamps import bump
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = ('Completed', 'Cancelled', 'NoShow')
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _root():
+    return Path(getattr(settings, 'ARCHIVE_ROOT', settings.BASE_DIR / 'archive'))
+
+
+def retention_horizon(now=None):
+    """이 시각 이전의 종료 예약이 보관 대상"""
+    now = now or timezone.now()
+    return now - timedelta(days=getattr(settings, 'ARCHIVE_RETENTION_DAYS', 365))
+
+
+# ----------------------------------------------------------------------
+# 세그먼트 파일
+# ----------------------------------------------------------------------
+class _Encoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder는 시각을 밀리초로 자르므로, 복원 시 원래 값 그대로 되돌리도록 마이크로초까지 저장
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _serialize(obj):
+    return serializers.serialize('python', [obj])[0]
+
+
+def _deserialize(data):
+    return next(serializers.deserialize('python', [data]))
+
+
+def _write_segment(lines, first_time):
+    data = '\n'.join(json.dumps(line, cls=_Encoder, ensure_ascii=False) for line in lines).encode()
+    compressed = zstandard.ZstdCompressor(level=getattr(settings, 'ARCHIVE_COMPRESSION_LEVEL', 10)).compress(data)
+
+    file_name = f"{first_time:%Y/%m}/{timezone.now():%Y%m%d%H%M%S}-{secrets.token_hex(4)}.jsonl.zst"
+    path = _root() / file_name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 임시 파일에 쓰고 이름 변경 -> 쓰다 만 세그먼트가 남지 않음
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(compressed)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return file_name, len(compressed), hashlib.sha256(compressed).hexdigest()
+
+
+@lru_cache(maxsize=16)
+def _segment_lines(file_name, sha256=None):
+    # 세그먼트는 한 번 쓰면 바뀌지 않으므로 압축 해제한 내용을 프로세스에 캐시
+    with open(_root() / file_name, 'rb') as f:
+        compressed = f.read()
+    if sha256 and hashlib.sha256(compressed).hexdigest() != sha256:
+        raise ValueError(f"보관 세그먼트 체크섬이 일치하지 않습니다: {file_name}")
+    return zstandard.ZstdDecompressor().decompress(compressed).decode().split('\n')
+
+
+def read_line(segment, line):
+    """세그먼트의 한 줄 -> {'reservation', 'payment', 'review', 'helpful'}"""
+    return json.loads(_segment_lines(segment.file_name)[line])
+
+
+# ----------------------------------------------------------------------
+# 통계 누적값
+# ----------------------------------------------------------------------
+def _totals_delta(line):
+    """보관 줄 하나가 테마 누적 통계에 더하는 값"""
+    reservation = line['reservation']['fields']
+    delta = Counter(reservation_count=1)
+    if reservation['status'] == 'Completed':
+        delta['completed_count'] += 1
+        if reservation['is_success']:
+            delta['success_count'] += 1
+    if line['payment'] and line['payment']['fields']['payment_status'] == 'Paid':
+        delta['paid_count'] += 1
+        delta['paid_amount'] += int(line['payment']['fields']['amount'])
+    if line['review']:
+        rating = line['review']['fields']['rating']
+        delta['review_count'] += 1
+        delta['rating_sum'] += rating
+        delta[f'rating_{rating}'] += 1
+    return delta
+
+
+def _apply_totals(deltas, sign):
+    ThemeArchiveTotals.objects.bulk_create(
+        [ThemeArchiveTotals(theme_id=theme_id) for theme_id in deltas], ignore_conflicts=True
+    )
+    for theme_id, delta in deltas.items():
+        ThemeArchiveTotals.objects.filter(pk=theme_id).update(
+            **{field: F(field) + sign * value for field, value in delta.items()}
+        )
+
+
+# ----------------------------------------------------------------------
+# 보관
+# ----------------------------------------------------------------------
+def _archive_batch(horizon, batch_size):
+    file_name = None
+    try:
+        with sharding.atomic():
+            reservations = list(
+                Reservation.objects.filter(status__in=CLOSED_STATUSES, reservation_time__lt=horizon)
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('payment', 'review')
+                .order_by('reservation_time', 'reservation_id')[:batch_size]
+            )
+            if not reservations:
+                return 0
+
+            votes = defaultdict(list)
+            review_ids = [r.review.review_id for r in reservations if hasattr(r, 'review')]
+            for vote in ReviewHelpful.objects.filter(review_id__in=review_ids):
+                votes[vote.review_id].append(_serialize(vote))
+
+            lines = []
+            for r in reservations:
+                review = r.review if hasattr(r, 'review') else None
+                lines.append({
+                    'reservation': _serialize(r),
+                    'payment': _serialize(r.payment) if hasattr(r, 'payment') else None,
+                    'review': _serialize(review) if review else None,
+                    'helpful': votes[review.review_id] if review else [],
+                })
+
+            file_name, size, sha256 = _write_segment(lines, reservations[0].reservation_time)
+            segment = ArchiveSegment.objects.create(
+                file_name=file_name,
+                first_time=reservations[0].reservation_time,
+                last_time=reservations[-1].reservation_time,
+                row_count=len(reservations),
+                size_bytes=size,
+                sha256=sha256,
+            )
+            ArchivedReservation.objects.bulk_create([
+                ArchivedReservation(
+                    reservation_id=r.reservation_id, member_id=r.member_id, theme_id=r.theme_id,
+                    reservation_time=r.reservation_time, status=r.status, is_success=r.is_success,
+                    segment=segment, line=line,
+                )
+                for line, r in enumerate(reservations)
+            ])
+
+            deltas = defaultdict(Counter)
+            for r, line in zip(reservations, lines):
+                deltas[r.theme_id].update(_totals_delta(line))
+            # 누적 통계를 먼저 더한 뒤 삭제 -> 삭제 시그널의 리뷰 요약 갱신에 보관분이 포함됨
+            _apply_totals(deltas, 1)
+
+            # 결제 / 리뷰 / 도움돼요는 CASCADE로 함께 삭제 (시그널로 스탬프, 마이페이지 캐시 갱신, 'archived' 이벤트 기록)
+            with events.batch(delete_action='archived'):
+                Reservation.objects.filter(pk__in=[r.reservation_id for r in reservations]).delete()
+            return len(reservations)
+    except Exception:
+        if file_name:
+            (_root() / file_name).unlink(missing_ok=True)
+        raise
+
+
+def archive_reservations(now=None, batch_size=None, max_batches=None):
+    """보관 기준일이 지난 종료 예약을 세그먼트 단위로 보관하고 처리 건수를 반환"""
+    horizon = retention_horizon(now)
+    batch_size = batch_size or getattr(settings, 'ARCHIVE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    started = time.monotonic()
+
+    result = {'reservations': 0, 'segments': 0}
+    while max_batches is None or result['segments'] < max_batches:
+        archived = _archive_batch(horizon, batch_size)
+        if not archived:
+            break
+        result['reservations'] += archived
+        result['segments'] += 1
+
+    result['elapsed'] = time.monotonic() - started
+    logger.info(
+        "Reservation archive finished: reservations=%d segments=%d (%.2fs)",
+        result['reservations'], result['segments'], result['elapsed'],
+    )
+    return result
+
+
+# ----------------------------------------------------------------------
+# 조회 (마이페이지)
+# ----------------------------------------------------------------------
+def archived_index(member, position=None, limit=10):
+    """회원의 보관된 예약 색인 (최근 순) - position=(예약 시간, 예약 ID) 이전부터"""
+    rows = ArchivedReservation.objects.filter(member=member)
+    if position:
+        when, reservation_id = position
+        rows = rows.filter(Q(reservation_time__lt=when) | Q(reservation_time=when, reservation_id__lt=reservation_id))
+    return list(rows.select_related('segment').order_by('-reservation_time', '-reservation_id')[:limit])
+
+
+def load_archived(rows):
+    """색인 -> 화면 표시용 Reservation 객체 (저장되지 않은 객체, is_archived=True)"""
+    themes = get_themes({row.theme_id for row in rows})
+    reservations = []
+    for row in rows:
+        line = read_line(row.segment, row.line)
+        reservation = _deserialize(line['reservation']).object
+        reservation.theme = themes[row.theme_id]
+        reservation.member_id = row.member_id
+        reservation.payment_info = _deserialize(line['payment']).object if line['payment'] else None
+        reservation.has_review = line['review'] is not None
+        reservation.is_archived = True
+        reservations.append(reservation)
+    return reservations
+
+
+# ----------------------------------------------------------------------
+# 복원
+# ----------------------------------------------------------------------
+def _restore_segment(segment_id, reservation_ids):
+    with sharding.atomic():
+        segment = ArchiveSegment.objects.select_for_update().get(pk=segment_id)
+        rows = list(ArchivedReservation.objects.filter(segment=segment, reservation_id__in=reservation_ids))
+        if not rows:
+            return 0
+        lines = _segment_lines(segment.file_name, segment.sha256)
+
+        # 보관 후 탈퇴한 회원은 비워 둠 (예약/리뷰 작성자는 SET_NULL, 도움돼요는 CASCADE와 같게 제외)
+        restored = [json.loads(lines[row.line]) for row in rows]
+        member_ids = set()
+        for line in restored:
+            member_ids.add(line['reservation']['fields']['member'])
+            if line['review']:
+                member_ids.add(line['review']['fields']['member'])
+            member_ids.update(vote['fields']['member'] for vote in line['helpful'])
+        existing_members = set(Member.objects.filter(pk__in=member_ids - {None}).values_list('pk', flat=True))
+
+        deltas = defaultdict(Counter)
+        for row, line in zip(rows, restored):
+            deltas[row.theme_id].update(_totals_delta(line))
+            reservation = _deserialize(line['reservation'])
+            reservation.object.member_id = row.member_id if row.member_id in existing_members else None
+            reservation.save()  # raw 저장 -> 원래 값(작성일 등) 그대로, 시그널의 파생 데이터 갱신은 아래에서 한 번에
+            if line['payment']:
+                _deserialize(line['payment']).save()
+            if line['review']:
+                review = _deserialize(line['review'])
+                if review.object.member_id not in existing_members:
+                    review.object.member_id = None
+                votes = [vote for vote in line['helpful'] if vote['fields']['member'] in existing_members]
+                review.object.helpful_count = len(votes)
+                review.save()
+                for vote in votes:
+                    _deserialize(vote).save()
+
+        with events.batch():
+            for row in rows:
+                events.record('reservation', 'restored', row.reservation_id, theme_id=row.theme_id,
+                              member_id=row.member_id, status=row.status)
+        ArchivedReservation.objects.filter(pk__in=[row.reservation_id for row in rows]).delete()
+        _apply_totals(deltas, -1)
+        for theme_id in deltas:
+            refresh_rating_summary(theme_id)
+
+        emptied = not segment.reservations.exists()
+        if emptied:
+            segment.delete()
+
+        # 순환 import 방지 (timeline이 이 모듈을 사용)
+        from .timeline import invalidate_member_counters
+
+        stamp_names = ['reviews', 'themes'] + [
+            name for theme_id in deltas for name in (f'theme:{theme_id}:slots', f'theme:{theme_id}:reviews')
+        ]
+        restored_members = [row.member_id for row in rows]
+
+        def after_commit():
+            bump(*stamp_names)
+            invalidate_member_counters(restored_members)
+            if emptied:
+                (_root() / segment.file_name).unlink(missing_ok=True)
+
+        sharding.on_commit(after_commit)
+        return len(rows)
+
+
+def restore_reservations(reservation_ids=None, member_id=None, segment_id=None):
+    """보관된 예약을 원래 테이블로 복원하고 복원 건수를 반환 (세그먼트마다 한 트랜잭션)"""
+    index = ArchivedReservation.objects.all()
+    if reservation_ids:
+        index = index.filter(reservation_id__in=reservation_ids)
+    if member_id:
+        index = index.filter(member_id=member_id)
+    if segment_id:
+        index = index.filter(segment_id=segment_id)
+
+    by_segment = defaultdict(list)
+    for reservation_id, seg_id in index.values_list('reservation_id', 'segment_id'):
+        by_segment[seg_id].append(reservation_id)
+    return sum(_restore_segment(seg_id, ids) for seg_id, ids in sorted(by_segment.items()))
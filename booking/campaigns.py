@@ -0,0 +1,160 @@
+# booking/campaigns.py
+"""
+가격 캠페인 (PriceCampaign) - 여러 지점 / 테마의 할인율을 기간 동안 일괄 변경
+
+- 스케줄러(run_price_campaigns)가 시작 시각이 된 캠페인을 적용하고, 종료 시각이 지난 캠페인을 복원
+- 샤드마다 대상 테마를 UPDATE 한 번으로 변경 (테마별 save() 없음) + 변경 이력(ThemePriceHistory)을 bulk INSERT
+- 테마 하나에는 캠페인 하나만 적용 (다른 캠페인이 진행 중인 테마는 건너뜀)
+- 종료 시 캠페인이 바꾼 할인율 그대로인 테마만 이전 할인율로 복원 (기간 중 직접 수정한 테마는 수정한 값 유지)
+- 일괄 UPDATE는 시그널이 발생하지 않으므로 이벤트 로그를 직접 기록하고,
+  가격 캘린더 / 필터 개수 / 스탬프 / 테마 객체 캐시는 커밋 후 테마 목록 단위로 한 번에 갱신
+"""
+import logging
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from . import events, object_cache, sharding
+from .models import Theme, PriceCampaign, ThemePriceHistory
+from .pricing import build_price_calendar
+from .stamps import bump
+
+logger = logging.getLogger(__name__)
+
+MAX_RATE = Decimal(100)
+
+
+def _new_rate(campaign, current):
+    if campaign.rule == 'add':
+        return min(current + campaign.discount_rate, MAX_RATE)
+    return campaign.discount_rate
+
+
+def _rate_expression(campaign):
+    if campaign.rule == 'add':
+        return Least(F('discount_rate') + campaign.discount_rate, Value(MAX_RATE), output_field=DecimalField())
+    return Value(campaign.discount_rate, output_field=DecimalField())
+
+
+def _themes_changed(theme_ids):
+    """테마 시그널(booking/signals.py)이 하던 갱신을 커밋 후 한 번에"""
+    def after_commit():
+        # 가격 캘린더 + 필터 개수 + 테마 목록 / 슬롯 스탬프
+        build_price_calendar(theme_ids=theme_ids)
+        bump(*[f'theme:{theme_id}' for theme_id in theme_ids])
+        object_cache.invalidate_local(theme_ids)
+    sharding.on_commit(after_commit)
+
+
+def _record(history):
+    ThemePriceHistory.objects.bulk_create(history, batch_size=1000)
+    with events.batch():
+        for h in history:
+            events.record('theme', 'changed', h.theme_id, theme_id=h.theme_id,
+                          discount_rate=[h.previous_discount_rate, h.discount_rate])
+
+
+def _activate(campaign, branch_ids):
+    """현재 샤드의 대상 테마에 캠페인 적용 -> 적용한 테마 수"""
+    targets = Q(theme_id__in=campaign.theme_ids or [])
+    if branch_ids:
+        targets |= Q(branch_id__in=branch_ids)
+    with sharding.atomic():
+        rows = list(Theme.objects.select_for_update().filter(
+            targets, is_active=True, campaign__isnull=True,
+        ).values_list('theme_id', 'price', 'discount_rate'))
+        if not rows:
+            return 0
+        theme_ids = [theme_id for theme_id, _, _ in rows]
+        Theme.objects.filter(theme_id__in=theme_ids, campaign__isnull=True).update(
+            discount_rate=_rate_expression(campaign), campaign=campaign,
+        )
+        _record([
+            ThemePriceHistory(
+                theme_id=theme_id, previous_price=price, previous_discount_rate=rate,
+                price=price, discount_rate=_new_rate(campaign, rate),
+                reason='campaign_start', campaign_id=campaign.pk,
+            )
+            for theme_id, price, rate in rows
+        ])
+        _themes_changed(theme_ids)
+    return len(theme_ids)
+
+
+def _revert(campaign):
+    """현재 샤드에서 캠페인 해제 (캠페인 할인율 그대로인 테마는 이전 할인율로) -> 복원한 테마 수"""
+    started = ThemePriceHistory.objects.filter(
+        campaign_id=campaign.pk, reason='campaign_start', theme=OuterRef('pk'),
+    ).order_by('-history_id')
+    unchanged = Exists(started.filter(discount_rate=OuterRef('discount_rate')))
+    previous_rate = Subquery(started.values('previous_discount_rate')[:1])
+    with sharding.atomic():
+        rows = list(Theme.objects.select_for_update().filter(campaign=campaign).annotate(
+            unchanged=unchanged, previous_rate=previous_rate,
+        ).values_list('theme_id', 'price', 'discount_rate', 'unchanged', 'previous_rate'))
+        if not rows:
+            return 0
+        Theme.objects.filter(campaign=campaign).update(
+            discount_rate=Case(When(unchanged, then=previous_rate), default=F('discount_rate')),
+            campaign=None,
+        )
+        restored = [
+            (theme_id, price, rate, previous) for theme_id, price, rate, same, previous in rows
+            if same and previous is not None
+        ]
+        if restored:
+            _record([
+                ThemePriceHistory(
+                    theme_id=theme_id, previous_price=price, previous_discount_rate=rate,
+                    price=price, discount_rate=previous,
+                    reason='campaign_end', campaign_id=campaign.pk,
+                )
+                for theme_id, price, rate, previous in restored
+            ])
+            _themes_changed([theme_id for theme_id, _, _, _ in restored])
+    return len(restored)
+
+
+def start_campaign(campaign):
+    """캠페인 적용 (모든 샤드) -> 적용한 테마 수"""
+    branch_ids = list(campaign.branches.values_list('branch_id', flat=True))
+    count = sum(sharding.each_shard(_activate, campaign, branch_ids))
+    campaign.status = 'Active'
+    campaign.theme_count = count
+    campaign.save(update_fields=['status', 'theme_count'])
+    logger.info("Started price campaign %s: %d themes", campaign.pk, count)
+    return count
+
+
+def end_campaign(campaign):
+    """캠페인 종료 (모든 샤드) -> 할인율을 복원한 테마 수"""
+    count = sum(sharding.each_shard(_revert, campaign))
+    campaign.status = 'Ended'
+    campaign.save(update_fields=['status'])
+    logger.info("Ended price campaign %s: %d themes restored", campaign.pk, count)
+    return count
+
+
+def run_price_campaigns(now=None):
+    """
+    종료 시각이 지난 캠페인 복원 -> 시작 시각이 된 캠페인 적용 (스케줄러)
+    반환: (시작한 캠페인 수, 종료한 캠페인 수)
+    """
+    now = now or timezone.now()
+    ended = 0
+    # 같은 시각에 끝나고 시작하는 캠페인이 있으면 먼저 끝난 캠페인의 테마를 풀어 줌
+    for campaign in PriceCampaign.objects.filter(status='Active', ends_at__lte=now).order_by('ends_at'):
+        end_campaign(campaign)
+        ended += 1
+    started = 0
+    for campaign in PriceCampaign.objects.filter(status='Scheduled', starts_at__lte=now).order_by('starts_at'):
+        if campaign.ends_at <= now:
+            # 스케줄러가 멈춰 있는 동안 기간이 지난 캠페인은 적용하지 않음
+            campaign.status = 'Ended'
+            campaign.save(update_fields=['status'])
+            continue
+        start_campaign(campaign)
+        started += 1
+    return started, ended
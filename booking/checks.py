@@ -0,0 +1,52 @@
+# booking/checks.py
+"""시스템 체크 (manage.py check)"""
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _shared_cache_warnings():
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if not getattr(settings, 'ADMISSION_ENABLED', True) or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        "ADMISSION_ENABLED이지만 기본 캐시가 프로세스별 캐시입니다 (%s)." % backend.rsplit('.', 1)[-1],
+        hint=(
+            "요청 제한 / 예약 동시 실행 제한 / 슬롯 선점 집계 / API 스탬프가 워커 프로세스마다 따로 동작합니다. "
+            "REDIS_URL 환경 변수로 공유 캐시(Redis)를 지정하세요."
+        ),
+        id='booking.W001',
+    )]
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """운영 설정(DEBUG=False)에서 과부하 보호 상태를 공유할 캐시가 없으면 경고"""
+    if settings.DEBUG:
+        return []
+    return _shared_cache_warnings()
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache_deploy(app_configs, **kwargs):
+    """check --deploy 에서는 DEBUG와 관계없이 확인"""
+    if not settings.DEBUG:
+        return []  # check_shared_cache에서 이미 확인
+    return _shared_cache_warnings()
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_static_manifest(app_configs, **kwargs):
+    """해시 파일명 정적 파일 저장소를 쓰는데 collectstatic을 실행하지 않은 경우"""
+    if not isinstance(staticfiles_storage, ManifestFilesMixin) or staticfiles_storage.read_manifest() is not None:
+        return []
+    return [Warning(
+        "정적 파일 매니페스트가 없습니다 (%s)." % staticfiles_storage.path(staticfiles_storage.manifest_name),
+        hint="배포 시 collectstatic을 실행하세요. 실행 전에는 해시 / 압축본 없는 파일명으로 응답합니다.",
+        id='booking.W002',
+    )]
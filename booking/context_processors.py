@@ -0,0 +1,12 @@
+# booking/context_processors.py
+from django.utils.functional import SimpleLazyObject
+
+from .notices import unread_count
+
+
+def notices(request):
+    """상단 메뉴의 안 읽은 공지 수 (템플릿에서 사용할 때만 조회)"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {'unread_notice_count': 0}
+    return {'unread_notice_count': SimpleLazyObject(lambda: unread_count(user))}
@@ -0,0 +1,151 @@
+# booking/events.py
+"""
+예약 이벤트 로그 (추가만 하는 Event 테이블)
+
+- 예약 / 결제 / 리뷰 / 테마의 생성, 상태 변경, 삭제를 원본 변경과 같은 트랜잭션에서 기록
+  (save()/delete()는 booking/signals.py, 일괄 UPDATE는 호출한 쪽에서 record()를 직접 호출)
+- 소비자(consumer)는 이름별 커서(EventCursor) 이후의 이벤트를 event_id 순서로 배치 단위로 처리
+  -> 집계, 캐시, 검색 인덱스, 내보내기를 원본 테이블을 다시 읽지 않고 증분 갱신
+- 동시에 진행 중인 트랜잭션은 event_id 순서와 커밋 순서가 다르므로 (먼저 ID를 받은 긴 트랜잭션이 나중에 커밋)
+  PostgreSQL에서는 이벤트에 기록한 트랜잭션 ID(txid) 기준으로 읽음
+  -> 진행 중인 트랜잭션 중 가장 오래된 것(snapshot xmin)보다 앞선 트랜잭션의 이벤트만 (txid, event_id) 순서로 처리
+     그보다 앞선 트랜잭션은 모두 끝났으므로 이후에 커밋되는 이벤트는 항상 커서 뒤에 옴 (건너뛰는 이벤트 없음)
+  -> 오래 걸리는 쓰기 트랜잭션이 있으면 끝날 때까지 그 뒤의 이벤트 처리를 미룸
+  SQLite는 쓰기 트랜잭션이 DB 단위로 하나씩 실행되므로 event_id 순서 = 커밋 순서
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from . import sharding
+from .models import Event, EventCursor
+
+_local = threading.local()
+
+
+def _json(value):
+    # Decimal(금액) 등은 JSON으로 저장할 수 있는 값으로
+    return value if value is None or isinstance(value, (bool, int, float, str)) else str(value)
+
+
+def record(topic, action, object_id, theme_id=None, member_id=None, **data):
+    """이벤트 기록 (batch() 안이면 모아 두었다가 한 번에 INSERT)"""
+    event = Event(
+        topic=topic, action=action, object_id=object_id, theme_id=theme_id, member_id=member_id,
+        data={key: [_json(v) for v in value] if isinstance(value, list) else _json(value) for key, value in data.items()},
+    )
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending.append(event)
+    else:
+        event.save()
+    return event
+
+
+@contextmanager
+def batch(delete_action='deleted'):
+    """
+    with 블록 안에서 기록한 이벤트를 블록이 끝날 때 bulk INSERT (일괄 삭제/변경용, 트랜잭션 안에서 사용)
+    delete_action: 블록 안의 삭제를 기록할 동작 (예: 보관으로 인한 삭제는 'archived')
+    """
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending, _local.delete_action = [], delete_action
+    try:
+        yield
+        Event.objects.bulk_create(_local.pending, batch_size=1000)
+    finally:
+        _local.pending, _local.delete_action = None, None
+
+
+def delete_action():
+    return getattr(_local, 'delete_action', None) or 'deleted'
+
+
+def record_save(topic, instance, created, **context):
+    """post_save - 생성이면 추적 필드 값, 아니면 바뀐 추적 필드만 기록"""
+    if created:
+        record(topic, 'created', instance.pk, **context,
+               **{f: getattr(instance, f) for f in instance.tracked_fields})
+        return
+    changes = instance.tracked_changes()
+    if changes:
+        record(topic, 'changed', instance.pk, **context, **changes)
+
+
+# ----------------------------------------------------------------------
+# 소비자
+# ----------------------------------------------------------------------
+def _snapshot_xmin():
+    """진행 중인 트랜잭션 중 가장 오래된 트랜잭션 ID (PostgreSQL), 트랜잭션 ID로 읽지 않는 DB는 None"""
+    connection = connections[sharding.db_alias()]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+        return cursor.fetchone()[0]
+
+
+def _next_batch(txid, position, limit):
+    xmin = _snapshot_xmin()
+    if xmin is None:
+        return list(Event.objects.filter(event_id__gt=position).order_by('event_id')[:limit])
+    return list(
+        Event.objects.filter(Q(txid__gt=txid) | Q(txid=txid, event_id__gt=position), txid__lt=xmin)
+        .order_by('txid', 'event_id')[:limit]
+    )
+
+
+def read_events(name, limit=None):
+    """커서를 옮기지 않고 다음 배치 조회"""
+    cursor = EventCursor.objects.filter(name=name).first()
+    if cursor is None:
+        # 샤딩 시 이벤트 ID는 샤드 구간에서 시작
+        cursor = EventCursor(name=name, position=sharding.id_floor())
+    return _next_batch(cursor.txid, cursor.position, limit or getattr(settings, 'EVENT_LOG_BATCH_SIZE', 1000))
+
+
+def consume(name, handler, batch_size=None, max_batches=None):
+    """
+    소비자 name의 커서 이후 이벤트를 배치마다 handler(events)로 처리하고 커서를 옮김
+    - 배치마다 한 트랜잭션 (handler의 DB 변경과 커서 이동이 함께 커밋, 실패하면 같은 배치를 다시 처리)
+    - 커서 행을 잠그므로 같은 이름의 소비자는 동시에 하나만 진행
+    처리한 이벤트 수를 반환
+    """
+    batch_size = batch_size or getattr(settings, 'EVENT_LOG_BATCH_SIZE', 1000)
+    EventCursor.objects.get_or_create(name=name, defaults={'position': sharding.id_floor()})
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        with sharding.atomic():
+            cursor = EventCursor.objects.select_for_update().get(name=name)
+            events = _next_batch(cursor.txid, cursor.position, batch_size)
+            if not events:
+                break
+            handler(events)
+            cursor.position = events[-1].event_id
+            cursor.txid = events[-1].txid or 0
+            cursor.save(update_fields=['position', 'txid', 'updated_at'])
+        total += len(events)
+        batches += 1
+    return total
+
+
+def prune_events(now=None):
+    """보관 기간이 지났고 모든 소비자가 처리한 이벤트 삭제, 삭제 건수 반환"""
+    now = now or timezone.now()
+    events = Event.objects.filter(
+        created_at__lt=now - timedelta(days=getattr(settings, 'EVENT_LOG_RETENTION_DAYS', 90))
+    )
+    # 모든 소비자가 처리한 이벤트 = 모든 커서의 (txid, position) 이하
+    for txid, position in EventCursor.objects.values_list('txid', 'position'):
+        events = events.filter(
+            Q(txid__lt=txid) | Q(txid=txid, event_id__lte=position) | Q(txid__isnull=True, event_id__lte=position)
+        )
+    deleted, _ = events.delete()
+    return deleted
@@ -0,0 +1,138 @@
+# booking/facets.py
+"""
+테마 목록 필터의 항목별 개수 (Faceted navigation)
+
+- 예약 가능한 테마의 필터 속성(지점, 장르, 난이도, 최저 가격)을 메모리 인덱스로 한 번 불러옴
+  (Theme/Branch/가격 캘린더가 바뀌면 버전을 올려 다시 불러옴)
+- 각 항목의 개수는 "그 항목을 제외한 나머지 필터"를 적용한 결과로 계산
+- 계산 결과는 필터 조합별로 캐시
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics, sharding
+from .models import Branch, Theme
+
+VERSION_KEY = 'facets:version'
+INDEX_KEY = 'facets:index:{}'
+RESULT_KEY = 'facets:result:{}:{}'
+
+# 프로세스 내 인덱스 (버전이 같으면 캐시 역직렬화도 생략)
+_local_index = {'version': None, 'index': None}
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_facets():
+    """테마/지점/가격 변경 시 호출 - 인덱스와 모든 필터 조합 캐시를 무효화"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def _build_index():
+    from .pricing import lowest_upcoming_price  # 순환 import 방지 (pricing -> facets)
+
+    themes = [
+        {
+            'branch_id': t['branch_id'],
+            'genre': t['genre'],
+            'difficulty': t['difficulty'],
+            'price': t['lowest_price'],
+            'text': (t['name'].lower(), t['genre'].lower()),
+        }
+        for t in sharding.gather_queryset(Theme.objects.filter(is_active=True, status='Ready').annotate(
+            lowest_price=lowest_upcoming_price()
+        ).values('branch_id', 'genre', 'difficulty', 'name', 'lowest_price'))
+    ]
+    branches = list(Branch.objects.filter(is_active=True).order_by('branch_name').values_list('branch_id', 'branch_name'))
+    return {'themes': themes, 'branches': branches}
+
+
+def _get_index(version):
+    if _local_index['version'] == version:
+        return _local_index['index']
+    index = cache.get(INDEX_KEY.format(version))
+    if index is None:
+        index = _build_index()
+        cache.set(INDEX_KEY.format(version), index, getattr(settings, 'FACET_CACHE_SECONDS', 600))
+    _local_index.update(version=version, index=index)
+    return index
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def facet_counts(search_query='', branch_id='', genre='', difficulty='', max_price=''):
+    """현재 검색/필터 상태에서 지점, 장르, 난이도, 가격대별 테마 수"""
+    filters = {
+        'search': (search_query or '').strip().lower(),
+        'branch': _to_int(branch_id),
+        'genre': genre or '',
+        'difficulty': _to_int(difficulty),
+        'max_price': _to_int(max_price),
+    }
+    version = _version()
+    digest = hashlib.md5(repr(sorted(filters.items())).encode()).hexdigest()
+    result_key = RESULT_KEY.format(version, digest)
+    result = cache.get(result_key)
+    metrics.cache_lookup('facets', hits=int(result is not None), misses=int(result is None))
+    if result is not None:
+        return result
+
+    index = _get_index(version)
+    checks = {
+        'search': lambda t: not filters['search'] or any(filters['search'] in text for text in t['text']),
+        'branch': lambda t: filters['branch'] is None or t['branch_id'] == filters['branch'],
+        'genre': lambda t: not filters['genre'] or t['genre'] == filters['genre'],
+        'difficulty': lambda t: filters['difficulty'] is None or t['difficulty'] == filters['difficulty'],
+        'max_price': lambda t: filters['max_price'] is None or (t['price'] is not None and t['price'] <= filters['max_price']),
+    }
+
+    def matching(exclude):
+        """exclude 필터를 제외한 나머지 필터를 모두 만족하는 테마"""
+        active = [check for name, check in checks.items() if name != exclude]
+        return [t for t in index['themes'] if all(check(t) for check in active)]
+
+    branch_counts, genre_counts, difficulty_counts = {}, {}, {}
+    for t in matching('branch'):
+        branch_counts[t['branch_id']] = branch_counts.get(t['branch_id'], 0) + 1
+    for t in matching('genre'):
+        genre_counts[t['genre']] = genre_counts.get(t['genre'], 0) + 1
+    for t in matching('difficulty'):
+        difficulty_counts[t['difficulty']] = difficulty_counts.get(t['difficulty'], 0) + 1
+    prices = [t['price'] for t in matching('max_price') if t['price'] is not None]
+
+    result = {
+        'branches': [
+            {'branch_id': b_id, 'branch_name': name, 'count': branch_counts.get(b_id, 0)}
+            for b_id, name in index['branches']
+        ],
+        'genres': [
+            {'genre': g, 'count': c} for g, c in sorted(genre_counts.items())
+        ],
+        'difficulties': [
+            {'value': d, 'count': difficulty_counts.get(d, 0)} for d in range(1, 6)
+        ],
+        # max_price 필터와 같은 의미의 누적 개수 (해당 가격 이하로 예약 가능한 테마 수)
+        'price_bands': [
+            {'max_price': bound, 'count': sum(1 for p in prices if p <= bound)}
+            for bound in getattr(settings, 'FACET_PRICE_BANDS', [20000, 25000, 30000, 40000])
+        ],
+    }
+    cache.set(result_key, result, getattr(settings, 'FACET_CACHE_SECONDS', 600))
+    return result
@@ -0,0 +1,180 @@
+# booking/forecast.py
+"""
+테마 슬롯 수요 예측
+
+1. 최근 N주 예약 이력을 (테마 x 일 x 시간)별 건수로 DB에서 집계(쿼리 한 번)하여 NumPy 배열에 배치
+2. 요일 x 시간별 기준치(최근 주일수록 가중치가 큰 가중 평균)와 주간 추세를 계산
+3. 향후 몇 주의 예상 예약 수 / 예상 가동률을 계산하여 지점별로 캐시
+
+모든 테마를 한 번에 배열 연산으로 처리하므로 전체 프랜차이즈 예측도 수 초 안에 끝납니다.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from . import sharding
+from .models import Theme, Reservation
+
+logger = logging.getLogger(__name__)
+
+WEEKDAY_LABELS = ['월', '화', '수', '목', '금', '토', '일']
+CACHE_KEY = 'forecast:branch:{}'
+
+
+def _config(name, default):
+    return getattr(settings, name, default)
+
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def _history_tensor(theme_ids, start_date, weeks):
+    """(테마 x 일 x 시간) 예약 건수 배열 - 취소 건은 수요에서 제외"""
+    theme_pos = {theme_id: i for i, theme_id in enumerate(theme_ids)}
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()), tz)
+    end = start + timedelta(weeks=weeks)
+
+    # (테마, 현지 날짜, 현지 시각)별 건수를 DB에서 집계 -> 행 수는 예약 수와 관계없이 최대 테마 x 일 x 24
+    rows = list(Reservation.objects.filter(
+        theme_id__in=theme_ids,
+        reservation_time__gte=start,
+        reservation_time__lt=end,
+    ).exclude(status='Cancelled').annotate(
+        day=TruncDate('reservation_time', tzinfo=tz),
+        hour=ExtractHour('reservation_time', tzinfo=tz),
+    ).order_by().values('theme_id', 'day', 'hour').annotate(n=Count('pk')).values_list('theme_id', 'day', 'hour', 'n'))
+
+    counts = np.zeros((len(theme_ids), weeks * 7, 24), dtype=np.float64)
+    if rows:
+        theme_col, day_col, hour_col, n_col = zip(*rows)
+        theme_idx = np.fromiter((theme_pos[t] for t in theme_col), dtype=np.intp, count=len(rows))
+        day_idx = (np.array(day_col, dtype='datetime64[D]') - np.datetime64(start_date, 'D')).astype(np.intp)
+        np.add.at(counts, (theme_idx, day_idx, np.asarray(hour_col, dtype=np.intp)), np.asarray(n_col, dtype=np.float64))
+    return counts
+
+
+def _forecast_arrays(counts, horizon_weeks, decay):
+    """
+    counts: (T, W*7, 24)
+    반환: profile (T,7,24) 요일x시간 기준치, weekly (T,H) 주별 예상 예약 수, occupancy (T,) 예상 가동률
+    """
+    num_themes, num_days, _ = counts.shape
+    weeks = num_days // 7
+    by_week = counts.reshape(num_themes, weeks, 7, 24)
+
+    # 최근 주일수록 큰 가중치를 주는 지수 가중 평균 -> 요일 x 시간 기준치
+    weights = decay ** np.arange(weeks - 1, -1, -1, dtype=np.float64)
+    weights /= weights.sum()
+    profile = np.tensordot(by_week, weights, axes=([1], [0]))  # (T, 7, 24)
+
+    # 주간 예약 수의 선형 추세 (최소제곱 기울기)
+    weekly_totals = by_week.sum(axis=(2, 3))  # (T, W)
+    x = np.arange(weeks, dtype=np.float64) - (weeks - 1) / 2
+    slope = (weekly_totals - weekly_totals.mean(axis=1, keepdims=True)) @ x / max((x @ x), 1.0)
+
+    level = profile.sum(axis=(1, 2))  # (T,)
+    steps = np.arange(1, horizon_weeks + 1, dtype=np.float64)
+    weekly = np.clip(level[:, None] + slope[:, None] * steps[None, :], 0, None)  # (T, H)
+
+    # 한 번이라도 예약이 있었던 (요일, 시간)을 운영 슬롯으로 간주하여 가동률 계산
+    capacity = (by_week.sum(axis=1) > 0).sum(axis=(1, 2))  # (T,)
+    expected_per_week = np.minimum(profile, 1.0).sum(axis=(1, 2))
+    occupancy = np.divide(
+        expected_per_week, capacity,
+        out=np.zeros_like(expected_per_week), where=capacity > 0,
+    )
+    return profile, weekly, occupancy
+
+
+def occupancy_profiles(theme_ids, today=None):
+    """테마별 (요일 x 시간) 예상 예약 확률(0~1) 배열 (T, 7, 24) - 가격 캘린더의 수요 반영에 사용"""
+    today = today or timezone.localdate()
+    lookback = _config('FORECAST_LOOKBACK_WEEKS', 12)
+    counts = _history_tensor(
+        list(theme_ids),
+        start_date=_week_start(today) - timedelta(weeks=lookback),
+        weeks=lookback,
+    )
+    profile, _, _ = _forecast_arrays(counts, 1, _config('FORECAST_DECAY', 0.85))
+    return np.minimum(profile, 1.0)
+
+
+def build_forecasts(branch_ids=None, today=None):
+    """
+    지정한 지점(없으면 전체)의 모든 테마 수요 예측을 계산하여 지점별로 캐시하고 반환
+    반환: {branch_id: {'generated_at', 'week_starts', 'themes': [...]}}
+    """
+    started = time.monotonic()
+    today = today or timezone.localdate()
+    lookback = _config('FORECAST_LOOKBACK_WEEKS', 12)
+    horizon = _config('FORECAST_HORIZON_WEEKS', 4)
+    decay = _config('FORECAST_DECAY', 0.85)
+
+    themes = Theme.objects.filter(is_active=True).select_related('branch').order_by('branch_id', 'theme_id')
+    if branch_ids is not None:
+        # 샤딩(booking/sharding.py) 시 현재 샤드의 지점만 계산 (다른 샤드 지점의 캐시를 빈 값으로 덮지 않도록)
+        branch_ids = sharding.local_branch_ids(branch_ids)
+        themes = themes.filter(branch_id__in=branch_ids)
+    themes = list(themes)
+
+    this_week = _week_start(today)
+    week_starts = [this_week + timedelta(weeks=i) for i in range(horizon)]
+    results = {
+        branch_id: {'generated_at': timezone.now(), 'week_starts': week_starts, 'themes': []}
+        for branch_id in (branch_ids if branch_ids is not None else {t.branch_id for t in themes})
+    }
+
+    if themes:
+        counts = _history_tensor(
+            [t.theme_id for t in themes],
+            start_date=this_week - timedelta(weeks=lookback),
+            weeks=lookback,
+        )
+        profile, weekly, occupancy = _forecast_arrays(counts, horizon, decay)
+        peak = profile.reshape(len(themes), -1).argmax(axis=1)
+        has_history = counts.sum(axis=(1, 2)) > 0
+
+        for i, theme in enumerate(themes):
+            results[theme.branch_id]['themes'].append({
+                'theme_id': theme.theme_id,
+                'theme_name': theme.name,
+                'branch_name': theme.branch.branch_name,
+                'weekly_expected': [round(float(v), 1) for v in weekly[i]],
+                'occupancy': round(float(occupancy[i]) * 100, 1),
+                'peak_weekday': WEEKDAY_LABELS[peak[i] // 24] if has_history[i] else None,
+                'peak_hour': int(peak[i] % 24) if has_history[i] else None,
+            })
+
+    timeout = _config('FORECAST_CACHE_SECONDS', 6 * 60 * 60)
+    cache.set_many({CACHE_KEY.format(k): v for k, v in results.items()}, timeout)
+
+    logger.info(
+        "Built forecasts for %d themes in %d branches (%.2fs)",
+        len(themes), len(results), time.monotonic() - started,
+    )
+    return results
+
+
+def get_branch_forecasts(branch_ids):
+    """지점별 예측을 캐시에서 읽고, 없는 지점만 다시 계산하여 하나의 테마 목록으로 반환"""
+    branch_ids = list(branch_ids)
+    cached = cache.get_many([CACHE_KEY.format(b) for b in branch_ids])
+    forecasts = {b: cached[CACHE_KEY.format(b)] for b in branch_ids if CACHE_KEY.format(b) in cached}
+
+    missing = [b for b in branch_ids if b not in forecasts]
+    if missing:
+        forecasts.update(build_forecasts(branch_ids=missing))
+
+    themes = [t for forecast in forecasts.values() for t in forecast['themes']]
+    themes.sort(key=lambda t: t['weekly_expected'][0] if t['weekly_expected'] else 0, reverse=True)
+    week_starts = next(iter(forecasts.values()))['week_starts'] if forecasts else []
+    return {'week_starts': week_starts, 'themes': themes}
@@ -1,5 +1,8 @@
 # booking/forms.py
+from datetime import timedelta
+
 from django import forms
+from django.utils import timezone
 from .models import *
 
 # 리뷰 폼
@@ -34,6 +37,61 @@ class ReservationForm(forms.ModelForm):
             'num_of_participants': '참가 인원',
         }
 
+# 단체 예약 폼 - 한 줄에 방(테마 / 시간) 하나 (booking/group_booking.py)
+class GroupReservationItemForm(forms.Form):
+    theme = forms.ModelChoiceField(
+        queryset=Theme.objects.none(),
+        label='테마',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    reservation_time = forms.DateTimeField(
+        label='예약 날짜 및 시간',
+        widget=forms.DateTimeInput(attrs={'type': 'datetime-local', 'class': 'form-control'}),
+    )
+    num_of_participants = forms.IntegerField(
+        label='참가 인원',
+        min_value=1,
+        widget=forms.NumberInput(attrs={'min': 1, 'class': 'form-control', 'placeholder': '인원 수'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        branch = kwargs.pop('branch')
+        super().__init__(*args, **kwargs)
+        self.fields['theme'].queryset = Theme.objects.filter(branch=branch, is_active=True, status='Ready')
+
+    def clean_reservation_time(self):
+        reservation_time = self.cleaned_data['reservation_time']
+        if reservation_time < timezone.now():
+            raise forms.ValidationError("지난 시간은 예약할 수 없습니다.")
+        return reservation_time
+
+
+class BaseGroupReservationFormSet(forms.BaseFormSet):
+    def clean(self):
+        super().clean()
+        seen = set()
+        for form in self.forms:
+            if not form.has_changed() or form.errors:
+                continue
+            key = (form.cleaned_data['theme'].pk, form.cleaned_data['reservation_time'])
+            if key in seen:
+                form.add_error('reservation_time', '같은 테마 / 시간이 중복되었습니다.')
+            seen.add(key)
+
+    def items(self):
+        """[(테마, 예약 시각, 참가 인원)] - 비워 둔 줄은 제외"""
+        return [
+            (f.cleaned_data['theme'], f.cleaned_data['reservation_time'], f.cleaned_data['num_of_participants'])
+            for f in self.forms if f.has_changed()
+        ]
+
+
+def group_reservation_formset(rooms, max_rooms):
+    return forms.formset_factory(
+        GroupReservationItemForm, formset=BaseGroupReservationFormSet, extra=max(rooms - 1, 0),
+        min_num=1, max_num=max_rooms, validate_min=True, validate_max=True,
+    )
+
 # 시설 문제 보고 폼
 class IssueReportForm(forms.ModelForm):
     class Meta:
@@ -73,7 +131,7 @@ class ScheduleForm(forms.ModelForm):
 
         if user:
             if user.role == 'BranchManager':
-                my_branch_ids = BranchAssignment.objects.filter(member=user).values_list('branch_id', flat=True)
+                my_branch_ids = list(BranchAssignment.objects.filter(member=user).values_list('branch_id', flat=True))
                 
                 self.fields['branch'].queryset = Branch.objects.filter(
                     branch_id__in=my_branch_ids, 
@@ -97,6 +155,56 @@ class ScheduleForm(forms.ModelForm):
             elif user.role == 'Admin':
                 pass
 
+    def clean(self):
+        cleaned_data = super().clean()
+        start_time = cleaned_data.get('start_time')
+        end_time = cleaned_data.get('end_time')
+        if start_time and end_time and start_time == end_time:
+            raise forms.ValidationError("시작 시간과 종료 시간이 같을 수 없습니다.")
+        return cleaned_data
+
+# 주간 스케줄 일괄 복사 폼 (지난 주 복사 / N주 반복 적용)
+class ScheduleWeekCopyForm(forms.Form):
+    branch = forms.ModelChoiceField(
+        queryset=Branch.objects.filter(is_active=True),
+        label='근무 지점',
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    source_week_start = forms.DateField(
+        label='원본 주 시작일',
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
+    )
+    target_week_start = forms.DateField(
+        label='적용 시작일',
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
+    )
+    weeks = forms.IntegerField(
+        label='반복 주 수',
+        min_value=1,
+        max_value=12,
+        initial=1,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        user = kwargs.pop('user', None)
+        super().__init__(*args, **kwargs)
+
+        if user and user.role == 'BranchManager':
+            my_branch_ids = list(BranchAssignment.objects.filter(member=user).values_list('branch_id', flat=True))
+            self.fields['branch'].queryset = Branch.objects.filter(
+                branch_id__in=my_branch_ids,
+                is_active=True
+            )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        source = cleaned_data.get('source_week_start')
+        target = cleaned_data.get('target_week_start')
+        if source and target and target < source + timedelta(days=7):
+            raise forms.ValidationError("적용 시작일은 원본 주가 끝난 이후여야 합니다.")
+        return cleaned_data
+
 # 지점 관리자용 테마 수정 폼
 class BranchThemeUpdateForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,112 @@
+# booking/group_booking.py
+"""
+단체 예약 - 한 지점의 여러 (테마, 시간) 슬롯을 한 번에 예약 (전부 성공 또는 전부 실패)
+
+- 슬롯 선점(SlotHold)을 한 번에 INSERT 해서 다른 고객의 선점 / 단체 예약과 겹치지 않게 잠근 뒤
+  예약 여부를 쿼리 한 번으로 확인하고 예약 / 결제를 bulk_create
+  -> 방 수와 관계없이 쿼리 수가 일정 (가격 1 + 선점 정리 / 잠금 / 확인 / 예약 / 결제 / 이벤트 / 선점 해제)
+- bulk_create는 시그널이 발생하지 않으므로 이벤트 로그, 슬롯 스탬프, 마이페이지 요약 캐시를 직접 처리
+- 한 지점의 테마만 받음 (샤딩 시 같은 샤드)
+"""
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+
+from . import events, metrics, sharding
+from .models import SlotHold, Reservation, Payment
+from .pricing import prices_for_slots
+from .stamps import bump
+from .timeline import invalidate_member_counters
+
+
+class GroupBookingError(Exception):
+    """예약할 수 없는 슬롯이 있는 경우 (slots: [(테마, 예약 시각)])"""
+
+    def __init__(self, message, slots=()):
+        super().__init__(message)
+        self.slots = list(slots)
+
+
+def _slots_q(items, theme_field='theme_id', time_field='reservation_time'):
+    return reduce(or_, (Q(**{theme_field: theme.theme_id, time_field: when}) for theme, when, _ in items))
+
+
+def book_group(member, items, payment_method='가상 카드'):
+    """
+    items: [(테마, 예약 시각, 참가 인원)] -> 생성한 예약 목록 (items 순서)
+    예약할 수 없는 슬롯이 하나라도 있으면 GroupBookingError (아무것도 저장하지 않음)
+    """
+    if not items:
+        return []
+    if len({(theme.theme_id, when) for theme, when, _ in items}) != len(items):
+        raise GroupBookingError("같은 테마 / 시간이 중복되었습니다.")
+    if len({theme.branch_id for theme, _, _ in items}) > 1:
+        raise GroupBookingError("단체 예약은 한 지점의 테마만 가능합니다.")
+
+    now = timezone.now()
+    unit_prices = prices_for_slots([(theme, when) for theme, when, _ in items])
+    themes = {theme.theme_id: theme for theme, _, _ in items}
+    try:
+        with sharding.atomic():
+            # 만료된 선점과 이 회원이 결제 중이던 선점은 단체 예약으로 대체
+            SlotHold.objects.filter(_slots_q(items, time_field='slot_time')).filter(
+                Q(expires_at__lte=now) | Q(member=member)
+            ).delete()
+            # 다른 고객이 선점 중이면 유니크 제약 위반 -> 전체 실패
+            SlotHold.objects.bulk_create([
+                SlotHold(
+                    theme_id=theme.theme_id, slot_time=when, member=member, num_of_participants=participants,
+                    total_price=0, expires_at=now + timedelta(seconds=getattr(settings, 'SLOT_HOLD_SECONDS', 300)),
+                )
+                for theme, when, participants in items
+            ])
+
+            booked = list(Reservation.objects.filter(
+                _slots_q(items), status__in=['Confirmed', 'CheckedIn'],
+            ).values_list('theme_id', 'reservation_time'))
+            if booked:
+                metrics.booking_outcome('group', 'conflict')
+                raise GroupBookingError(
+                    "이미 예약된 시간이 있습니다.",
+                    [(themes[theme_id], when) for theme_id, when in booked],
+                )
+
+            reservations = Reservation.objects.bulk_create([
+                Reservation(
+                    member=member, theme_id=theme.theme_id, reservation_time=when,
+                    num_of_participants=participants, total_price=price * participants,
+                )
+                for (theme, when, participants), price in zip(items, unit_prices)
+            ])
+            payments = Payment.objects.bulk_create([
+                Payment(reservation=r, payment_method=payment_method, amount=r.total_price, payment_status='Paid')
+                for r in reservations
+            ])
+            with events.batch():
+                for r in reservations:
+                    events.record_save('reservation', r, True, theme_id=r.theme_id, member_id=r.member_id)
+                for p in payments:
+                    events.record('payment', 'created', p.pk, payment_status=p.payment_status,
+                                  amount=p.amount, reservation_id=p.reservation_id)
+            SlotHold.objects.filter(_slots_q(items, time_field='slot_time'), member=member).delete()
+
+            # 예약 시그널(booking/signals.py)이 하던 일
+            stamp_names = [f'theme:{theme_id}:slots' for theme_id in themes]
+
+            def after_commit():
+                bump(*stamp_names)
+                invalidate_member_counters([member.pk])
+            sharding.on_commit(after_commit)
+    except IntegrityError:
+        metrics.booking_outcome('group', 'held_by_other')
+        raise GroupBookingError("다른 고객이 결제 중인 시간이 있습니다. 잠시 후 다시 시도해주세요.")
+
+    metrics.booking_outcome('group', 'booked')
+    for r in reservations:
+        r.theme = themes[r.theme_id]
+    return reservations
@@ -0,0 +1,157 @@
+# booking/holds.py
+"""
+결제 중 슬롯 임시 선점 (SlotHold)
+
+- 예약 폼 제출 시 (테마, 시간) 슬롯을 SLOT_HOLD_SECONDS 동안 선점 (유니크 제약으로 한 고객만 성공)
+  -> 결제 화면에서 확정하면 짧은 트랜잭션으로 예약 + 결제 생성, 아니면 만료되어 다른 고객이 선점 가능
+- 만료된 선점은 새로 선점할 때 지우고, 스케줄러(expire_holds)가 주기적으로 정리
+- 고객당 선점은 하나 (새 슬롯을 선점하면 이전 선점은 해제)
+- 선점 / 거절 / 확정 / 해제 / 만료 건수를 분 단위로 캐시에 집계 (hold_metrics, 전체 통계 화면)
+- 선점 중인 슬롯은 예약 불가로 표시되므로 선점 / 해제 / 만료 시 테마의 슬롯 스탬프를 올림 (API ETag)
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.utils import timezone
+
+from . import metrics, sharding
+from .models import SlotHold, Reservation, Payment
+from .pricing import price_for_slot
+from .stamps import bump
+
+METRIC_KEY = 'holds:metric:{}:{}'
+METRICS = ('held', 'rejected', 'confirmed', 'released', 'expired')
+METRIC_TTL = 60 * 60 * 25
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _count(name, amount=1):
+    if not amount:
+        return
+    metrics.booking_outcome('checkout', name, amount)
+    key = METRIC_KEY.format(name, int(time.time() // 60))
+    cache.add(key, 0, METRIC_TTL)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        pass
+
+
+def hold_metrics(minutes=60):
+    """최근 minutes분 동안의 {이름: 건수, ...} + 확정률 / 만료율 (선점 대비)"""
+    now = int(time.time() // 60)
+    keys = {METRIC_KEY.format(name, minute): name for name in METRICS for minute in range(now - minutes + 1, now + 1)}
+    totals = dict.fromkeys(METRICS, 0)
+    for key, value in cache.get_many(keys).items():
+        totals[keys[key]] += value
+    held = totals['held']
+    totals['confirm_rate'] = totals['confirmed'] / held if held else None
+    totals['expire_rate'] = totals['expired'] / held if held else None
+    totals['minutes'] = minutes
+    return totals
+
+
+def _slots_changed(theme_ids):
+    """선점 상태가 바뀐 테마의 슬롯 스탬프를 커밋 후 올림"""
+    stamp_names = [f'theme:{theme_id}:slots' for theme_id in set(theme_ids)]
+    if stamp_names:
+        sharding.on_commit(lambda: bump(*stamp_names))
+
+
+def _slot_booked(theme, slot_time):
+    return Reservation.objects.filter(
+        theme=theme, reservation_time=slot_time, status__in=['Confirmed', 'CheckedIn'],
+    ).exists()
+
+
+def acquire(theme, slot_time, member, num_of_participants):
+    """슬롯 선점 -> SlotHold, 이미 예약되었거나 다른 고객이 선점 중이면 None"""
+    if _slot_booked(theme, slot_time):
+        _count('rejected')
+        return None
+
+    now = timezone.now()
+    total_price = price_for_slot(theme, slot_time) * num_of_participants
+    with sharding.atomic():
+        expired, _ = SlotHold.objects.filter(theme=theme, slot_time=slot_time, expires_at__lte=now).delete()
+        previous = SlotHold.objects.filter(member=member).exclude(theme=theme, slot_time=slot_time)
+        changed = list(previous.values_list('theme_id', flat=True))
+        released, _ = previous.delete()
+        try:
+            with sharding.atomic():
+                hold = SlotHold.objects.create(
+                    theme=theme, slot_time=slot_time, member=member, num_of_participants=num_of_participants,
+                    total_price=total_price, expires_at=now + timedelta(seconds=_setting('SLOT_HOLD_SECONDS', 300)),
+                )
+            changed.append(theme.pk)
+        except IntegrityError:
+            hold = SlotHold.objects.filter(theme=theme, slot_time=slot_time).first()
+            if hold is None or hold.member_id != member.pk:
+                hold = None
+            else:
+                # 같은 고객이 다시 제출(뒤로 가기 등) - 인원 / 금액만 갱신 (만료 시간은 연장하지 않음)
+                hold.num_of_participants = num_of_participants
+                hold.total_price = total_price
+                hold.save(update_fields=['num_of_participants', 'total_price'])
+        if expired:
+            changed.append(theme.pk)
+        _slots_changed(changed)
+    _count('expired', expired)
+    _count('released', released)
+
+    # 선점 직전에 다른 경로(관리자 등)로 예약된 경우
+    if hold is not None and _slot_booked(theme, slot_time):
+        hold.delete()
+        hold = None
+        _slots_changed([theme.pk])
+    _count('held' if hold is not None else 'rejected')
+    return hold
+
+
+def get_active(hold_id, member):
+    """회원의 만료되지 않은 선점 (없으면 None)"""
+    return SlotHold.objects.select_related('theme__branch').filter(
+        pk=hold_id, member=member, expires_at__gt=timezone.now(),
+    ).first()
+
+
+def confirm(hold, member, payment_method='가상 카드'):
+    """선점 -> 예약 + 결제 (짧은 트랜잭션), 그 사이 만료되어 다른 고객이 가져갔으면 None"""
+    with sharding.atomic():
+        deleted, _ = SlotHold.objects.filter(pk=hold.pk, member=member, expires_at__gt=timezone.now()).delete()
+        if not deleted or _slot_booked(hold.theme, hold.slot_time):
+            return None
+        reservation = Reservation.objects.create(
+            member=member, theme=hold.theme, reservation_time=hold.slot_time,
+            num_of_participants=hold.num_of_participants, total_price=hold.total_price,
+        )
+        Payment.objects.create(
+            reservation=reservation, payment_method=payment_method, amount=hold.total_price, payment_status='Paid',
+        )
+    _count('confirmed')
+    return reservation
+
+
+def release(hold):
+    """고객이 결제를 취소한 경우"""
+    deleted, _ = SlotHold.objects.filter(pk=hold.pk).delete()
+    if deleted:
+        _slots_changed([hold.theme_id])
+    _count('released', deleted)
+
+
+def expire_holds():
+    """만료된 선점 정리 (스케줄러, 현재 샤드)"""
+    expired = SlotHold.objects.filter(expires_at__lte=timezone.now())
+    with sharding.atomic():
+        theme_ids = list(expired.values_list('theme_id', flat=True).distinct())
+        deleted, _ = expired.delete()
+        _slots_changed(theme_ids)
+    _count('expired', deleted)
+    return deleted
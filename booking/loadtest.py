@@ -0,0 +1,305 @@
+# booking/loadtest.py
+"""
+예약 오픈 부하 테스트 (asyncio + httpx, `load_test` 명령에서 사용)
+
+- 시나리오 파일(JSON, loadtest/*.json)에 정의한 단계(로그인 -> 테마 목록 -> 상세 -> 예약(슬롯 선점) -> 결제 확정)를
+  가상 사용자마다 생각 시간(think time)을 두고 실행
+- 예약 대상은 한 지점의 테마 / 정해진 날짜, 시간대 안에서 골라 같은 슬롯을 두고 경쟁하게 함
+- 단계별 처리량, p50/p95/p99 응답 시간, 오류율, 예약 충돌률, 429(요청 제한) 비율, 쿼리 수(X-Query-Count 헤더)를 집계
+  전체 결과의 goodput = 초당 예약 성공 수 (과부하 시 요청 제한 효과 비교용)
+  (쿼리 수는 서버에 QUERY_COUNT_HEADER = True 가 설정된 경우에만)
+
+시나리오 형식:
+{
+  "name": "booking_rush",
+  "users": 200,                    가상 사용자 수
+  "ramp_up_seconds": 10,           모든 사용자가 시작할 때까지 걸리는 시간
+  "iterations": 1,                 사용자당 반복 횟수 (로그인 단계는 첫 반복에만)
+  "think_time": [1.0, 3.0],        단계 사이 대기 시간 범위 (초)
+  "timeout_seconds": 30,
+  "target": {
+    "branch": null,                대상 지점 ID (null이면 테마가 가장 많은 지점)
+    "hot_themes": 2,               인기 테마 수 (0이면 지점 전체 테마)
+    "days_ahead": [28, 28],        예약 날짜 범위 (오늘 기준 며칠 후)
+    "hours": [19, 20, 21],         예약 시간 (정시)
+    "participants": [2, 4]
+  },
+  "steps": [
+    {"name": "login", "action": "login"},
+    {"name": "theme_list", "action": "get", "path": "/themes/?branch={branch_id}"},
+    {"name": "theme_detail", "action": "get", "path": "/themes/{theme_id}/"},
+    {"name": "booking_form", "action": "get", "path": "/reservation/create/{theme_id}/"},
+    {"name": "book", "action": "book"},
+    {"name": "confirm", "action": "confirm"}
+  ]
+}
+"""
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+import httpx
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+# 예약 폼 오류 메시지 중 "다른 사용자가 먼저 예약한 슬롯" 으로 보는 것
+CONFLICT_TEXT = '이미 예약'
+QUERY_HEADER = 'X-Query-Count'
+
+
+def load_scenario(path):
+    with open(path, encoding='utf-8') as f:
+        scenario = json.load(f)
+    scenario.setdefault('name', str(path))
+    scenario.setdefault('users', 10)
+    scenario.setdefault('ramp_up_seconds', 0)
+    scenario.setdefault('iterations', 1)
+    scenario.setdefault('think_time', [0.0, 0.0])
+    scenario.setdefault('timeout_seconds', 30)
+    scenario.setdefault('target', {})
+    if not scenario.get('steps'):
+        raise ValueError("시나리오에 steps가 없습니다.")
+    return scenario
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    index = (len(values) - 1) * p / 100
+    lower = int(index)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (index - lower)
+
+
+class StepStats:
+    def __init__(self):
+        self.latencies = []
+        self.queries = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.conflicts = 0
+        self.throttled = 0
+        self.successes = 0
+
+    def add(self, elapsed, response=None, error=False):
+        self.latencies.append(elapsed)
+        if response is not None:
+            self.statuses[response.status_code] += 1
+            if response.status_code == 429:
+                self.throttled += 1
+                error = False
+            if response.headers.get(QUERY_HEADER):
+                self.queries.append(int(response.headers[QUERY_HEADER]))
+        if error:
+            self.errors += 1
+
+    def summary(self, elapsed):
+        count = len(self.latencies)
+        ms = [v * 1000 for v in self.latencies]
+        return {
+            'requests': count,
+            'throughput': round(count / elapsed, 2) if elapsed else None,
+            'p50_ms': _round(percentile(ms, 50)),
+            'p95_ms': _round(percentile(ms, 95)),
+            'p99_ms': _round(percentile(ms, 99)),
+            'max_ms': _round(max(ms) if ms else None),
+            'error_rate': round(self.errors / count, 4) if count else 0,
+            'conflicts': self.conflicts,
+            'conflict_rate': round(self.conflicts / count, 4) if count else 0,
+            'throttled_rate': round(self.throttled / count, 4) if count else 0,
+            'successes': self.successes,
+            'queries_avg': round(statistics.mean(self.queries), 1) if self.queries else None,
+            'queries_max': max(self.queries) if self.queries else None,
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+class LoadTest:
+    def __init__(self, scenario, base_url, credentials, seed=None):
+        self.scenario = scenario
+        self.base_url = base_url.rstrip('/')
+        self.credentials = credentials  # [(login_id, password)] - 가상 사용자마다 하나씩
+        self.rng = random.Random(seed)
+        self.stats = defaultdict(StepStats)
+        self.booked = []  # (theme_id, 예약 시각 문자열)
+        self.branch_id = None
+        self.theme_ids = []
+
+    # ------------------------------------------------------------------
+    # 대상 지점 / 테마 / 슬롯
+    # ------------------------------------------------------------------
+    async def discover(self, client):
+        """공개 API로 대상 지점의 예약 가능한 테마 목록 조회"""
+        target = self.scenario['target']
+        themes = []
+        after = None
+        while True:
+            params = {'limit': 100, 'fields': 'theme_id,branch_id,status'}
+            if target.get('branch'):
+                params['branch'] = target['branch']
+            if after:
+                params['after'] = after
+            response = await client.get('/api/v1/themes/', params=params)
+            response.raise_for_status()
+            data = response.json()
+            themes += [t for t in data['results'] if t['status'] == 'Ready']
+            after = data.get('next')
+            if not after:
+                break
+        if not themes:
+            raise RuntimeError("예약 가능한 테마가 없습니다.")
+
+        by_branch = defaultdict(list)
+        for theme in themes:
+            by_branch[theme['branch_id']].append(theme['theme_id'])
+        self.branch_id = target.get('branch') or max(by_branch, key=lambda b: len(by_branch[b]))
+        self.theme_ids = sorted(by_branch[self.branch_id])
+        hot = target.get('hot_themes', 0)
+        if hot:
+            self.theme_ids = self.theme_ids[:hot]
+
+    def pick_slot(self):
+        target = self.scenario['target']
+        low, high = target.get('days_ahead', [28, 28])
+        day = (datetime.now() + timedelta(days=self.rng.randint(low, high))).date()
+        hour = self.rng.choice(target.get('hours', [19, 20, 21]))
+        low, high = target.get('participants', [2, 4])
+        return {
+            'branch_id': self.branch_id,
+            'theme_id': self.rng.choice(self.theme_ids),
+            'reservation_time': f"{day.isoformat()}T{hour:02d}:00",
+            'participants': self.rng.randint(low, high),
+        }
+
+    # ------------------------------------------------------------------
+    # 단계 실행
+    # ------------------------------------------------------------------
+    async def _request(self, step, client, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            self.stats[step['name']].add(time.perf_counter() - started, error=True)
+            return None
+        self.stats[step['name']].add(time.perf_counter() - started, response, error=response.status_code >= 400)
+        return response
+
+    async def _csrf(self, client, path):
+        try:
+            response = await client.get(path)
+        except httpx.HTTPError:
+            return ''
+        match = CSRF_INPUT.search(response.text)
+        return match.group(1) if match else client.cookies.get('csrftoken', '')
+
+    async def login(self, step, client, user, context):
+        login_id, password = user
+        token = await self._csrf(client, '/login/')
+        response = await self._request(step, client, 'POST', '/login/', data={
+            'csrfmiddlewaretoken': token, 'username': login_id, 'password': password,
+        })
+        if response is not None and response.status_code == 200:
+            # 로그인 실패는 200(폼 다시 표시)으로 응답하므로 오류로 집계
+            self.stats[step['name']].errors += 1
+
+    async def get(self, step, client, user, context):
+        response = await self._request(step, client, 'GET', step['path'].format(**context))
+        # 직전 페이지(예약 폼)의 CSRF 토큰을 예약 단계에서 그대로 사용
+        context['last_html'] = response.text if response is not None else ''
+
+    async def book(self, step, client, user, context):
+        path = f"/reservation/create/{context['theme_id']}/"
+        match = CSRF_INPUT.search(context.pop('last_html', ''))
+        token = match.group(1) if match else await self._csrf(client, path)
+        response = await self._request(step, client, 'POST', path, data={
+            'csrfmiddlewaretoken': token,
+            'reservation_time': context['reservation_time'],
+            'num_of_participants': context['participants'],
+        })
+        if response is None:
+            return
+        stats = self.stats[step['name']]
+        location = response.headers.get('location', '')
+        if response.status_code == 302 and '/reservation/checkout/' in location:
+            # 슬롯 선점 성공 -> 결제(confirm) 단계에서 확정
+            stats.successes += 1
+            context['checkout'] = location
+        elif response.status_code == 200 and CONFLICT_TEXT in response.text:
+            stats.conflicts += 1
+        elif response.status_code < 400:
+            # 로그인 페이지로 이동(로그인 실패 / 제한) 등
+            stats.errors += 1
+
+    async def confirm(self, step, client, user, context):
+        """선점한 슬롯 결제 확정 (예약 단계에서 선점하지 못했으면 건너뜀)"""
+        path = context.pop('checkout', None)
+        if path is None:
+            return
+        token = await self._csrf(client, path)
+        response = await self._request(step, client, 'POST', path, data={
+            'csrfmiddlewaretoken': token, 'action': 'confirm',
+        })
+        if response is None:
+            return
+        stats = self.stats[step['name']]
+        if response.status_code == 302 and '/reservation/complete/' in response.headers.get('location', ''):
+            stats.successes += 1
+            self.booked.append((context['theme_id'], context['reservation_time']))
+        elif response.status_code < 400:
+            # 선점 만료 등
+            stats.conflicts += 1
+
+    async def run_user(self, index, user, delay):
+        await asyncio.sleep(delay)
+        think_low, think_high = self.scenario['think_time']
+        async with httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.scenario['timeout_seconds'], follow_redirects=False,
+        ) as client:
+            for iteration in range(self.scenario['iterations']):
+                context = self.pick_slot()
+                for step in self.scenario['steps']:
+                    if step['action'] == 'login' and iteration:
+                        continue
+                    await getattr(self, step['action'])(step, client, user, context)
+                    await asyncio.sleep(self.rng.uniform(think_low, think_high))
+
+    async def run(self):
+        users = self.scenario['users']
+        if len(self.credentials) < users:
+            raise ValueError(f"가상 사용자 {users}명에 필요한 계정이 부족합니다. ({len(self.credentials)}개)")
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.scenario['timeout_seconds']) as client:
+            await self.discover(client)
+
+        ramp = self.scenario['ramp_up_seconds']
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            self.run_user(i, self.credentials[i], ramp * i / users if users else 0) for i in range(users)
+        ))
+        return self.report(time.perf_counter() - started)
+
+    def report(self, elapsed):
+        steps = {step['name']: self.stats[step['name']].summary(elapsed) for step in self.scenario['steps']}
+        total = sum(s['requests'] for s in steps.values())
+        errors = sum(self.stats[name].errors for name in steps)
+        return {
+            'scenario': self.scenario['name'],
+            'users': self.scenario['users'],
+            'elapsed_seconds': round(elapsed, 2),
+            'branch_id': self.branch_id,
+            'theme_ids': self.theme_ids,
+            'requests': total,
+            'throughput': round(total / elapsed, 2) if elapsed else None,
+            'error_rate': round(errors / total, 4) if total else 0,
+            'bookings': len(self.booked),
+            'goodput': round(len(self.booked) / elapsed, 2) if elapsed else None,
+            'steps': steps,
+        }
@@ -0,0 +1,23 @@
+# booking/management/commands/archive_reservations.py
+from django.core.management.base import BaseCommand
+
+from booking import sharding
+from booking.archive import archive_reservations
+
+
+class Command(BaseCommand):
+    help = "보관 기준일이 지난 종료 예약(이용 완료/취소/노쇼)을 압축 세그먼트 파일로 보관합니다. (cron 등록용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="세그먼트 하나에 담을 예약 수")
+        parser.add_argument('--max-batches', type=int, default=None, help="이번 실행에서 만들 최대 세그먼트 수")
+
+    def handle(self, *args, **options):
+        results = sharding.each_shard(
+            archive_reservations, batch_size=options['batch_size'], max_batches=options['max_batches']
+        )
+        result = {key: sum(r[key] for r in results) for key in ('reservations', 'segments', 'elapsed')}
+        self.stdout.write(self.style.SUCCESS(
+            f"예약 {result['reservations']}건을 세그먼트 {result['segments']}개로 보관했습니다. "
+            f"({result['elapsed']:.2f}초)"
+        ))
@@ -0,0 +1,154 @@
+# booking/management/commands/benchmark_admission.py
+import logging
+import random
+import statistics
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from booking.loadtest import percentile
+from booking.models import Branch, Theme, Member, Reservation
+
+
+class Command(BaseCommand):
+    help = (
+        "과부하(예약 연타 + 로그인 대입 봇) 상황에서 요청 제한 / 동시 실행 제한을 끄고 켠 goodput을 비교합니다. "
+        "(임시 지점 / 테마 / 회원을 만들고 측정 후 삭제)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=40, help="예약 버튼을 연타하는 회원 수 (스레드)")
+        parser.add_argument('--bots', type=int, default=8, help="틀린 비밀번호로 로그인을 반복하는 봇 수 (스레드)")
+        parser.add_argument('--seconds', type=float, default=10.0, help="설정별 측정 시간")
+        parser.add_argument('--concurrency', type=int, help="BOOKING_CONCURRENCY 대신 사용 (SQLite는 1~2 권장)")
+        parser.add_argument('--deadline', type=float, default=2.0, help="이 시간보다 오래 걸린 예약은 goodput에서 제외 (초)")
+
+    def handle(self, *args, **options):
+        branch, theme, members = self._seed(options['users'])
+        # 과부하로 실패하는 요청(500)마다 찍히는 오류 로그는 측정 중 생략
+        request_logger = logging.getLogger('django.request')
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            results = []
+            for enabled in (False, True):
+                overrides = {'ADMISSION_ENABLED': enabled}
+                if options['concurrency']:
+                    overrides['BOOKING_CONCURRENCY'] = options['concurrency']
+                with override_settings(**overrides):
+                    results.append((enabled, self._run(theme, members, options)))
+        finally:
+            request_logger.setLevel(level)
+            Reservation.objects.filter(theme=theme).delete()
+            branch.delete()
+            Member.objects.filter(pk__in=[m.pk for m in members]).delete()
+
+        header = (
+            f"{'과부하 보호':<10} {'예약 시도':>8} {'성공':>6} {'429':>6} {'실패':>6} "
+            f"{'성공 p50':>9} {'성공 p99':>9} {'429 p99':>9} {'로그인 시도':>10} {'goodput':>9}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for enabled, r in results:
+            self.stdout.write(
+                f"{'켬' if enabled else '끔':<10} {r['attempts']:8} {r['ok']:6} {r['throttled']:6} {r['failed']:6} "
+                f"{_ms(r['ok_p50'])} {_ms(r['ok_p99'])} {_ms(r['throttled_p99'])} {r['bot_attempts']:10} "
+                f"{r['goodput']:7.1f}/s"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"측정을 완료했습니다. (goodput = {options['deadline']}초 안에 끝난 예약 성공 수 / 측정 시간)"
+        ))
+
+    # ------------------------------------------------------------------
+    def _seed(self, users):
+        tag = uuid.uuid4().hex[:8]
+        branch = Branch.objects.create(branch_name=f'부하 벤치마크 {tag}', location='서울', phone=f'bench-{tag}')
+        theme = Theme.objects.create(
+            branch=branch, name='벤치마크 테마', genre='추리', difficulty=3, duration=60, price=20000, description='벤치마크',
+        )
+        members = []
+        for i in range(users):
+            member = Member(login_id=f'bench_adm_{tag}_{i}', name=f'벤치{i}', phone=f'ba-{tag}-{i}')
+            member.set_unusable_password()
+            members.append(member)
+        return branch, theme, Member.objects.bulk_create(members)
+
+    def _run(self, theme, members, options):
+        lock = threading.Lock()
+        booked, throttled, failed = [], [], []
+        bot_attempts = [0]
+        run = uuid.uuid4().hex[:6]
+        # 로그인(세션 생성)은 측정 전에 미리
+        clients = []
+        for index, member in enumerate(members):
+            client = Client(HTTP_HOST='localhost', raise_request_exception=False, REMOTE_ADDR=f'10.1.{index // 250}.{index % 250 + 1}')
+            client.force_login(member)
+            clients.append(client)
+        stop = time.monotonic() + options['seconds']
+
+        def booker(index, client):
+            rng = random.Random(index)
+            base = timezone.localtime() + timedelta(days=30)
+            path = f'/reservation/create/{theme.theme_id}/'
+            try:
+                while time.monotonic() < stop:
+                    slot = base + timedelta(days=rng.randint(0, 300), hours=rng.randint(0, 12))
+                    started = time.perf_counter()
+                    response = client.post(path, {
+                        'reservation_time': slot.strftime('%Y-%m-%dT%H:00'), 'num_of_participants': 2,
+                    })
+                    if response.status_code == 302 and '/reservation/checkout/' in response['Location']:
+                        # 슬롯 선점 후 바로 결제 확정
+                        response = client.post(response['Location'], {'action': 'confirm'})
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        if response.status_code == 302 and '/reservation/complete/' in response['Location']:
+                            booked.append(elapsed)
+                        elif response.status_code == 429:
+                            throttled.append(elapsed)
+                        else:
+                            failed.append(elapsed)
+            finally:
+                connections.close_all()
+
+        def bot(index):
+            # 봇마다 IP / 노리는 로그인 ID 하나 (매번 비밀번호 해시 비용 발생)
+            client = Client(HTTP_HOST='localhost', raise_request_exception=False, REMOTE_ADDR=f'10.2.{index // 250}.{index % 250 + 1}')
+            login_id = f'victim_{run}_{index}'
+            try:
+                while time.monotonic() < stop:
+                    client.post('/login/', {'username': login_id, 'password': 'wrong'})
+                    with lock:
+                        bot_attempts[0] += 1
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=booker, args=(i, c)) for i, c in enumerate(clients)]
+        threads += [threading.Thread(target=bot, args=(i,)) for i in range(options['bots'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        in_time = [t for t in booked if t <= options['deadline']]
+        return {
+            'attempts': len(booked) + len(throttled) + len(failed),
+            'ok': len(booked),
+            'throttled': len(throttled),
+            'failed': len(failed),
+            'ok_p50': statistics.median(booked) * 1000 if booked else None,
+            'ok_p99': percentile(booked, 99) * 1000 if booked else None,
+            'throttled_p99': percentile(throttled, 99) * 1000 if throttled else None,
+            'bot_attempts': bot_attempts[0],
+            'goodput': len(in_time) / options['seconds'],
+        }
+
+
+def _ms(value):
+    return f"{value:7.0f}ms" if value is not None else f"{'-':>9}"
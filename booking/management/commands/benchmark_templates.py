@@ -0,0 +1,187 @@
+# booking/management/commands/benchmark_templates.py
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.utils import timezone
+
+from booking.models import Branch, Theme, Member, Reservation, Review, Payment, Notice, BranchAssignment
+from booking.reviews import refresh_rating_summary
+from booking.template_profiler import profile_render
+
+
+class Rollback(Exception):
+    """--seed 데이터는 측정 후 되돌림"""
+
+
+class Command(BaseCommand):
+    help = "주요 화면의 렌더링 시간(뷰/ORM vs 템플릿)과 쿼리 수를 측정합니다. --seed 로 실제 규모의 임시 데이터를 만들어 측정할 수 있습니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="화면별 측정 횟수 (중앙값 출력)")
+        parser.add_argument('--seed', action='store_true', help="임시 데이터를 생성하여 측정 (측정 후 롤백)")
+        parser.add_argument('--branches', type=int, default=5)
+        parser.add_argument('--themes', type=int, default=8, help="지점당 테마 수")
+        parser.add_argument('--members', type=int, default=2000)
+        parser.add_argument('--reservations', type=int, default=50000)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    users = self._seed(options)
+                else:
+                    users = self._existing_users()
+                self._run(users, options['repeat'])
+                if options['seed']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("임시 데이터를 롤백했습니다.")
+
+    # ------------------------------------------------------------------
+    def _existing_users(self):
+        def first(**filters):
+            return Member.objects.filter(**filters).order_by('member_id').first()
+
+        users = {
+            'Customer': first(role='Customer', reservation__isnull=False) or first(role='Customer'),
+            'ThemeManager': first(role='ThemeManager', branchassignment__isnull=False),
+            'BranchManager': first(role='BranchManager', branchassignment__isnull=False),
+            'Admin': first(role='Admin'),
+        }
+        if not any(users.values()):
+            raise CommandError("측정할 회원이 없습니다. --seed 옵션으로 임시 데이터를 만들어 측정하세요.")
+        return users
+
+    def _seed(self, options):
+        started = time.monotonic()
+        rng = random.Random(42)
+        now = timezone.now()
+
+        branches = Branch.objects.bulk_create([
+            Branch(branch_name=f'벤치마크 {i + 1}호점', location='서울', phone=f'bench-b{i}')
+            for i in range(options['branches'])
+        ])
+        genres = ['공포', '추리', 'SF', '모험', '감성', '코미디']
+        themes = Theme.objects.bulk_create([
+            Theme(
+                branch=branch, name=f'{branch.branch_name} 테마 {j + 1}', genre=rng.choice(genres),
+                difficulty=rng.randint(1, 5), duration=rng.choice([60, 70, 80, 90]),
+                price=rng.choice([20000, 22000, 25000, 28000]), description='벤치마크용 테마 설명 ' * 5,
+            )
+            for branch in branches for j in range(options['themes'])
+        ])
+        members = Member.objects.bulk_create([
+            Member(login_id=f'bench_c{i}', name=f'고객{i}', phone=f'bench-c{i}', password='!')
+            for i in range(options['members'])
+        ])
+        staff = Member.objects.bulk_create([
+            Member(login_id='bench_tm', name='테마관리자', phone='bench-tm', role='ThemeManager', password='!'),
+            Member(login_id='bench_bm', name='지점관리자', phone='bench-bm', role='BranchManager', password='!'),
+            Member(login_id='bench_admin', name='총괄관리자', phone='bench-admin', role='Admin', password='!'),
+        ])
+        BranchAssignment.objects.bulk_create([
+            BranchAssignment(branch=branches[0], member=staff[0]),
+            BranchAssignment(branch=branches[0], member=staff[1]),
+        ])
+
+        reservations = []
+        for _ in range(options['reservations']):
+            theme = rng.choice(themes)
+            when = now + timedelta(hours=rng.randint(-24 * 180, 24 * 14))
+            participants = rng.randint(2, 6)
+            if when > now:
+                status = 'Cancelled' if rng.random() < 0.1 else 'Confirmed'
+            else:
+                status = rng.choices(['Completed', 'NoShow', 'Cancelled'], [85, 5, 10])[0]
+            reservations.append(Reservation(
+                member=rng.choice(members), theme=theme, reservation_time=when,
+                num_of_participants=participants, total_price=theme.price * participants, status=status,
+                is_success=(rng.random() < 0.4) if status == 'Completed' else None,
+            ))
+        reservations = Reservation.objects.bulk_create(reservations, batch_size=5000)
+
+        completed = [r for r in reservations if r.status == 'Completed']
+        Payment.objects.bulk_create([
+            Payment(reservation=r, payment_method='Card', amount=r.total_price, payment_status='Paid')
+            for r in reservations if r.status != 'Cancelled'
+        ], batch_size=5000)
+        Review.objects.bulk_create([
+            Review(reservation=r, member_id=r.member_id, theme_id=r.theme_id, rating=rng.randint(1, 5), comment='재미있었어요')
+            for r in completed if rng.random() < 0.3
+        ], batch_size=5000)
+        for theme in themes:
+            refresh_rating_summary(theme.theme_id)
+        Notice.objects.bulk_create([
+            Notice(member=staff[2], title=f'공지 {i + 1}', content='벤치마크 공지', target_branch=rng.choice([None] + branches))
+            for i in range(50)
+        ])
+
+        self.stdout.write(
+            f"임시 데이터 생성: 지점 {len(branches)}, 테마 {len(themes)}, 회원 {len(members)}, "
+            f"예약 {len(reservations)} ({time.monotonic() - started:.1f}s)"
+        )
+        # 예약 이력이 있는 고객으로 마이페이지 측정
+        customer_id = Reservation.objects.filter(member__in=members).values('member_id').order_by('member_id').first()
+        return {
+            'Customer': Member.objects.get(pk=customer_id['member_id']) if customer_id else members[0],
+            'ThemeManager': staff[0],
+            'BranchManager': staff[1],
+            'Admin': staff[2],
+        }
+
+    # ------------------------------------------------------------------
+    def _pages(self):
+        theme = Theme.objects.filter(is_active=True).order_by('-theme_id').first()
+        pages = [
+            ('테마 목록', '/themes/', 'Customer'),
+            ('테마 목록 (평점순)', '/themes/?sort=rating', 'Customer'),
+            ('공지사항', '/notices/', 'Customer'),
+            ('마이페이지', '/my-page/', 'Customer'),
+            ('테마 관리자 대시보드', '/manager/dashboard/', 'ThemeManager'),
+            ('지점 관리자 통계', '/manager/stats/', 'BranchManager'),
+            ('전체 통계', '/statistics/', 'Admin'),
+        ]
+        if theme:
+            pages.insert(2, ('테마 상세', f'/themes/{theme.theme_id}/', 'Customer'))
+        return pages
+
+    def _run(self, users, repeat):
+        client = Client(HTTP_HOST='localhost')
+        header = f"{'화면':<20} {'전체(ms)':>9} {'뷰/ORM':>9} {'템플릿':>9} {'쿼리':>6} {'렌더 중 쿼리':>11}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, url, role in self._pages():
+            user = users.get(role)
+            if user is None:
+                self.stdout.write(f"{name:<20} (측정할 {role} 계정 없음)")
+                continue
+            client.force_login(user)
+
+            samples = []
+            for _ in range(max(repeat, 1)):
+                started = time.perf_counter()
+                with profile_render() as profile:
+                    response = client.get(url)
+                total = time.perf_counter() - started
+                render_queries = sum(
+                    count for (template, _line), (count, _t, _sql) in profile.queries.items() if template != '(view)'
+                )
+                samples.append((total, profile.render_time, profile.query_count, render_queries))
+
+            if response.status_code != 200:
+                self.stdout.write(f"{name:<20} HTTP {response.status_code}")
+                continue
+            total = statistics.median(s[0] for s in samples)
+            render = statistics.median(s[1] for s in samples)
+            self.stdout.write(
+                f"{name:<20} {total * 1000:9.1f} {(total - render) * 1000:9.1f} {render * 1000:9.1f} "
+                f"{samples[-1][2]:6} {samples[-1][3]:11}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("렌더링 측정을 완료했습니다."))
@@ -0,0 +1,21 @@
+# booking/management/commands/build_forecasts.py
+from django.core.management.base import BaseCommand
+
+from booking import sharding
+from booking.forecast import build_forecasts
+
+
+class Command(BaseCommand):
+    help = "전체(또는 지정한) 지점의 테마 수요 예측을 다시 계산하여 캐시에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--branch', type=int, action='append', dest='branch_ids', help="지점 ID (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        results = {}
+        for shard_results in sharding.each_shard(build_forecasts, branch_ids=options['branch_ids']):
+            results.update(shard_results)
+        theme_count = sum(len(r['themes']) for r in results.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(results)}개 지점, {theme_count}개 테마의 수요 예측을 갱신했습니다."
+        ))
@@ -0,0 +1,16 @@
+# booking/management/commands/build_price_calendar.py
+from django.core.management.base import BaseCommand
+
+from booking import sharding
+from booking.pricing import build_price_calendar
+
+
+class Command(BaseCommand):
+    help = "테마 가격 캘린더(슬롯별 1인 가격)를 예약 가능 기간만큼 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--theme', type=int, action='append', dest='theme_ids', help="테마 ID (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        count = sum(sharding.each_shard(build_price_calendar, theme_ids=options['theme_ids']))
+        self.stdout.write(self.style.SUCCESS(f"가격 슬롯 {count}개를 저장했습니다."))
@@ -0,0 +1,16 @@
+# booking/management/commands/build_recommendations.py
+from django.core.management.base import BaseCommand
+
+from booking import sharding
+from booking.recommendation import build_recommendations
+
+
+class Command(BaseCommand):
+    help = "예약/리뷰 이력으로 테마별 추천 목록(함께 플레이한 테마)을 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=None, help="테마별 추천 개수")
+
+    def handle(self, *args, **options):
+        count = sum(sharding.each_shard(build_recommendations, top_k=options['top_k']))
+        self.stdout.write(self.style.SUCCESS(f"추천 {count}건을 저장했습니다."))
@@ -0,0 +1,46 @@
+# booking/management/commands/export_events.py
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+
+from booking import sharding
+from booking.events import consume
+
+
+class Command(BaseCommand):
+    help = "소비자 커서 이후의 이벤트 로그를 JSONL로 내보내고 커서를 옮깁니다. (증분 내보내기, cron 등록용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('consumer', help="소비자 이름 (내보내기 대상마다 다르게 지정)")
+        parser.add_argument('--output', help="추가 기록할 파일 경로 (기본: 표준 출력)")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--max-batches', type=int, default=None)
+
+    def handle(self, *args, **options):
+        # 파일에 쓴 뒤 커밋 전에 실패하면 같은 배치를 다시 쓰므로, 받는 쪽은 event_id로 중복을 제거
+        out = open(options['output'], 'a', encoding='utf-8') if options['output'] else sys.stdout
+
+        def write(events):
+            for event in events:
+                out.write(json.dumps({
+                    'event_id': event.event_id,
+                    'topic': event.topic,
+                    'action': event.action,
+                    'object_id': event.object_id,
+                    'theme_id': event.theme_id,
+                    'member_id': event.member_id,
+                    'data': event.data,
+                    'created_at': event.created_at.isoformat(),
+                }, ensure_ascii=False) + '\n')
+            out.flush()
+
+        try:
+            # 샤딩 시 소비자 위치는 샤드마다 따로 저장됨
+            count = sum(sharding.each_shard(
+                consume, options['consumer'], write, options['batch_size'], options['max_batches']
+            ))
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        self.stderr.write(self.style.SUCCESS(f"이벤트 {count}건을 내보냈습니다."))
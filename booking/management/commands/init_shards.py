@@ -0,0 +1,56 @@
+# booking/management/commands/init_shards.py
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max
+
+from booking import sharding
+
+AUTO_FIELDS = ('AutoField', 'BigAutoField', 'SmallAutoField')
+
+
+def _set_id_start(alias, model, start):
+    """alias DB에서 model의 다음 PK를 start 이상으로 맞춤 (이미 더 큰 PK가 있으면 그 다음부터)"""
+    pk = model._meta.pk
+    current = model.objects.using(alias).aggregate(value=Max(pk.name))['value'] or 0
+    value = max(start, current + 1)
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, %s), %s, false)",
+                [model._meta.db_table, pk.column, value],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = %s", [model._meta.db_table])
+            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)", [model._meta.db_table, value - 1])
+        else:
+            raise CommandError(f"{connection.vendor} DB는 지원하지 않습니다.")
+    return value
+
+
+class Command(BaseCommand):
+    help = "샤드 DB를 준비합니다. (지점 복제, 샤드별 PK 시작값 설정 - 마이그레이션 후 / 샤드 추가 시 실행)"
+
+    def handle(self, *args, **options):
+        aliases = sharding.shards()
+        if not aliases:
+            raise CommandError("BRANCH_SHARDS가 설정되지 않았습니다.")
+
+        branch_count = sharding.sync_branches()
+        models = [
+            model for model in apps.get_app_config('booking').get_models()
+            if model._meta.model_name in sharding.SHARDED_MODELS and model._meta.pk.get_internal_type() in AUTO_FIELDS
+        ]
+        span = sharding.id_span()
+        for index, alias in enumerate(aliases):
+            for model in models:
+                value = _set_id_start(alias, model, index * span + 1)
+                if value > (index + 1) * span:
+                    self.stderr.write(self.style.WARNING(
+                        f"{alias}.{model._meta.db_table}: PK가 샤드 구간을 넘었습니다. ({value})"
+                    ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"샤드 {len(aliases)}개에 지점 {branch_count}개를 복제하고 PK 시작값을 설정했습니다."
+        ))
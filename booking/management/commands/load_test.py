@@ -0,0 +1,186 @@
+# booking/management/commands/load_test.py
+import asyncio
+import json
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from booking import sharding
+from booking.loadtest import LoadTest, load_scenario
+from booking.models import Member, Reservation
+
+LOGIN_PREFIX = 'load_c'
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _double_booked(theme_ids):
+    """같은 테마 / 시간에 확정 예약이 2건 이상인 슬롯 수 (부하 테스트 대상 테마만)"""
+    def count():
+        return Reservation.objects.filter(
+            theme_id__in=theme_ids, status__in=['Confirmed', 'CheckedIn'],
+        ).values('theme_id', 'reservation_time').annotate(n=Count('pk')).filter(n__gt=1).count()
+    return sum(sharding.gather(count))
+
+
+class Command(BaseCommand):
+    help = (
+        "시나리오 파일(loadtest/*.json)로 실행 중인 서버에 예약 부하 테스트를 실행하고 "
+        "단계별 처리량 / 응답 시간 / 오류, 충돌률 / 쿼리 수를 저장합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', help="시나리오 JSON 파일 경로")
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--users', type=int, help="시나리오의 가상 사용자 수 대신 사용")
+        parser.add_argument('--label', default='', help="결과 파일 이름에 붙일 이름 (예: 비교할 버전)")
+        parser.add_argument('--password', default='loadtest', help="부하 테스트 계정 비밀번호")
+        parser.add_argument('--create-users', action='store_true', help=f"부족한 테스트 계정({LOGIN_PREFIX}N)을 생성")
+        parser.add_argument('--cleanup', action='store_true', help="실행 전에 테스트 계정의 예약을 삭제")
+        parser.add_argument('--seed', type=int, help="슬롯 / 생각 시간 난수 시드")
+        parser.add_argument('--compare', help="비교할 이전 결과 JSON 파일")
+        parser.add_argument('--no-save', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            scenario = load_scenario(options['scenario'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"시나리오를 읽을 수 없습니다: {e}")
+        if options['users']:
+            scenario['users'] = options['users']
+
+        credentials = self._credentials(scenario['users'], options)
+        if options['cleanup']:
+            self._cleanup()
+
+        test = LoadTest(scenario, options['base_url'], credentials, seed=options['seed'])
+        try:
+            result = asyncio.run(test.run())
+        except Exception as e:
+            raise CommandError(f"부하 테스트 실패: {e!r}")
+
+        result['double_booked_slots'] = _double_booked(test.theme_ids)
+        result['meta'] = {
+            'label': options['label'],
+            'revision': _git_revision(),
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'base_url': options['base_url'],
+            'scenario_file': str(options['scenario']),
+            'scenario': scenario,
+        }
+        self._print(result)
+
+        if options['compare']:
+            self._compare(result, options['compare'])
+        if not options['no_save']:
+            path = self._save(result, options['label'])
+            self.stdout.write(f"결과 저장: {path}")
+
+        if result['double_booked_slots']:
+            self.stderr.write(self.style.ERROR(f"중복 예약된 슬롯이 {result['double_booked_slots']}개 있습니다."))
+        self.stdout.write(self.style.SUCCESS(
+            f"부하 테스트를 완료했습니다. (요청 {result['requests']}건, 예약 {result['bookings']}건, "
+            f"{result['throughput']} req/s)"
+        ))
+
+    # ------------------------------------------------------------------
+    def _credentials(self, users, options):
+        login_ids = [f'{LOGIN_PREFIX}{i}' for i in range(users)]
+        existing = set(Member.objects.filter(login_id__in=login_ids).values_list('login_id', flat=True))
+        missing = [login_id for login_id in login_ids if login_id not in existing]
+        if missing:
+            if not options['create_users']:
+                raise CommandError(f"테스트 계정 {len(missing)}개가 없습니다. --create-users 옵션으로 생성하세요.")
+            # 비밀번호 해시는 한 번만 계산 (계정 수천 개도 바로 생성)
+            password = make_password(options['password'])
+            Member.objects.bulk_create([
+                Member(login_id=login_id, name=f'부하테스트{login_id[len(LOGIN_PREFIX):]}',
+                       phone=f'load-{login_id}', password=password)
+                for login_id in missing
+            ], batch_size=1000)
+            self.stdout.write(f"테스트 계정 {len(missing)}개를 생성했습니다.")
+        return [(login_id, options['password']) for login_id in login_ids]
+
+    def _cleanup(self):
+        member_ids = list(Member.objects.filter(login_id__startswith=LOGIN_PREFIX).values_list('member_id', flat=True))
+        deleted = sum(sharding.each_shard(
+            lambda: Reservation.objects.filter(member_id__in=member_ids).delete()[0]
+        ))
+        self.stdout.write(f"테스트 계정의 예약 관련 데이터 {deleted}건을 삭제했습니다.")
+
+    def _print(self, result):
+        header = (
+            f"{'단계':<16} {'요청':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} "
+            f"{'오류율':>7} {'충돌률':>7} {'429':>7} {'쿼리':>6}"
+        )
+        self.stdout.write(
+            f"시나리오 {result['scenario']} - 사용자 {result['users']}명, {result['elapsed_seconds']}초, "
+            f"지점 {result['branch_id']} 테마 {result['theme_ids']}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, s in result['steps'].items():
+            self.stdout.write(
+                f"{name:<16} {s['requests']:6} {s['throughput'] or 0:7.1f} {_ms(s['p50_ms'])} {_ms(s['p95_ms'])} "
+                f"{_ms(s['p99_ms'])} {s['error_rate']:7.1%} {s['conflict_rate']:7.1%} {s['throttled_rate']:7.1%} "
+                f"{s['queries_avg'] if s['queries_avg'] is not None else '-':>6}"
+            )
+        self.stdout.write(
+            f"전체: {result['requests']}건, {result['throughput']} req/s, 오류율 {result['error_rate']:.1%}, "
+            f"예약 성공 {result['bookings']}건 ({result['goodput']}/s), 중복 예약 슬롯 {result['double_booked_slots']}개"
+        )
+
+    def _compare(self, result, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"비교할 결과를 읽을 수 없습니다: {e}")
+        meta = previous.get('meta', {})
+        self.stdout.write(f"\n이전 결과와 비교 ({meta.get('label') or meta.get('revision') or path})")
+        self.stdout.write(
+            f"{'전체':<16} req/s {_delta(previous.get('throughput'), result['throughput'])}  "
+            f"goodput {_delta(previous.get('goodput'), result['goodput'])}"
+        )
+        for name, s in result['steps'].items():
+            before = previous.get('steps', {}).get(name)
+            if not before:
+                continue
+            self.stdout.write(
+                f"{name:<16} p95 {_delta(before['p95_ms'], s['p95_ms'], 'ms')}  "
+                f"req/s {_delta(before['throughput'], s['throughput'])}  "
+                f"쿼리 {_delta(before['queries_avg'], s['queries_avg'])}"
+            )
+
+    def _save(self, result, label):
+        directory = Path(getattr(settings, 'LOAD_TEST_RESULTS_DIR', Path(settings.BASE_DIR) / 'loadtest' / 'results'))
+        directory.mkdir(parents=True, exist_ok=True)
+        parts = [datetime.now().strftime('%Y%m%d-%H%M%S'), result['scenario'], label or result['meta']['revision']]
+        path = directory / ('_'.join(p for p in parts if p) + '.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        return path
+
+
+def _ms(value):
+    return f"{value:6.0f}ms" if value is not None else f"{'-':>8}"
+
+
+def _delta(before, after, unit=''):
+    if before is None or after is None:
+        return '-'
+    change = f" ({(after - before) / before:+.0%})" if before else ''
+    return f"{before}{unit} -> {after}{unit}{change}"
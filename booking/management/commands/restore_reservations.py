@@ -0,0 +1,25 @@
+# booking/management/commands/restore_reservations.py
+from django.core.management.base import BaseCommand, CommandError
+
+from booking import sharding
+from booking.archive import restore_reservations
+
+
+class Command(BaseCommand):
+    help = "보관된 예약을 결제/리뷰와 함께 원래 테이블로 복원합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reservation', type=int, action='append', dest='reservation_ids', help="예약 ID (여러 번 지정 가능)")
+        parser.add_argument('--member', type=int, dest='member_id', help="회원 ID - 해당 회원의 보관 예약 전체")
+        parser.add_argument('--segment', type=int, dest='segment_id', help="세그먼트 ID - 세그먼트 전체")
+
+    def handle(self, *args, **options):
+        if not (options['reservation_ids'] or options['member_id'] or options['segment_id']):
+            raise CommandError("--reservation, --member, --segment 중 하나 이상을 지정하세요.")
+        count = sum(sharding.each_shard(
+            restore_reservations,
+            reservation_ids=options['reservation_ids'],
+            member_id=options['member_id'],
+            segment_id=options['segment_id'],
+        ))
+        self.stdout.write(self.style.SUCCESS(f"예약 {count}건을 복원했습니다."))
@@ -0,0 +1,12 @@
+# booking/management/commands/run_price_campaigns.py
+from django.core.management.base import BaseCommand
+
+from booking.campaigns import run_price_campaigns
+
+
+class Command(BaseCommand):
+    help = "시작 시각이 된 가격 캠페인을 적용하고 종료 시각이 지난 캠페인의 할인율을 복원합니다."
+
+    def handle(self, *args, **options):
+        started, ended = run_price_campaigns()
+        self.stdout.write(self.style.SUCCESS(f"가격 캠페인 {started}개를 시작하고 {ended}개를 종료했습니다."))
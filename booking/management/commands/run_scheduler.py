@@ -0,0 +1,122 @@
+# booking/management/commands/run_scheduler.py
+import logging
+from functools import partial
+
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_SUBMITTED
+from apscheduler.schedulers.blocking import BlockingScheduler
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from booking import metrics, sharding
+from booking.archive import archive_reservations
+from booking.campaigns import run_price_campaigns
+from booking.events import prune_events
+from booking.forecast import build_forecasts
+from booking.holds import expire_holds
+from booking.pricing import build_price_calendar
+from booking.recommendation import build_recommendations
+from booking.sweeper import sweep_stale_reservations
+
+logger = logging.getLogger(__name__)
+
+
+def per_shard(job):
+    # 샤딩(booking/sharding.py) 시 샤드마다 차례로 실행 (샤딩을 쓰지 않으면 한 번)
+    return partial(sharding.each_shard, job)
+
+
+class Command(BaseCommand):
+    help = "주기적인 백그라운드 작업(지난 예약 정리 등)을 실행하는 스케줄러를 시작합니다."
+
+    def handle(self, *args, **options):
+        scheduler = BlockingScheduler(timezone=settings.TIME_ZONE)
+        # 작업 지연 / 실행 시간 / 마지막 성공 시각 지표 (METRICS_MULTIPROC_DIR을 웹 서버와 공유하면 /metrics에 합산)
+        scheduler.add_listener(metrics.scheduler_listener, EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+
+        # 같은 작업이 겹쳐 실행되지 않도록 max_instances=1, 밀린 실행은 한 번으로 합침
+        scheduler.add_job(
+            per_shard(sweep_stale_reservations),
+            'interval',
+            minutes=getattr(settings, 'RESERVATION_SWEEP_INTERVAL_MINUTES', 10),
+            id='sweep_stale_reservations',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 만료된 슬롯 선점 정리 (새로 선점할 때도 지우므로 자주 돌 필요는 없음)
+        scheduler.add_job(
+            per_shard(expire_holds),
+            'interval',
+            minutes=getattr(settings, 'SLOT_HOLD_SWEEP_INTERVAL_MINUTES', 1),
+            id='expire_holds',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 가격 캠페인 시작 / 종료 (캠페인은 전역 DB, 테마 변경은 함수 안에서 샤드마다)
+        scheduler.add_job(
+            run_price_campaigns,
+            'interval',
+            minutes=getattr(settings, 'PRICE_CAMPAIGN_INTERVAL_MINUTES', 1),
+            id='run_price_campaigns',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 수요 예측은 매일 새벽에 전체 지점을 한 번에 다시 계산
+        scheduler.add_job(
+            per_shard(build_forecasts),
+            'cron',
+            hour=getattr(settings, 'FORECAST_REBUILD_HOUR', 4),
+            id='build_forecasts',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 예측 갱신 후 가격 캘린더를 다시 계산하여 예약 가능 기간을 하루씩 연장
+        scheduler.add_job(
+            per_shard(build_price_calendar),
+            'cron',
+            hour=getattr(settings, 'FORECAST_REBUILD_HOUR', 4),
+            minute=30,
+            id='build_price_calendar',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 테마 추천은 하루 한 번 전체 재계산
+        scheduler.add_job(
+            per_shard(build_recommendations),
+            'cron',
+            hour=getattr(settings, 'RECOMMENDATION_REBUILD_HOUR', 5),
+            id='build_recommendations',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 오래된 종료 예약 보관은 이용이 적은 새벽에 하루 한 번
+        scheduler.add_job(
+            per_shard(archive_reservations),
+            'cron',
+            hour=getattr(settings, 'ARCHIVE_HOUR', 3),
+            id='archive_reservations',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # 모든 소비자가 처리한 오래된 이벤트 정리
+        scheduler.add_job(
+            per_shard(prune_events),
+            'cron',
+            hour=getattr(settings, 'ARCHIVE_HOUR', 3),
+            minute=30,
+            id='prune_events',
+            max_instances=1,
+            coalesce=True,
+        )
+
+        self.stdout.write(self.style.SUCCESS("스케줄러를 시작합니다. (종료: Ctrl+C)"))
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            scheduler.shutdown()
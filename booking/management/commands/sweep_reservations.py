@@ -0,0 +1,20 @@
+# booking/management/commands/sweep_reservations.py
+from django.core.management.base import BaseCommand
+
+from booking import sharding
+from booking.sweeper import sweep_stale_reservations
+
+
+class Command(BaseCommand):
+    help = "지난 예약을 자동으로 노쇼/이용 완료 처리합니다. (cron 등록용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help="한 번에 변경할 예약 수")
+
+    def handle(self, *args, **options):
+        results = sharding.each_shard(sweep_stale_reservations, batch_size=options['batch_size'])
+        result = {key: sum(r[key] for r in results) for key in ('no_show', 'completed', 'elapsed')}
+        self.stdout.write(self.style.SUCCESS(
+            f"노쇼 처리 {result['no_show']}건, 이용 완료 처리 {result['completed']}건 "
+            f"({result['elapsed']:.2f}초)"
+        ))
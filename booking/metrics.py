@@ -0,0 +1,182 @@
+# booking/metrics.py
+"""
+Prometheus 형식 지표 (/metrics, prometheus_client)
+
+- 요청: 뷰(URL 이름)별 응답 시간 히스토그램, 요청 수(상태 코드별), 요청당 DB 쿼리 수 / 쿼리 시간 (MetricsMiddleware)
+- 캐시: 페이지 / 테마 객체 / 필터 개수 / 마이페이지 요약 캐시의 적중 / 실패 수 (cache_lookup)
+- 예약: 슬롯 선점 / 확정 / 만료, 단체 예약 성공 / 충돌 수, 과부하 보호로 거절한 요청 수
+- 백그라운드 작업: 예정 시각 대비 시작 지연, 실행 시간, 마지막 성공 시각, 실패 수 (scheduler_listener)
+
+여러 워커 프로세스(gunicorn 등)와 스케줄러 프로세스의 값은 METRICS_MULTIPROC_DIR(또는 환경 변수
+PROMETHEUS_MULTIPROC_DIR)에 프로세스별 mmap 파일로 기록하고 /metrics에서 합산 (외부 서비스 없음)
+- 디렉터리는 모든 프로세스가 공유하고, 서버를 시작하기 전에 비울 것
+- 종료된 워커의 게이지 파일은 gunicorn child_exit 훅에서 mark_process_dead(worker.pid)로 정리
+디렉터리를 지정하지 않으면 프로세스 내 레지스트리 (runserver / 단일 프로세스)
+"""
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_ERROR
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# prometheus_client는 import 시점에 PROMETHEUS_MULTIPROC_DIR을 보고 mmap 저장 방식을 정하므로 먼저 설정
+_multiproc_dir = getattr(settings, 'METRICS_MULTIPROC_DIR', None)
+if _multiproc_dir:
+    os.makedirs(_multiproc_dir, exist_ok=True)
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', str(_multiproc_dir))
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf'))
+QUERY_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, float('inf'))
+JOB_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, float('inf'))
+
+REQUEST_LATENCY = Histogram(
+    'booking_http_request_duration_seconds', "요청 처리 시간 (뷰별)", ['view', 'method'],
+)
+REQUESTS = Counter(
+    'booking_http_requests_total', "요청 수 (뷰 / 상태 코드별)", ['view', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'booking_db_queries_per_request', "요청당 DB 쿼리 수 (모든 DB 합계)", ['view'], buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_QUERY_SECONDS = Histogram(
+    'booking_db_query_seconds_per_request', "요청당 DB 쿼리 시간 합계", ['view'], buckets=QUERY_TIME_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    'booking_cache_lookups_total', "캐시 조회 수 (적중 hit / 실패 miss)", ['cache', 'result'],
+)
+BOOKINGS = Counter(
+    'booking_reservation_outcomes_total', "예약 처리 결과 수 (flow: checkout=슬롯 선점 / 결제, group=단체 예약)",
+    ['flow', 'outcome'],
+)
+ADMISSION_REJECTED = Counter(
+    'booking_admission_rejected_total', "과부하 보호로 거절(429)한 요청 수", ['reason'],
+)
+JOB_LAG = Gauge(
+    'booking_job_lag_seconds', "백그라운드 작업의 예정 시각 대비 시작 지연 (최근 실행)", ['job'],
+    multiprocess_mode='mostrecent',
+)
+JOB_DURATION = Histogram(
+    'booking_job_duration_seconds', "백그라운드 작업 실행 시간", ['job'], buckets=JOB_BUCKETS,
+)
+JOB_LAST_SUCCESS = Gauge(
+    'booking_job_last_success_timestamp_seconds', "백그라운드 작업이 마지막으로 성공한 시각 (Unix time)", ['job'],
+    multiprocess_mode='max',
+)
+JOB_FAILURES = Counter(
+    'booking_job_failures_total', "백그라운드 작업 실패 수", ['job'],
+)
+
+
+def cache_lookup(name, hits=0, misses=0):
+    if hits:
+        CACHE_LOOKUPS.labels(name, 'hit').inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(name, 'miss').inc(misses)
+
+
+def booking_outcome(flow, outcome, amount=1):
+    BOOKINGS.labels(flow, outcome).inc(amount)
+
+
+def admission_rejected(reason):
+    ADMISSION_REJECTED.labels(reason).inc()
+
+
+def exposition():
+    """(본문, Content-Type) - 멀티 프로세스 모드이면 모든 프로세스의 mmap 파일을 합산"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """종료된 워커의 게이지 파일 정리 (gunicorn child_exit 훅)"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+def _view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    # 관리자 화면 등 네임스페이스가 있는 URL은 네임스페이스 하나로 (라벨 수 제한)
+    return match.namespace or match.url_name or 'unnamed'
+
+
+class MetricsMiddleware:
+    """
+    뷰별 응답 시간 / 요청 수 / 요청당 DB 쿼리 수와 시간 (METRICS_ENABLED)
+    gather()로 다른 스레드에서 실행한 샤드 쿼리는 포함되지 않음
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = 0
+        query_seconds = 0.0
+
+        def timer(execute, sql, params, many, context):
+            nonlocal queries, query_seconds
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries += 1
+                query_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view = _view_label(request)
+        REQUEST_LATENCY.labels(view, request.method).observe(elapsed)
+        REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+        REQUEST_QUERIES.labels(view).observe(queries)
+        REQUEST_QUERY_SECONDS.labels(view).observe(query_seconds)
+        return response
+
+
+# ----------------------------------------------------------------------
+# 백그라운드 작업 (APScheduler 리스너, booking/management/commands/run_scheduler.py)
+# ----------------------------------------------------------------------
+_job_started = {}
+_job_lock = threading.Lock()
+
+
+def scheduler_listener(event):
+    """EVENT_JOB_SUBMITTED / EVENT_JOB_EXECUTED / EVENT_JOB_ERROR"""
+    now = time.time()
+    if event.code == EVENT_JOB_SUBMITTED:
+        # 밀린 실행을 합친 경우(coalesce) 가장 이른 예정 시각 기준
+        scheduled = min(event.scheduled_run_times).timestamp()
+        JOB_LAG.labels(event.job_id).set(max(0.0, now - scheduled))
+        with _job_lock:
+            _job_started[event.job_id] = now
+        return
+
+    with _job_lock:
+        started = _job_started.pop(event.job_id, None)
+    if started is not None:
+        JOB_DURATION.labels(event.job_id).observe(now - started)
+    if event.code == EVENT_JOB_ERROR:
+        JOB_FAILURES.labels(event.job_id).inc()
+    else:
+        JOB_LAST_SUCCESS.labels(event.job_id).set(now)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_branchassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='branch',
+            name='auto_sweep',
+            field=models.BooleanField(default=True, verbose_name='지난 예약 자동 정리'),
+        ),
+        migrations.AddField(
+            model_name='branch',
+            name='complete_grace_minutes',
+            field=models.PositiveIntegerField(default=30, verbose_name='이용 완료 처리 유예 시간 (분)'),
+        ),
+        migrations.AddField(
+            model_name='branch',
+            name='noshow_grace_minutes',
+            field=models.PositiveIntegerField(default=30, verbose_name='노쇼 처리 유예 시간 (분)'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['status', 'reservation_time'], name='reservation_status_time_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:22
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0004_branch_sweep_policy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceRule',
+            fields=[
+                ('rule_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='규칙명')),
+                ('weekdays', models.CharField(default='0123456', max_length=7, verbose_name='적용 요일 (월=0 ~ 일=6)')),
+                ('start_hour', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(23)], verbose_name='시작 시각')),
+                ('end_hour', models.IntegerField(default=24, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(24)], verbose_name='종료 시각 (미포함)')),
+                ('adjust_rate', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='가격 조정률 (%, 할증 +/할인 -)')),
+                ('is_active', models.BooleanField(default=True, verbose_name='활성 상태')),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='booking.branch', verbose_name='적용 지점 (전체 적용 시 NULL)')),
+                ('theme', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='booking.theme', verbose_name='적용 테마 (지점 전체 적용 시 NULL)')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ThemePrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slot_start', models.DateTimeField(verbose_name='슬롯 시작 시각')),
+                ('price', models.DecimalField(decimal_places=0, max_digits=10, verbose_name='1인 가격')),
+                ('theme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='booking.theme', verbose_name='테마')),
+            ],
+            options={
+                'verbose_name': '테마 가격 캘린더',
+                'verbose_name_plural': '테마 가격 캘린더',
+                'indexes': [models.Index(fields=['slot_start', 'price'], name='themeprice_slot_price_idx')],
+                'unique_together': {('theme', 'slot_start')},
+            },
+        ),
+    ]
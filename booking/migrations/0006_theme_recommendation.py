@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0005_price_calendar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThemeRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='순위')),
+                ('score', models.FloatField(verbose_name='유사도')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='booking.theme', verbose_name='추천 테마')),
+                ('theme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='booking.theme', verbose_name='기준 테마')),
+            ],
+            options={
+                'verbose_name': '테마 추천',
+                'verbose_name_plural': '테마 추천 목록',
+                'unique_together': {('theme', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0006_theme_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='last_read_notice_id',
+            field=models.PositiveIntegerField(default=0, verbose_name='마지막으로 읽은 공지 ID'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['target_branch', '-notice_id'], name='notice_branch_id_idx'),
+        ),
+    ]
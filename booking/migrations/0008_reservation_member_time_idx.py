@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_notice_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['member', 'reservation_time'], name='reservation_member_time_idx'),
+        ),
+    ]
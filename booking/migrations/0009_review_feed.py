@@ -0,0 +1,103 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+
+def backfill_review_theme(apps, schema_editor):
+    """기존 리뷰의 테마 컬럼 채우기 + 테마별 리뷰 요약 생성"""
+    Review = apps.get_model('booking', 'Review')
+    Reservation = apps.get_model('booking', 'Reservation')
+    ThemeReviewSummary = apps.get_model('booking', 'ThemeReviewSummary')
+    db = schema_editor.connection.alias
+
+    Review.objects.using(db).filter(theme__isnull=True).update(
+        theme_id=Subquery(Reservation.objects.using(db).filter(pk=OuterRef('reservation_id')).values('theme_id')[:1])
+    )
+
+    summaries = {}
+    rows = Review.objects.using(db).filter(theme__isnull=False).values('theme_id', 'rating').annotate(
+        count=Count('review_id'), total=Sum('rating')
+    ).order_by()
+    for row in rows:
+        summary = summaries.setdefault(row['theme_id'], ThemeReviewSummary(theme_id=row['theme_id']))
+        summary.review_count += row['count']
+        summary.rating_sum += row['total']
+        field = f"rating_{row['rating']}"
+        setattr(summary, field, getattr(summary, field) + row['count'])
+    ThemeReviewSummary.objects.using(db).bulk_create(summaries.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0008_reservation_member_time_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewHelpful',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일')),
+            ],
+            options={
+                'verbose_name': '리뷰 도움돼요',
+                'verbose_name_plural': '리뷰 도움돼요 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='ThemeReviewSummary',
+            fields=[
+                ('theme', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_summary', serialize=False, to='booking.theme', verbose_name='테마')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='리뷰 수')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='별점 합계')),
+                ('rating_1', models.PositiveIntegerField(default=0, verbose_name='1점')),
+                ('rating_2', models.PositiveIntegerField(default=0, verbose_name='2점')),
+                ('rating_3', models.PositiveIntegerField(default=0, verbose_name='3점')),
+                ('rating_4', models.PositiveIntegerField(default=0, verbose_name='4점')),
+                ('rating_5', models.PositiveIntegerField(default=0, verbose_name='5점')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+            ],
+            options={
+                'verbose_name': '테마 리뷰 요약',
+                'verbose_name_plural': '테마 리뷰 요약',
+            },
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpful_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='도움돼요 수'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='theme',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='booking.theme', verbose_name='테마'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['theme', '-review_id'], name='review_theme_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['theme', '-helpful_count', '-review_id'], name='review_theme_helpful_idx'),
+        ),
+        migrations.AddField(
+            model_name='reviewhelpful',
+            name='member',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='회원'),
+        ),
+        migrations.AddField(
+            model_name='reviewhelpful',
+            name='review',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='helpful_votes', to='booking.review', verbose_name='리뷰'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reviewhelpful',
+            unique_together={('review', 'member')},
+        ),
+        # 샤딩(booking/sharding.py) 시 리뷰가 있는 DB에서만 실행
+        migrations.RunPython(backfill_review_theme, migrations.RunPython.noop, hints={'model_name': 'review'}),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:41
+
+from django.db import migrations, models, router
+
+# 관리자 검색(search_fields, icontains)용 trigram 인덱스 - PostgreSQL 전용
+# Django의 icontains는 UPPER("컬럼"::text) LIKE UPPER(%s) 로 실행되므로 같은 식으로 인덱스 생성
+TRIGRAM_INDEXES = [
+    ('member', 'name', 'member_name_trgm_idx'),
+    ('member', 'login_id', 'member_login_id_trgm_idx'),
+    ('member', 'phone', 'member_phone_trgm_idx'),
+    ('theme', 'name', 'theme_name_trgm_idx'),
+    ('review', 'comment', 'review_comment_trgm_idx'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    quote = schema_editor.quote_name
+    for model_name, field_name, index_name in TRIGRAM_INDEXES:
+        model = apps.get_model('booking', model_name)
+        # 샤딩(booking/sharding.py) 시 해당 테이블이 없는 DB는 건너뜀
+        if not router.allow_migrate_model(schema_editor.connection.alias, model):
+            continue
+        column = model._meta.get_field(field_name).column
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(index_name)} "
+            f"ON {quote(model._meta.db_table)} USING gin ((UPPER({quote(column)}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for _model_name, _field_name, index_name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(index_name)}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음 (운영 중 테이블 잠금 방지)
+    atomic = False
+
+    dependencies = [
+        ('booking', '0009_review_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['-reservation_time', '-reservation_id'], name='reservation_time_desc_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
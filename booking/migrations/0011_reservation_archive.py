@@ -0,0 +1,72 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0010_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveSegment',
+            fields=[
+                ('segment_id', models.AutoField(primary_key=True, serialize=False)),
+                ('file_name', models.CharField(max_length=255, unique=True, verbose_name='파일 경로')),
+                ('first_time', models.DateTimeField(verbose_name='가장 이른 예약 시간')),
+                ('last_time', models.DateTimeField(verbose_name='가장 늦은 예약 시간')),
+                ('row_count', models.PositiveIntegerField(verbose_name='예약 수')),
+                ('size_bytes', models.PositiveBigIntegerField(verbose_name='파일 크기')),
+                ('sha256', models.CharField(max_length=64, verbose_name='체크섬')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='보관일')),
+            ],
+            options={
+                'verbose_name': '보관 세그먼트',
+                'verbose_name_plural': '보관 세그먼트 목록',
+            },
+        ),
+        migrations.CreateModel(
+            name='ThemeArchiveTotals',
+            fields=[
+                ('theme', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archive_totals', serialize=False, to='booking.theme', verbose_name='테마')),
+                ('reservation_count', models.PositiveIntegerField(default=0, verbose_name='예약 수')),
+                ('completed_count', models.PositiveIntegerField(default=0, verbose_name='이용 완료 수')),
+                ('success_count', models.PositiveIntegerField(default=0, verbose_name='탈출 성공 수')),
+                ('paid_count', models.PositiveIntegerField(default=0, verbose_name='결제 완료 수')),
+                ('paid_amount', models.DecimalField(decimal_places=0, default=0, max_digits=14, verbose_name='결제 완료 금액')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='리뷰 수')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='별점 합계')),
+                ('rating_1', models.PositiveIntegerField(default=0, verbose_name='1점')),
+                ('rating_2', models.PositiveIntegerField(default=0, verbose_name='2점')),
+                ('rating_3', models.PositiveIntegerField(default=0, verbose_name='3점')),
+                ('rating_4', models.PositiveIntegerField(default=0, verbose_name='4점')),
+                ('rating_5', models.PositiveIntegerField(default=0, verbose_name='5점')),
+            ],
+            options={
+                'verbose_name': '테마 보관 통계',
+                'verbose_name_plural': '테마 보관 통계',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedReservation',
+            fields=[
+                ('reservation_id', models.IntegerField(primary_key=True, serialize=False, verbose_name='원래 예약 번호')),
+                ('reservation_time', models.DateTimeField(verbose_name='예약 시간')),
+                ('status', models.CharField(choices=[('Confirmed', '예약 확정'), ('CheckedIn', '입실 완료'), ('Completed', '이용 완료'), ('Cancelled', '예약 취소'), ('NoShow', '노쇼')], max_length=20, verbose_name='예약 상태')),
+                ('is_success', models.BooleanField(null=True, verbose_name='탈출 성공 여부')),
+                ('line', models.PositiveIntegerField(verbose_name='세그먼트 내 줄 번호')),
+                ('member', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='예약 회원')),
+                ('theme', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='booking.theme', verbose_name='예약 테마')),
+                ('segment', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='reservations', to='booking.archivesegment', verbose_name='세그먼트')),
+            ],
+            options={
+                'verbose_name': '보관된 예약',
+                'verbose_name_plural': '보관된 예약 목록',
+                'indexes': [models.Index(fields=['member', '-reservation_time', '-reservation_id'], name='archived_member_time_idx')],
+            },
+        ),
+    ]
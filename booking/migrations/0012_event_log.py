@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0011_reservation_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('event_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('topic', models.CharField(choices=[('reservation', '예약'), ('payment', '결제'), ('review', '리뷰'), ('theme', '테마')], max_length=20, verbose_name='대상')),
+                ('action', models.CharField(choices=[('created', '생성'), ('changed', '변경'), ('deleted', '삭제'), ('archived', '보관'), ('restored', '복원')], max_length=20, verbose_name='동작')),
+                ('object_id', models.BigIntegerField(verbose_name='대상 ID')),
+                ('theme_id', models.IntegerField(null=True, verbose_name='테마 ID')),
+                ('member_id', models.IntegerField(null=True, verbose_name='회원 ID')),
+                ('data', models.JSONField(default=dict, verbose_name='내용')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='기록 시각')),
+            ],
+            options={
+                'verbose_name': '이벤트',
+                'verbose_name_plural': '이벤트 로그',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventCursor',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='소비자 이름')),
+                ('position', models.BigIntegerField(default=0, verbose_name='마지막으로 처리한 이벤트 ID')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+            ],
+            options={
+                'verbose_name': '이벤트 소비자',
+                'verbose_name_plural': '이벤트 소비자 목록',
+            },
+        ),
+    ]
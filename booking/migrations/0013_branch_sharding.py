@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0012_event_log'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedreservation',
+            name='member',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='예약 회원'),
+        ),
+        migrations.AlterField(
+            model_name='issuereport',
+            name='reported_by_member',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='보고자'),
+        ),
+        migrations.AlterField(
+            model_name='reservation',
+            name='member',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='예약 회원'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='member',
+            field=models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='작성자'),
+        ),
+        migrations.AlterField(
+            model_name='reviewhelpful',
+            name='member',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='회원'),
+        ),
+        migrations.AlterField(
+            model_name='schedule',
+            name='member',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='담당 직원'),
+        ),
+    ]
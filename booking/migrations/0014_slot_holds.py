@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0013_branch_sharding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotHold',
+            fields=[
+                ('hold_id', models.AutoField(primary_key=True, serialize=False)),
+                ('slot_time', models.DateTimeField(verbose_name='예약 시간')),
+                ('num_of_participants', models.IntegerField(verbose_name='참가 인원')),
+                ('total_price', models.DecimalField(decimal_places=0, max_digits=10, verbose_name='안내한 결제액')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='선점 시각')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='만료 시각')),
+                ('member', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='회원')),
+                ('theme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='booking.theme', verbose_name='테마')),
+            ],
+            options={
+                'verbose_name': '슬롯 선점',
+                'verbose_name_plural': '슬롯 선점 목록',
+                'constraints': [models.UniqueConstraint(fields=('theme', 'slot_time'), name='slothold_theme_slot_uniq')],
+            },
+        ),
+    ]
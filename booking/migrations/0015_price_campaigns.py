@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:29
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0014_slot_holds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceCampaign',
+            fields=[
+                ('campaign_id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='캠페인명')),
+                ('theme_ids', models.JSONField(blank=True, default=list, verbose_name='적용 테마 ID')),
+                ('rule', models.CharField(choices=[('set', '할인율 지정'), ('add', '기존 할인율에 추가')], default='set', max_length=10, verbose_name='할인 방식')),
+                ('discount_rate', models.DecimalField(decimal_places=2, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)], verbose_name='할인율 (%)')),
+                ('starts_at', models.DateTimeField(verbose_name='시작 시각')),
+                ('ends_at', models.DateTimeField(verbose_name='종료 시각')),
+                ('status', models.CharField(choices=[('Scheduled', '예정'), ('Active', '진행 중'), ('Ended', '종료')], default='Scheduled', max_length=20, verbose_name='상태')),
+                ('theme_count', models.IntegerField(default=0, verbose_name='적용된 테마 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일')),
+                ('branches', models.ManyToManyField(blank=True, related_name='+', to='booking.branch', verbose_name='적용 지점 (지점의 모든 테마)')),
+            ],
+            options={
+                'verbose_name': '가격 캠페인',
+                'verbose_name_plural': '가격 캠페인 목록',
+            },
+        ),
+        migrations.AddField(
+            model_name='theme',
+            name='campaign',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='booking.pricecampaign', verbose_name='적용 중인 가격 캠페인'),
+        ),
+        migrations.CreateModel(
+            name='ThemePriceHistory',
+            fields=[
+                ('history_id', models.AutoField(primary_key=True, serialize=False)),
+                ('previous_price', models.DecimalField(decimal_places=0, max_digits=10, null=True, verbose_name='이전 기본 가격')),
+                ('previous_discount_rate', models.DecimalField(decimal_places=2, max_digits=5, null=True, verbose_name='이전 할인율 (%)')),
+                ('price', models.DecimalField(decimal_places=0, max_digits=10, verbose_name='기본 가격')),
+                ('discount_rate', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='할인율 (%)')),
+                ('reason', models.CharField(choices=[('manual', '직접 수정'), ('campaign_start', '캠페인 시작'), ('campaign_end', '캠페인 종료')], max_length=20, verbose_name='변경 사유')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='변경 시각')),
+                ('campaign', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='booking.pricecampaign', verbose_name='캠페인')),
+                ('theme', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='booking.theme', verbose_name='테마')),
+            ],
+            options={
+                'verbose_name': '테마 가격 변경 이력',
+                'verbose_name_plural': '테마 가격 변경 이력',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pricecampaign',
+            index=models.Index(fields=['status', 'starts_at'], name='pricecampaign_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themepricehistory',
+            index=models.Index(fields=['theme', '-changed_at'], name='pricehistory_theme_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='themepricehistory',
+            index=models.Index(fields=['campaign', 'reason'], name='pricehistory_campaign_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:55
+
+import booking.models
+from django.db import migrations, models
+
+
+def mark_existing_events(apps, schema_editor):
+    # 기존 이벤트는 txid 0 -> 기존 커서(txid 0, position=event_id)에서 event_id 순서로 이어서 읽음
+    # (PostgreSQL에서 컬럼을 추가할 때 기존 행에는 마이그레이션 트랜잭션의 ID가 채워짐)
+    Event = apps.get_model('booking', 'Event')
+    Event.objects.using(schema_editor.connection.alias).update(txid=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0015_price_campaigns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='txid',
+            field=models.BigIntegerField(db_default=booking.models.CurrentTransactionId(), editable=False, null=True, verbose_name='트랜잭션 ID'),
+        ),
+        migrations.AddField(
+            model_name='eventcursor',
+            name='txid',
+            field=models.BigIntegerField(default=0, verbose_name='마지막으로 처리한 이벤트의 트랜잭션 ID'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['txid', 'event_id'], name='event_txid_idx'),
+        ),
+        # 샤딩(booking/sharding.py) 시 이벤트 로그가 있는 DB에서만 실행
+        migrations.RunPython(mark_existing_events, migrations.RunPython.noop, hints={'model_name': 'event'}),
+    ]
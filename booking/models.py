@@ -1,5 +1,5 @@
 # booking/models.py
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -50,6 +50,8 @@ class Member(AbstractBaseUser):
     phone = models.CharField(max_length=20, unique=True, verbose_name="연락처")
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='Customer', verbose_name="역할")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="가입일")
+    # 공지사항 읽음 기준 (이 ID 이하의 공지는 읽은 것으로 간주)
+    last_read_notice_id = models.PositiveIntegerField(default=0, verbose_name="마지막으로 읽은 공지 ID")
 
     objects = MemberManager()
 
@@ -86,6 +88,40 @@ class Member(AbstractBaseUser):
     def has_module_perms(self, app_label):
         return self.is_superuser
 
+# ----------------------------------------------------------------------
+# 이벤트 로그 대상 모델 공통 (booking/events.py)
+# ----------------------------------------------------------------------
+class EventLoggedModel(models.Model):
+    """
+    - DB에서 읽을 때 tracked_fields 값을 보관 -> 저장 시 변경 전 값과 비교 (추가 쿼리 없음)
+    - save()와 post_save 시그널의 이벤트 기록을 같은 트랜잭션에서 실행
+    """
+    tracked_fields = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {f: getattr(instance, f) for f in cls.tracked_fields if f in field_names}
+        return instance
+
+    def tracked_changes(self):
+        """{필드: [이전 값, 현재 값]} - 읽은 뒤 바뀐 추적 필드만"""
+        loaded = getattr(self, '_loaded_values', {})
+        return {
+            f: [loaded.get(f), getattr(self, f)]
+            for f in self.tracked_fields
+            if f not in loaded or loaded[f] != getattr(self, f)
+        }
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+        self._loaded_values = {f: getattr(self, f) for f in self.tracked_fields}
+
 # ----------------------------------------------------------------------
 # 2. Branch (지점)
 # ----------------------------------------------------------------------
@@ -96,13 +132,22 @@ class Branch(models.Model):
     phone = models.CharField(max_length=20, verbose_name="지점 연락처")
     is_active = models.BooleanField(default=True, verbose_name="활성 상태")
 
+    # 예약 자동 정리(sweeper) 정책 - 지점별로 설정
+    auto_sweep = models.BooleanField(default=True, verbose_name="지난 예약 자동 정리")
+    noshow_grace_minutes = models.PositiveIntegerField(
+        default=30, verbose_name="노쇼 처리 유예 시간 (분)"
+    )
+    complete_grace_minutes = models.PositiveIntegerField(
+        default=30, verbose_name="이용 완료 처리 유예 시간 (분)"
+    )
+
     def __str__(self):
         return self.branch_name
 
 # ----------------------------------------------------------------------
 # 3. Theme (테마)
 # ----------------------------------------------------------------------
-class Theme(models.Model):
+class Theme(EventLoggedModel):
     STATUS_CHOICES = (
         ('Ready', '운영 가능'),
         ('Maintenance', '점검 중'),
@@ -123,6 +168,13 @@ class Theme(models.Model):
     description = models.TextField(verbose_name="테마 설명")
     is_active = models.BooleanField(default=True, verbose_name="활성 상태")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Ready', verbose_name="테마 상태")
+    # 가격 캠페인(booking/campaigns.py) 적용 중이면 해당 캠페인 - 캠페인은 전역 DB에 있으므로 FK 제약 없음
+    campaign = models.ForeignKey(
+        'PriceCampaign', on_delete=models.DO_NOTHING, null=True, blank=True, related_name='+',
+        db_constraint=False, verbose_name="적용 중인 가격 캠페인",
+    )
+
+    tracked_fields = ('status', 'is_active', 'price', 'discount_rate')
 
     def __str__(self):
         return f"[{self.branch.branch_name}] {self.name}"
@@ -137,7 +189,7 @@ class Theme(models.Model):
 # ----------------------------------------------------------------------
 # 4. Reservation (예약)
 # ----------------------------------------------------------------------
-class Reservation(models.Model):
+class Reservation(EventLoggedModel):
     STATUS_CHOICES = (
         ('Confirmed', '예약 확정'),
         ('CheckedIn', '입실 완료'),
@@ -147,7 +199,8 @@ class Reservation(models.Model):
     )
 
     reservation_id = models.AutoField(primary_key=True)
-    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, verbose_name="예약 회원")
+    # 회원은 전역 DB에 있으므로 샤딩(booking/sharding.py) 시 DB 간 FK 제약을 두지 않음
+    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, db_constraint=False, verbose_name="예약 회원")
     theme = models.ForeignKey(Theme, on_delete=models.PROTECT, verbose_name="예약 테마") # 테마가 삭제되면 안 됨
     reservation_time = models.DateTimeField(verbose_name="예약 시간")
     num_of_participants = models.IntegerField(verbose_name="참가 인원")
@@ -157,13 +210,25 @@ class Reservation(models.Model):
     is_success = models.BooleanField(null=True, blank=True, verbose_name="탈출 성공 여부")
     clear_time = models.IntegerField(null=True, blank=True, verbose_name="클리어 시간 (초)") # 초 단위로 저장
 
+    tracked_fields = ('status', 'is_success')
+
+    class Meta:
+        indexes = [
+            # 상태 + 시간 조건 조회 (중복 예약 확인, 지난 예약 자동 정리)
+            models.Index(fields=['status', 'reservation_time'], name='reservation_status_time_idx'),
+            # 마이페이지 회원별 예약 타임라인 (커서 페이지네이션)
+            models.Index(fields=['member', 'reservation_time'], name='reservation_member_time_idx'),
+            # 관리자 예약 목록 기본 정렬 (최근 예약 순)
+            models.Index(fields=['-reservation_time', '-reservation_id'], name='reservation_time_desc_idx'),
+        ]
+
     def __str__(self):
         return f"{self.reservation_time} - {self.theme.name} ({self.member.name if self.member else '탈퇴회원'})"
 
 # ----------------------------------------------------------------------
 # 5. Payment (결제)
 # ----------------------------------------------------------------------
-class Payment(models.Model):
+class Payment(EventLoggedModel):
     payment_id = models.AutoField(primary_key=True)
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, verbose_name="관련 예약")
     payment_method = models.CharField(max_length=50, verbose_name="결제 수단")
@@ -171,21 +236,42 @@ class Payment(models.Model):
     payment_status = models.CharField(max_length=20, verbose_name="결제 상태") # (예: 'Paid', 'Refunded')
     paid_at = models.DateTimeField(auto_now_add=True, verbose_name="결제 시각")
 
+    tracked_fields = ('payment_status',)
+
     def __str__(self):
         return f"{self.reservation.reservation_id} - {self.amount}원"
 
 # ----------------------------------------------------------------------
 # 6. Review (리뷰)
 # ----------------------------------------------------------------------
-class Review(models.Model):
+class Review(EventLoggedModel):
     review_id = models.AutoField(primary_key=True)
     reservation = models.OneToOneField(Reservation, on_delete=models.CASCADE, verbose_name="관련 예약")
-    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, verbose_name="작성자")
+    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, db_constraint=False, verbose_name="작성자")
     rating = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(5)], verbose_name="별점"
     )
     comment = models.TextField(blank=True, verbose_name="리뷰 내용")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="작성일")
+    # 테마별 리뷰 목록을 예약 테이블 조인 없이 인덱스로 조회하기 위한 비정규화 컬럼 (저장 시 예약의 테마로 설정)
+    theme = models.ForeignKey(
+        Theme, on_delete=models.CASCADE, null=True, editable=False, related_name='+', verbose_name="테마"
+    )
+    helpful_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="도움돼요 수")
+
+    tracked_fields = ('rating',)
+
+    class Meta:
+        indexes = [
+            # 테마 상세 리뷰 목록 - 최신순 / 도움돼요순 (커서 페이지네이션)
+            models.Index(fields=['theme', '-review_id'], name='review_theme_newest_idx'),
+            models.Index(fields=['theme', '-helpful_count', '-review_id'], name='review_theme_helpful_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.theme_id is None and self.reservation_id:
+            self.theme_id = Reservation.objects.filter(pk=self.reservation_id).values_list('theme_id', flat=True).first()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Review {self.review_id} by {self.member.name if self.member else ''}"
@@ -195,7 +281,7 @@ class Review(models.Model):
 # ----------------------------------------------------------------------
 class Schedule(models.Model):
     schedule_id = models.AutoField(primary_key=True)
-    member = models.ForeignKey(Member, on_delete=models.CASCADE, verbose_name="담당 직원")
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, db_constraint=False, verbose_name="담당 직원")
     branch = models.ForeignKey(Branch, on_delete=models.CASCADE, verbose_name="근무 지점")
     work_date = models.DateField(verbose_name="근무 날짜")
     start_time = models.TimeField(verbose_name="시작 시간")
@@ -220,6 +306,12 @@ class Notice(models.Model):
         Branch, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="대상 지점 (전체 공지 시 NULL)"
     )
 
+    class Meta:
+        indexes = [
+            # 대상 지점별 최신순 조회 / 키셋 페이지네이션 / 안 읽은 공지 수
+            models.Index(fields=['target_branch', '-notice_id'], name='notice_branch_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -235,7 +327,7 @@ class IssueReport(models.Model):
 
     report_id = models.AutoField(primary_key=True)
     theme = models.ForeignKey(Theme, on_delete=models.CASCADE, verbose_name="문제 테마")
-    reported_by_member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, verbose_name="보고자")
+    reported_by_member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, db_constraint=False, verbose_name="보고자")
     issue_description = models.TextField(verbose_name="문제 설명")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Reported', verbose_name="처리 상태")
     reported_at = models.DateTimeField(auto_now_add=True, verbose_name="보고 시각")
@@ -258,4 +350,355 @@ class BranchAssignment(models.Model):
         verbose_name_plural = "지점 소속 관리자 배정 목록"
 
     def __str__(self):
-        return f"[{self.branch.branch_name}] {self.member.name} ({self.member.get_role_display()})"
\ No newline at end of file
+        return f"[{self.branch.branch_name}] {self.member.name} ({self.member.get_role_display()})"
+
+# ----------------------------------------------------------------------
+# 11. PriceRule (요일/시간대별 가격 규칙)
+# ----------------------------------------------------------------------
+class PriceRule(models.Model):
+    rule_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100, verbose_name="규칙명")
+    branch = models.ForeignKey(
+        Branch, on_delete=models.CASCADE, null=True, blank=True, verbose_name="적용 지점 (전체 적용 시 NULL)"
+    )
+    theme = models.ForeignKey(
+        Theme, on_delete=models.CASCADE, null=True, blank=True, verbose_name="적용 테마 (지점 전체 적용 시 NULL)"
+    )
+    weekdays = models.CharField(max_length=7, default='0123456', verbose_name="적용 요일 (월=0 ~ 일=6)")
+    start_hour = models.IntegerField(
+        default=0, validators=[MinValueValidator(0), MaxValueValidator(23)], verbose_name="시작 시각"
+    )
+    end_hour = models.IntegerField(
+        default=24, validators=[MinValueValidator(1), MaxValueValidator(24)], verbose_name="종료 시각 (미포함)"
+    )
+    adjust_rate = models.DecimalField(
+        max_digits=5, decimal_places=2, verbose_name="가격 조정률 (%, 할증 +/할인 -)"
+    )
+    is_active = models.BooleanField(default=True, verbose_name="활성 상태")
+
+    def __str__(self):
+        return f"{self.name} ({self.adjust_rate:+}%)"
+
+# ----------------------------------------------------------------------
+# 12. ThemePrice (사전 계산된 테마 슬롯별 가격 캘린더)
+# ----------------------------------------------------------------------
+class ThemePrice(models.Model):
+    theme = models.ForeignKey(Theme, on_delete=models.CASCADE, verbose_name="테마")
+    slot_start = models.DateTimeField(verbose_name="슬롯 시작 시각")
+    price = models.DecimalField(max_digits=10, decimal_places=0, verbose_name="1인 가격")
+
+    class Meta:
+        unique_together = ('theme', 'slot_start')
+        indexes = [
+            # 가격대 필터링 (기간 내 price 이하 슬롯이 있는 테마)
+            models.Index(fields=['slot_start', 'price'], name='themeprice_slot_price_idx'),
+        ]
+        verbose_name = "테마 가격 캘린더"
+        verbose_name_plural = "테마 가격 캘린더"
+
+    def __str__(self):
+        return f"{self.theme_id} {self.slot_start} - {self.price}원"
+
+# ----------------------------------------------------------------------
+# 13. ThemeRecommendation ("이 테마를 플레이한 고객들이 함께 플레이한 테마")
+# ----------------------------------------------------------------------
+class ThemeRecommendation(models.Model):
+    theme = models.ForeignKey(
+        Theme, on_delete=models.CASCADE, related_name='recommendations', verbose_name="기준 테마"
+    )
+    recommended = models.ForeignKey(
+        Theme, on_delete=models.CASCADE, related_name='+', verbose_name="추천 테마"
+    )
+    rank = models.PositiveSmallIntegerField(verbose_name="순위")
+    score = models.FloatField(verbose_name="유사도")
+
+    class Meta:
+        unique_together = ('theme', 'rank')
+        verbose_name = "테마 추천"
+        verbose_name_plural = "테마 추천 목록"
+
+    def __str__(self):
+        return f"{self.theme_id} -> {self.recommended_id} ({self.score:.3f})"
+
+# ----------------------------------------------------------------------
+# 14. ReviewHelpful (리뷰 "도움돼요")
+# ----------------------------------------------------------------------
+class ReviewHelpful(models.Model):
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='helpful_votes', verbose_name="리뷰")
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, db_constraint=False, verbose_name="회원")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="등록일")
+
+    class Meta:
+        unique_together = ('review', 'member')
+        verbose_name = "리뷰 도움돼요"
+        verbose_name_plural = "리뷰 도움돼요 목록"
+
+    def __str__(self):
+        return f"{self.member_id} -> Review {self.review_id}"
+
+# ----------------------------------------------------------------------
+# 15. ThemeReviewSummary (테마별 리뷰 수 / 별점 분포 - 리뷰 변경 시 갱신)
+# ----------------------------------------------------------------------
+class ThemeReviewSummary(models.Model):
+    theme = models.OneToOneField(
+        Theme, on_delete=models.CASCADE, primary_key=True, related_name='review_summary', verbose_name="테마"
+    )
+    review_count = models.PositiveIntegerField(default=0, verbose_name="리뷰 수")
+    rating_sum = models.PositiveIntegerField(default=0, verbose_name="별점 합계")
+    rating_1 = models.PositiveIntegerField(default=0, verbose_name="1점")
+    rating_2 = models.PositiveIntegerField(default=0, verbose_name="2점")
+    rating_3 = models.PositiveIntegerField(default=0, verbose_name="3점")
+    rating_4 = models.PositiveIntegerField(default=0, verbose_name="4점")
+    rating_5 = models.PositiveIntegerField(default=0, verbose_name="5점")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="갱신 시각")
+
+    class Meta:
+        verbose_name = "테마 리뷰 요약"
+        verbose_name_plural = "테마 리뷰 요약"
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.review_count if self.review_count else 0
+
+    def __str__(self):
+        return f"{self.theme_id}: {self.review_count}개 ({self.avg_rating:.2f})"
+
+
+# ----------------------------------------------------------------------
+# 16. ArchiveSegment (보관 예약 세그먼트 - zstd 압축 JSONL 파일 1개)
+# ----------------------------------------------------------------------
+class ArchiveSegment(models.Model):
+    segment_id = models.AutoField(primary_key=True)
+    file_name = models.CharField(max_length=255, unique=True, verbose_name="파일 경로")  # ARCHIVE_ROOT 기준 상대 경로
+    first_time = models.DateTimeField(verbose_name="가장 이른 예약 시간")
+    last_time = models.DateTimeField(verbose_name="가장 늦은 예약 시간")
+    row_count = models.PositiveIntegerField(verbose_name="예약 수")
+    size_bytes = models.PositiveBigIntegerField(verbose_name="파일 크기")
+    sha256 = models.CharField(max_length=64, verbose_name="체크섬")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="보관일")
+
+    class Meta:
+        verbose_name = "보관 세그먼트"
+        verbose_name_plural = "보관 세그먼트 목록"
+
+    def __str__(self):
+        return f"{self.file_name} ({self.row_count}건)"
+
+# ----------------------------------------------------------------------
+# 17. ArchivedReservation (보관된 예약 색인 - 본문은 세그먼트 파일에 저장)
+# ----------------------------------------------------------------------
+class ArchivedReservation(models.Model):
+    reservation_id = models.IntegerField(primary_key=True, verbose_name="원래 예약 번호")
+    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, related_name='+', db_constraint=False, verbose_name="예약 회원")
+    theme = models.ForeignKey(Theme, on_delete=models.PROTECT, related_name='+', verbose_name="예약 테마")
+    reservation_time = models.DateTimeField(verbose_name="예약 시간")
+    status = models.CharField(max_length=20, choices=Reservation.STATUS_CHOICES, verbose_name="예약 상태")
+    is_success = models.BooleanField(null=True, verbose_name="탈출 성공 여부")
+    segment = models.ForeignKey(ArchiveSegment, on_delete=models.PROTECT, related_name='reservations', verbose_name="세그먼트")
+    line = models.PositiveIntegerField(verbose_name="세그먼트 내 줄 번호")
+
+    class Meta:
+        indexes = [
+            # 마이페이지 지난 예약 (보관분 이어서 조회)
+            models.Index(fields=['member', '-reservation_time', '-reservation_id'], name='archived_member_time_idx'),
+        ]
+        verbose_name = "보관된 예약"
+        verbose_name_plural = "보관된 예약 목록"
+
+    def __str__(self):
+        return f"{self.reservation_id} {self.reservation_time} ({self.segment_id}:{self.line})"
+
+# ----------------------------------------------------------------------
+# 18. ThemeArchiveTotals (테마별 보관 예약 누적 통계 - 전체 통계/리뷰 요약에 합산)
+# ----------------------------------------------------------------------
+class ThemeArchiveTotals(models.Model):
+    theme = models.OneToOneField(
+        Theme, on_delete=models.CASCADE, primary_key=True, related_name='archive_totals', verbose_name="테마"
+    )
+    reservation_count = models.PositiveIntegerField(default=0, verbose_name="예약 수")
+    completed_count = models.PositiveIntegerField(default=0, verbose_name="이용 완료 수")
+    success_count = models.PositiveIntegerField(default=0, verbose_name="탈출 성공 수")
+    paid_count = models.PositiveIntegerField(default=0, verbose_name="결제 완료 수")
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=0, default=0, verbose_name="결제 완료 금액")
+    review_count = models.PositiveIntegerField(default=0, verbose_name="리뷰 수")
+    rating_sum = models.PositiveIntegerField(default=0, verbose_name="별점 합계")
+    rating_1 = models.PositiveIntegerField(default=0, verbose_name="1점")
+    rating_2 = models.PositiveIntegerField(default=0, verbose_name="2점")
+    rating_3 = models.PositiveIntegerField(default=0, verbose_name="3점")
+    rating_4 = models.PositiveIntegerField(default=0, verbose_name="4점")
+    rating_5 = models.PositiveIntegerField(default=0, verbose_name="5점")
+
+    class Meta:
+        verbose_name = "테마 보관 통계"
+        verbose_name_plural = "테마 보관 통계"
+
+    def __str__(self):
+        return f"{self.theme_id}: 보관 예약 {self.reservation_count}건"
+
+# ----------------------------------------------------------------------
+# 19. Event (예약 / 결제 / 리뷰 / 테마 변경 이벤트 로그 - 추가만 함)
+# ----------------------------------------------------------------------
+class CurrentTransactionId(models.Func):
+    """기록한 트랜잭션의 ID (PostgreSQL 13+ pg_current_xact_id, 그 밖의 DB는 NULL) - Event.txid 기본값"""
+    output_field = models.BigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return 'NULL', []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return 'pg_current_xact_id()::text::bigint', []
+
+
+class Event(models.Model):
+    TOPIC_CHOICES = (
+        ('reservation', '예약'),
+        ('payment', '결제'),
+        ('review', '리뷰'),
+        ('theme', '테마'),
+    )
+    ACTION_CHOICES = (
+        ('created', '생성'),
+        ('changed', '변경'),
+        ('deleted', '삭제'),
+        ('archived', '보관'),
+        ('restored', '복원'),
+    )
+
+    event_id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=20, choices=TOPIC_CHOICES, verbose_name="대상")
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name="동작")
+    object_id = models.BigIntegerField(verbose_name="대상 ID")
+    # 원본이 삭제/보관되어도 로그는 남도록 FK 대신 ID만 저장
+    theme_id = models.IntegerField(null=True, verbose_name="테마 ID")
+    member_id = models.IntegerField(null=True, verbose_name="회원 ID")
+    data = models.JSONField(default=dict, verbose_name="내용")  # 생성: {필드: 값}, 변경: {필드: [이전, 이후]}
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="기록 시각")
+    # 소비자는 커밋 순서를 보장하기 위해 (txid, event_id) 순서로 읽음 (booking/events.py)
+    txid = models.BigIntegerField(
+        null=True, editable=False, db_default=CurrentTransactionId(), verbose_name="트랜잭션 ID",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['txid', 'event_id'], name='event_txid_idx'),
+        ]
+        verbose_name = "이벤트"
+        verbose_name_plural = "이벤트 로그"
+
+    def __str__(self):
+        return f"#{self.event_id} {self.topic}.{self.action} {self.object_id}"
+
+# ----------------------------------------------------------------------
+# 20. EventCursor (이벤트 소비자별 읽은 위치)
+# ----------------------------------------------------------------------
+class EventCursor(models.Model):
+    name = models.CharField(max_length=100, primary_key=True, verbose_name="소비자 이름")
+    position = models.BigIntegerField(default=0, verbose_name="마지막으로 처리한 이벤트 ID")
+    txid = models.BigIntegerField(default=0, verbose_name="마지막으로 처리한 이벤트의 트랜잭션 ID")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="갱신 시각")
+
+    class Meta:
+        verbose_name = "이벤트 소비자"
+        verbose_name_plural = "이벤트 소비자 목록"
+
+    def __str__(self):
+        return f"{self.name} @ {self.position}"
+
+# ----------------------------------------------------------------------
+# 21. SlotHold (결제 중인 슬롯 임시 선점 - 만료 시간이 지나면 다른 고객이 가져갈 수 있음)
+# ----------------------------------------------------------------------
+class SlotHold(models.Model):
+    hold_id = models.AutoField(primary_key=True)
+    theme = models.ForeignKey(Theme, on_delete=models.CASCADE, related_name='+', verbose_name="테마")
+    slot_time = models.DateTimeField(verbose_name="예약 시간")
+    # 선점은 몇 분 뒤 만료되므로 회원 삭제 시 따로 지우지 않음 (샤딩 시 전역 DB에서 샤드로 연쇄 삭제하지 않도록)
+    member = models.ForeignKey(Member, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False, verbose_name="회원")
+    num_of_participants = models.IntegerField(verbose_name="참가 인원")
+    total_price = models.DecimalField(max_digits=10, decimal_places=0, verbose_name="안내한 결제액")  # 확정 시 이 금액으로 결제
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="선점 시각")
+    expires_at = models.DateTimeField(db_index=True, verbose_name="만료 시각")
+
+    class Meta:
+        constraints = [
+            # 한 슬롯은 한 고객만 선점 (만료된 선점은 새로 선점할 때 지움)
+            models.UniqueConstraint(fields=['theme', 'slot_time'], name='slothold_theme_slot_uniq'),
+        ]
+        verbose_name = "슬롯 선점"
+        verbose_name_plural = "슬롯 선점 목록"
+
+    def __str__(self):
+        return f"{self.theme_id} {self.slot_time} ({self.member_id}, ~{self.expires_at})"
+
+# ----------------------------------------------------------------------
+# 22. PriceCampaign (기간 한정 가격 캠페인 - 여러 지점 / 테마의 할인율을 시작 시각에 일괄 변경, 종료 시각에 복원)
+# ----------------------------------------------------------------------
+class PriceCampaign(models.Model):
+    RULE_CHOICES = (
+        ('set', '할인율 지정'),
+        ('add', '기존 할인율에 추가'),
+    )
+    STATUS_CHOICES = (
+        ('Scheduled', '예정'),
+        ('Active', '진행 중'),
+        ('Ended', '종료'),
+    )
+
+    campaign_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100, verbose_name="캠페인명")
+    branches = models.ManyToManyField(Branch, blank=True, related_name='+', verbose_name="적용 지점 (지점의 모든 테마)")
+    # 테마는 샤드 DB에 있으므로 ID 목록으로 저장
+    theme_ids = models.JSONField(default=list, blank=True, verbose_name="적용 테마 ID")
+    rule = models.CharField(max_length=10, choices=RULE_CHOICES, default='set', verbose_name="할인 방식")
+    discount_rate = models.DecimalField(
+        max_digits=5, decimal_places=2,
+        validators=[MinValueValidator(0), MaxValueValidator(100)], verbose_name="할인율 (%)",
+    )
+    starts_at = models.DateTimeField(verbose_name="시작 시각")
+    ends_at = models.DateTimeField(verbose_name="종료 시각")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Scheduled', verbose_name="상태")
+    theme_count = models.IntegerField(default=0, verbose_name="적용된 테마 수")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="등록일")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'starts_at'], name='pricecampaign_status_idx'),
+        ]
+        verbose_name = "가격 캠페인"
+        verbose_name_plural = "가격 캠페인 목록"
+
+    def __str__(self):
+        return f"{self.name} ({self.starts_at:%Y-%m-%d %H:%M} ~ {self.ends_at:%Y-%m-%d %H:%M})"
+
+# ----------------------------------------------------------------------
+# 23. ThemePriceHistory (테마 기본 가격 / 할인율 변경 이력 - 직접 수정, 캠페인 시작 / 종료)
+# ----------------------------------------------------------------------
+class ThemePriceHistory(models.Model):
+    REASON_CHOICES = (
+        ('manual', '직접 수정'),
+        ('campaign_start', '캠페인 시작'),
+        ('campaign_end', '캠페인 종료'),
+    )
+
+    history_id = models.AutoField(primary_key=True)
+    theme = models.ForeignKey(Theme, on_delete=models.CASCADE, related_name='price_history', verbose_name="테마")
+    previous_price = models.DecimalField(max_digits=10, decimal_places=0, null=True, verbose_name="이전 기본 가격")
+    previous_discount_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, verbose_name="이전 할인율 (%)")
+    price = models.DecimalField(max_digits=10, decimal_places=0, verbose_name="기본 가격")
+    discount_rate = models.DecimalField(max_digits=5, decimal_places=2, verbose_name="할인율 (%)")
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, verbose_name="변경 사유")
+    campaign = models.ForeignKey(
+        PriceCampaign, on_delete=models.DO_NOTHING, null=True, blank=True, related_name='+',
+        db_constraint=False, verbose_name="캠페인",
+    )
+    changed_at = models.DateTimeField(auto_now_add=True, verbose_name="변경 시각")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['theme', '-changed_at'], name='pricehistory_theme_idx'),
+            models.Index(fields=['campaign', 'reason'], name='pricehistory_campaign_idx'),
+        ]
+        verbose_name = "테마 가격 변경 이력"
+        verbose_name_plural = "테마 가격 변경 이력"
+
+    def __str__(self):
+        return f"{self.theme_id} {self.previous_discount_rate}% -> {self.discount_rate}% ({self.get_reason_display()})"
@@ -0,0 +1,74 @@
+# booking/notices.py
+"""
+회원별 공지사항 피드 / 안 읽은 공지 수
+
+- 직원(테마/지점 관리자)은 전체 공지 + 배정된 지점 공지만, 그 외(고객, 총괄 관리자, 비회원)는 모든 공지
+- notice_id 역순 키셋 페이지네이션 (after=마지막으로 본 공지 ID) - 한 번의 인덱스 조회
+- 회원마다 읽음 기준(last_read_notice_id)을 두고, 안 읽은 공지 수는 캐시에 보관
+  (공지 스탬프가 바뀌었을 때만 다시 계산 -> 화면마다 한 번의 캐시 조회)
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Member, Notice, BranchAssignment
+from .stamps import KEY as STAMP_KEY, get_stamps
+
+UNREAD_KEY = 'notices:unread:{}'
+STAFF_ROLES = ('ThemeManager', 'BranchManager')
+
+
+def visible_notices(user):
+    """회원이 볼 수 있는 공지 쿼리셋 (작성자/대상 지점 함께 조회)"""
+    notices = Notice.objects.select_related('member', 'target_branch')
+    if user.is_authenticated and user.role in STAFF_ROLES:
+        notices = notices.filter(
+            Q(target_branch__isnull=True)
+            | Q(target_branch__in=BranchAssignment.objects.filter(member=user).values('branch'))
+        )
+    return notices
+
+
+def notice_feed(user, after=None, limit=None):
+    """(공지 목록, 다음 페이지 커서)"""
+    limit = limit or getattr(settings, 'NOTICE_PAGE_SIZE', 20)
+    notices = visible_notices(user)
+    if after:
+        notices = notices.filter(notice_id__lt=after)
+    page = list(notices.order_by('-notice_id')[:limit + 1])
+    next_cursor = page[limit - 1].notice_id if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def _count_unread(user):
+    # 오래 접속하지 않은 회원도 상한까지만 센다 (화면에는 "99+"로 표시)
+    limit = getattr(settings, 'NOTICE_UNREAD_MAX', 100)
+    return visible_notices(user).filter(notice_id__gt=user.last_read_notice_id).order_by()[:limit].count()
+
+
+def unread_count(user):
+    """안 읽은 공지 수 - 공지 스탬프와 읽음 기준이 같으면 캐시 값 사용"""
+    if not user.is_authenticated:
+        return 0
+    stamp_key, unread_key = STAMP_KEY.format('notices'), UNREAD_KEY.format(user.pk)
+    values = cache.get_many([stamp_key, unread_key])
+    stamp, cached = values.get(stamp_key), values.get(unread_key)
+    if (cached and stamp is not None and cached['stamp'] == stamp
+            and cached['upto'] == user.last_read_notice_id):
+        return cached['count']
+
+    if stamp is None:
+        stamp = get_stamps('notices')['notices']
+    count = _count_unread(user)
+    cache.set(unread_key, {'stamp': stamp, 'upto': user.last_read_notice_id, 'count': count},
+              getattr(settings, 'NOTICE_UNREAD_CACHE_SECONDS', 24 * 60 * 60))
+    return count
+
+
+def mark_read(user, notice_id):
+    """읽음 기준을 notice_id까지 올림 (이미 더 최신까지 읽었으면 변경 없음)"""
+    if not user.is_authenticated or notice_id <= user.last_read_notice_id:
+        return
+    Member.objects.filter(pk=user.pk, last_read_notice_id__lt=notice_id).update(last_read_notice_id=notice_id)
+    user.last_read_notice_id = notice_id
+    cache.delete(UNREAD_KEY.format(user.pk))
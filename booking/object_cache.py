@@ -0,0 +1,114 @@
+# booking/object_cache.py
+"""
+테마(+지점) 읽기 전용 객체 캐시 (read-through)
+
+- 공유 캐시 키에 버전 스탬프(booking/stamps.py의 theme:<id>, branches)를 넣어 저장/삭제 시 자동 무효화
+  (테마/지점 시그널이 커밋 후 스탬프를 올리므로 별도 삭제가 필요 없음)
+- 공유 캐시 앞에 짧은 TTL의 프로세스 내 L1
+  (같은 프로세스의 변경은 시그널에서 바로 지우고, 다른 프로세스의 변경은 TTL 안에 반영)
+- get_themes()는 L1 -> 공유 캐시(get_many 한 번) -> DB(한 번) 순서로 채움
+- 반환값은 복사본이므로 화면에서 속성을 바꿔도 캐시에는 영향이 없음
+  저장(save)할 객체는 캐시 대신 DB에서 읽을 것
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+
+from . import metrics, sharding
+from .models import Theme
+from .stamps import get_stamps
+
+KEY = 'object:theme:{}:{}:{}'
+L1_MAX_ENTRIES = 10_000
+
+# 프로세스 내 L1 {theme_id: (만료 시각, 테마)}
+_local = {}
+_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _key(theme_id, stamps):
+    return KEY.format(theme_id, stamps[f'theme:{theme_id}'], stamps['branches'])
+
+
+def _load(theme_ids):
+    """DB에서 테마 + 지점 조회 (샤딩 시 ID 구간으로 샤드를 찾아 샤드별 한 번)"""
+    groups = {}
+    for theme_id in theme_ids:
+        alias = sharding.shard_for_id(theme_id) if sharding.enabled() else None
+        if alias is not None or not sharding.enabled():
+            groups.setdefault(alias, []).append(theme_id)
+    themes = {}
+    for alias, ids in groups.items():
+        with sharding.use_shard(alias):
+            themes.update(Theme.objects.select_related('branch').in_bulk(ids))
+    return themes
+
+
+def get_themes(theme_ids):
+    """{theme_id: 테마} - 없는 테마는 결과에서 빠짐"""
+    theme_ids = {int(theme_id) for theme_id in theme_ids if theme_id is not None}
+    now = time.monotonic()
+    found = {}
+    for theme_id in theme_ids:
+        entry = _local.get(theme_id)
+        if entry is not None and entry[0] > now:
+            found[theme_id] = entry[1]
+
+    missing = theme_ids - found.keys()
+    metrics.cache_lookup('theme_l1', hits=len(found), misses=len(missing))
+    if missing:
+        # 스탬프를 먼저 읽어야 DB 조회 중 바뀐 테마가 이전 버전 키에만 저장됨
+        stamps = get_stamps('branches', *(f'theme:{theme_id}' for theme_id in missing))
+        keys = {_key(theme_id, stamps): theme_id for theme_id in missing}
+        fetched = {keys[key]: theme for key, theme in cache.get_many(keys).items()}
+
+        to_load = missing - fetched.keys()
+        metrics.cache_lookup('theme', hits=len(fetched), misses=len(to_load))
+        if to_load:
+            loaded = _load(to_load)
+            cache.set_many(
+                {_key(theme_id, stamps): theme for theme_id, theme in loaded.items()},
+                _setting('THEME_CACHE_SECONDS', 60 * 60),
+            )
+            fetched.update(loaded)
+
+        expires = now + _setting('THEME_CACHE_L1_SECONDS', 5)
+        with _lock:
+            if len(_local) + len(fetched) > L1_MAX_ENTRIES:
+                _local.clear()
+            for theme_id, theme in fetched.items():
+                _local[theme_id] = (expires, theme)
+        found.update(fetched)
+
+    return {theme_id: copy.deepcopy(theme) for theme_id, theme in found.items()}
+
+
+def get_theme(theme_id):
+    """테마 하나 (없으면 None)"""
+    return get_themes([theme_id]).get(int(theme_id))
+
+
+def get_theme_or_404(theme_id, **conditions):
+    """get_object_or_404(Theme, theme_id=..., 필드=값...)의 캐시 버전 (조건은 같은 값 비교만)"""
+    theme = get_theme(theme_id)
+    if theme is None or any(getattr(theme, field) != value for field, value in conditions.items()):
+        raise Http404("존재하지 않는 테마입니다.")
+    return theme
+
+
+def invalidate_local(theme_ids=None):
+    """이 프로세스의 L1에서 삭제 (theme_ids가 없으면 전체)"""
+    with _lock:
+        if theme_ids is None:
+            _local.clear()
+        else:
+            for theme_id in theme_ids:
+                _local.pop(theme_id, None)
@@ -0,0 +1,148 @@
+# booking/page_cache.py
+"""
+비로그인 방문자용 전체 페이지 캐시
+
+- 캐시 키 = 경로 + 정규화된 쿼리스트링(허용된 파라미터만, 정렬) + 페이지가 의존하는 버전 스탬프
+  -> 테마/지점/리뷰/공지가 바뀌면 스탬프가 올라가서 관련 페이지만 자연스럽게 새 키로 바뀜
+- 만료 직후 인기 페이지에 요청이 몰려도 한 요청만 다시 렌더링하고 (잠금),
+  나머지는 잠시 이전 페이지(stale)를 응답하거나 새 페이지가 저장될 때까지 기다림
+- 앞단 프록시를 위한 Cache-Control / Vary 헤더 설정
+"""
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import metrics
+from .stamps import get_stamps
+
+PAGE_KEY = 'pagecache:page:{}'
+LOCK_KEY = 'pagecache:lock:{}'
+WAIT_STEP = 0.05
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def normalize_query(request, params, defaults=None):
+    """허용된 파라미터만 (빈 값/기본값 제외) 정렬된 쿼리스트링으로"""
+    defaults = defaults or {}
+    items = []
+    for name in sorted(params):
+        value = request.GET.get(name, '')
+        if value and value != defaults.get(name):
+            items.append((name, value))
+    return urlencode(items)
+
+
+def _page_key(request, params, defaults, stamp_names):
+    stamps = get_stamps(*stamp_names)
+    raw = '|'.join([
+        request.path,
+        normalize_query(request, params, defaults),
+        ','.join(f'{name}={stamps[name]}' for name in sorted(stamps)),
+    ])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _cacheable_request(request):
+    # 로그인 사용자, 표시할 메시지가 남아 있는 요청(로그아웃 직후 등)은 캐시하지 않음
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and not len(messages.get_messages(request))
+    )
+
+
+def _cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # CSRF 토큰이 포함된 페이지는 방문자마다 달라야 함
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def _from_entry(entry, status):
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['X-Page-Cache'] = status
+    return response
+
+
+def _public_headers(response):
+    patch_cache_control(response, public=True, max_age=_setting('PAGE_CACHE_PROXY_SECONDS', 30))
+    patch_vary_headers(response, ['Cookie'])
+    return response
+
+
+def anonymous_page_cache(stamp_names, params=(), defaults=None):
+    """
+    비로그인 요청의 렌더링 결과를 캐시하는 뷰 데코레이터
+    stamp_names: 페이지 내용이 의존하는 버전 스탬프 이름 목록 (또는 뷰 인자를 받아 목록을 반환하는 함수)
+    params: 캐시 키에 포함할 쿼리 파라미터 (그 외 파라미터는 무시)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                response = view(request, *args, **kwargs)
+                patch_cache_control(response, private=True)
+                patch_vary_headers(response, ['Cookie'])
+                return response
+
+            names = stamp_names(**kwargs) if callable(stamp_names) else stamp_names
+            key = _page_key(request, params, defaults, names)
+            page_key, lock_key = PAGE_KEY.format(key), LOCK_KEY.format(key)
+            ttl = _setting('PAGE_CACHE_SECONDS', 300)
+            stale_ttl = _setting('PAGE_CACHE_STALE_SECONDS', 30)
+            lock_ttl = _setting('PAGE_CACHE_LOCK_SECONDS', 10)
+
+            entry = cache.get(page_key)
+            if entry is not None and entry['expires'] > time.time():
+                metrics.cache_lookup('page', hits=1)
+                return _public_headers(_from_entry(entry, 'HIT'))
+
+            # 만료되었거나 없는 페이지 - 잠금을 얻은 요청만 다시 렌더링
+            locked = cache.add(lock_key, 1, lock_ttl)
+            if not locked:
+                if entry is not None:
+                    metrics.cache_lookup('page', hits=1)
+                    return _public_headers(_from_entry(entry, 'STALE'))
+                # 이전 페이지도 없으면(스탬프 변경 직후) 렌더링이 끝날 때까지 잠시 대기
+                deadline = time.monotonic() + _setting('PAGE_CACHE_WAIT_SECONDS', 2)
+                while time.monotonic() < deadline:
+                    time.sleep(WAIT_STEP)
+                    entry = cache.get(page_key)
+                    if entry is not None:
+                        metrics.cache_lookup('page', hits=1)
+                        return _public_headers(_from_entry(entry, 'HIT'))
+
+            metrics.cache_lookup('page', misses=1)
+            try:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render') and callable(response.render):
+                    response = response.render()
+                if _cacheable_response(request, response):
+                    cache.set(page_key, {
+                        'content': response.content,
+                        'content_type': response['Content-Type'],
+                        'expires': time.time() + ttl,
+                    }, ttl + stale_ttl)
+                    response['X-Page-Cache'] = 'MISS'
+                    return _public_headers(response)
+                patch_cache_control(response, private=True)
+                patch_vary_headers(response, ['Cookie'])
+                return response
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+        return wrapper
+    return decorator
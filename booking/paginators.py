@@ -0,0 +1,59 @@
+# booking/paginators.py
+"""
+대용량 테이블용 페이지네이터 (관리자 화면)
+
+- 정확한 COUNT(*)는 수백만 행 테이블 전체를 읽어야 하므로,
+  PostgreSQL에서는 플래너 통계(pg_class.reltuples / EXPLAIN 예상 행 수)로 전체 개수를 추정
+- 추정값이 ADMIN_ESTIMATED_COUNT_THRESHOLD 미만이면(작은 테이블, 좁은 검색 결과) 정확히 센다
+- PostgreSQL 이외의 DB에서는 기본 Paginator와 같음
+"""
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def _threshold():
+    return getattr(settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', 100_000)
+
+
+def _table_estimate(queryset):
+    """필터 없는 전체 테이블의 예상 행 수 (ANALYZE 전이면 None)"""
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+def _plan_estimate(queryset):
+    """필터가 있는 쿼리의 예상 행 수 (EXPLAIN, 실제로 실행하지 않음)"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """전체 개수를 플래너 통계로 추정하는 Paginator"""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if getattr(queryset, 'query', None) is None or connections[queryset.db].vendor != 'postgresql':
+            return super().count
+
+        if not queryset.query.where and not queryset.query.distinct:
+            estimate = _table_estimate(queryset)
+        else:
+            estimate = _plan_estimate(queryset)
+        if estimate is None or estimate < _threshold():
+            return super().count
+        return estimate
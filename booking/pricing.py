@@ -0,0 +1,181 @@
+# booking/pricing.py
+"""
+테마 가격 캘린더
+
+기본 가격, 할인율, 요일/시간대 규칙(PriceRule), (선택) 예상 수요를 반영한 슬롯별 1인 가격을
+예약 가능 기간 전체에 대해 미리 계산하여 ThemePrice 테이블에 저장합니다.
+목록/상세/예약 화면은 가격을 매번 계산하지 않고 이 테이블을 인덱스로 조회합니다.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db.models import DecimalField, F, Min, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Floor
+from django.utils import timezone
+
+from .facets import invalidate_facets
+from .forecast import occupancy_profiles
+from . import sharding
+from .models import Theme, PriceRule, ThemePrice
+from .stamps import bump
+
+logger = logging.getLogger(__name__)
+
+
+def _calendar_days():
+    return getattr(settings, 'PRICE_CALENDAR_DAYS', 30)
+
+
+def _calendar_hours():
+    return list(getattr(settings, 'PRICE_CALENDAR_HOURS', range(10, 24)))
+
+
+def slot_start(when):
+    """예약 시각이 속한 가격 슬롯(정시 단위)의 시작 시각"""
+    return timezone.localtime(when).replace(minute=0, second=0, microsecond=0)
+
+
+def final_price_expression():
+    """Theme.final_price와 같은 값의 DB 식 (원 단위 미만 버림)"""
+    return Floor(
+        F('price') * (Value(100) - F('discount_rate')) / Value(100),
+        output_field=DecimalField(max_digits=10, decimal_places=0),
+    )
+
+
+def lowest_upcoming_price(now=None):
+    """
+    앞으로 예약 가능한 슬롯 중 최저 1인 가격 (Theme annotate용)
+    - 가격 캘린더가 아직 없는 테마(새 테마, 캘린더 생성 전)는 할인 적용 기본 가격
+    """
+    upcoming = ThemePrice.objects.filter(
+        theme=OuterRef('pk'),
+        slot_start__gte=slot_start(now or timezone.now()),
+    ).values('theme').annotate(min_price=Min('price')).values('min_price')
+    return Coalesce(Subquery(upcoming), final_price_expression())
+
+
+def _price_matrix(themes, hours):
+    """(테마 x 요일 x 시간) 1인 가격 배열"""
+    theme_ids = np.array([t['theme_id'] for t in themes])
+    branch_ids = np.array([t['branch_id'] for t in themes])
+    base = np.array([float(t['price']) for t in themes])
+    discount = np.array([float(t['discount_rate']) for t in themes])
+    hours = np.array(hours)
+
+    # 요일/시간대 규칙의 조정률(%)을 누적
+    adjust = np.zeros((len(themes), 7, len(hours)))
+    for rule in PriceRule.objects.filter(is_active=True):
+        if rule.theme_id:
+            theme_mask = theme_ids == rule.theme_id
+        elif rule.branch_id:
+            theme_mask = branch_ids == rule.branch_id
+        else:
+            theme_mask = np.ones(len(themes), dtype=bool)
+        day_mask = np.array([str(d) in rule.weekdays for d in range(7)])
+        hour_mask = (hours >= rule.start_hour) & (hours < rule.end_hour)
+        adjust[np.ix_(theme_mask, day_mask, hour_mask)] += float(rule.adjust_rate)
+
+    factor = (1 - discount / 100)[:, None, None] * (1 + adjust / 100)
+
+    # 예상 수요가 높은 슬롯일수록 할증 (PRICE_DEMAND_SURCHARGE_RATE: 수요 100%일 때의 할증률)
+    surcharge = getattr(settings, 'PRICE_DEMAND_SURCHARGE_RATE', 0)
+    if surcharge:
+        demand = occupancy_profiles(theme_ids.tolist())[:, :, hours]
+        factor = factor * (1 + surcharge / 100 * demand)
+
+    # Theme.final_price와 같이 원 단위 미만은 버림 (부동소수 오차 보정)
+    return np.floor(base[:, None, None] * np.clip(factor, 0, None) + 1e-6)
+
+
+def build_price_calendar(theme_ids=None, start_date=None):
+    """
+    지정한 테마(없으면 전체 활성 테마)의 가격 캘린더를 예약 가능 기간만큼 다시 계산하여 저장
+    반환: 저장한 슬롯 수
+    """
+    started = time.monotonic()
+    start_date = start_date or timezone.localdate()
+    days = _calendar_days()
+    hours = _calendar_hours()
+    tz = timezone.get_current_timezone()
+
+    themes = Theme.objects.filter(is_active=True)
+    if theme_ids is not None:
+        themes = themes.filter(theme_id__in=theme_ids)
+    themes = list(themes.values('theme_id', 'branch_id', 'price', 'discount_rate'))
+    if not themes:
+        return 0
+
+    prices = _price_matrix(themes, hours)
+
+    rows = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        weekday = day.weekday()
+        slots = [timezone.make_aware(datetime(day.year, day.month, day.day, h), tz) for h in hours]
+        for i, theme in enumerate(themes):
+            for j, slot in enumerate(slots):
+                rows.append(ThemePrice(
+                    theme_id=theme['theme_id'],
+                    slot_start=slot,
+                    price=Decimal(int(prices[i, weekday, j])),
+                ))
+
+    horizon_start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()), tz)
+    with sharding.atomic():
+        ThemePrice.objects.filter(
+            theme_id__in=[t['theme_id'] for t in themes],
+            slot_start__gte=horizon_start,
+        ).delete()
+        # 지난 슬롯 정리
+        ThemePrice.objects.filter(slot_start__lt=horizon_start).delete()
+        ThemePrice.objects.bulk_create(rows, batch_size=2000)
+        # 최저 가격이 바뀌므로 가격대별 필터 개수도 다시 계산
+        sharding.on_commit(invalidate_facets)
+        # API 응답(최저 가격, 슬롯 가격)의 ETag 갱신
+        stamp_names = ['themes'] + [f"theme:{t['theme_id']}:slots" for t in themes]
+        sharding.on_commit(lambda: bump(*stamp_names))
+
+    logger.info(
+        "Built price calendar: %d themes, %d slots (%.2fs)",
+        len(themes), len(rows), time.monotonic() - started,
+    )
+    return len(rows)
+
+
+def price_for_slot(theme, when):
+    """예약 시각의 1인 가격 (캘린더에 없는 시간대는 Theme.final_price)"""
+    price = ThemePrice.objects.filter(
+        theme=theme,
+        slot_start=slot_start(when),
+    ).values_list('price', flat=True).first()
+    return price if price is not None else theme.final_price
+
+
+def prices_for_slots(slots):
+    """[(테마, 예약 시각)] -> 같은 순서의 1인 가격 목록 (캘린더 조회 한 번)"""
+    if not slots:
+        return []
+    starts = [slot_start(when) for _, when in slots]
+    prices = {
+        (theme_id, start): price for theme_id, start, price in ThemePrice.objects.filter(
+            theme_id__in={theme.theme_id for theme, _ in slots},
+            slot_start__in=set(starts),
+        ).values_list('theme_id', 'slot_start', 'price')
+    }
+    return [
+        prices.get((theme.theme_id, start), theme.final_price)
+        for (theme, _), start in zip(slots, starts)
+    ]
+
+
+def upcoming_price_range(theme):
+    """예약 가능 기간 동안의 최저/최고 1인 가격"""
+    return ThemePrice.objects.filter(
+        theme=theme,
+        slot_start__gte=slot_start(timezone.now()),
+    ).aggregate(min_price=Min('price'), max_price=Max('price'))
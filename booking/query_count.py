@@ -0,0 +1,39 @@
+# booking/query_count.py
+"""
+요청별 DB 쿼리 수 응답 헤더 (opt-in, 부하 테스트용)
+
+QUERY_COUNT_HEADER = True 이면 모든 응답에 X-Query-Count(요청 처리 중 실행된 쿼리 수, 모든 DB 합계)를 붙임
+- 부하 테스트(load_test 명령)가 단계별 쿼리 수를 집계할 때 사용
+- gather()로 다른 스레드에서 실행한 샤드 쿼리는 포함되지 않음
+"""
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+HEADER = 'X-Query-Count'
+
+
+class QueryCountMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_COUNT_HEADER', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response.render()
+        response[HEADER] = str(count)
+        return response
@@ -0,0 +1,153 @@
+# booking/recommendation.py
+"""
+"이 테마를 플레이한 고객들이 함께 플레이한 테마" 추천 (오프라인 계산)
+
+1. 예약/리뷰 이력을 (회원, 테마) 단위로 한 번에 집계하여 희소 행렬(COO 배열)로 구성
+   - 예약(취소 제외)은 1, 리뷰 별점이 높을수록 가중치 증가 / 낮을수록 감소
+2. 회원을 일정 크기로 나눈 조각마다 dense 행렬을 만들어 X^T X를 누적 -> 테마 x 테마 동시 이용 행렬
+3. 코사인 유사도 상위 K개를 ThemeRecommendation 테이블에 저장
+
+화면에서는 테마별 상위 K개를 인덱스로 한 번만 조회합니다.
+"""
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Avg
+
+from . import sharding
+from .models import Theme, Reservation, ThemeRecommendation
+
+logger = logging.getLogger(__name__)
+
+
+def _interactions():
+    """(회원 인덱스, 테마 인덱스, 가중치) COO 배열과 테마 ID 목록"""
+    rows = list(
+        Reservation.objects.filter(member__isnull=False)
+        .exclude(status='Cancelled')
+        .values('member_id', 'theme_id')
+        .annotate(rating=Avg('review__rating'))
+        .values_list('member_id', 'theme_id', 'rating')
+        .order_by()
+    )
+    if not rows:
+        return None
+
+    member_ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    theme_ids = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+    ratings = np.fromiter((r[2] if r[2] is not None else 3.0 for r in rows), dtype=np.float32, count=len(rows))
+
+    members, member_idx = np.unique(member_ids, return_inverse=True)
+    themes, theme_idx = np.unique(theme_ids, return_inverse=True)
+    # 별점 3점(또는 리뷰 없음) = 1.0, 5점 = 2.0, 1점 = 0.1
+    weights = np.clip(1.0 + (ratings - 3.0) * 0.5, 0.1, None)
+    return member_idx, theme_idx, weights, len(members), themes
+
+
+def _cooccurrence(member_idx, theme_idx, weights, num_members, num_themes, chunk_size):
+    """회원 조각별로 dense 행렬을 만들어 테마 x 테마 동시 이용 행렬(X^T X)을 누적"""
+    order = np.argsort(member_idx, kind='stable')
+    member_idx, theme_idx, weights = member_idx[order], theme_idx[order], weights[order]
+    bounds = np.searchsorted(member_idx, np.arange(0, num_members + chunk_size, chunk_size))
+
+    gram = np.zeros((num_themes, num_themes), dtype=np.float64)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if start == end:
+            continue
+        rows = member_idx[start:end] - member_idx[start]
+        chunk = np.zeros((rows[-1] + 1, num_themes), dtype=np.float32)
+        chunk[rows, theme_idx[start:end]] = weights[start:end]
+        gram += chunk.T @ chunk
+    return gram
+
+
+def build_recommendations(top_k=None):
+    """전체 테마의 추천 목록을 다시 계산하여 저장하고, 저장한 추천 수를 반환"""
+    started = time.monotonic()
+    top_k = top_k or getattr(settings, 'RECOMMENDATION_TOP_K', 5)
+    chunk_size = getattr(settings, 'RECOMMENDATION_CHUNK_SIZE', 20000)
+
+    data = _interactions()
+    objs = []
+    if data is not None:
+        member_idx, theme_idx, weights, num_members, themes = data
+        gram = _cooccurrence(member_idx, theme_idx, weights, num_members, len(themes), chunk_size)
+
+        # 코사인 유사도 (자기 자신 / 비활성 테마 / 함께 이용 이력이 없는 테마는 제외)
+        norms = np.sqrt(np.diag(gram))
+        sim = gram / np.maximum(np.outer(norms, norms), 1e-12)
+        active = set(Theme.objects.filter(is_active=True).values_list('theme_id', flat=True))
+        sim[:, ~np.isin(themes, list(active))] = 0
+        np.fill_diagonal(sim, 0)
+
+        k = min(top_k, len(themes) - 1)
+        if k > 0:
+            top = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(sim, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for i, theme_id in enumerate(themes.tolist()):
+                rank = 0
+                for j, score in zip(top[i].tolist(), top_scores[i].tolist()):
+                    if score <= 0:
+                        break
+                    rank += 1
+                    objs.append(ThemeRecommendation(
+                        theme_id=theme_id,
+                        recommended_id=int(themes[j]),
+                        rank=rank,
+                        score=score,
+                    ))
+
+    with sharding.atomic():
+        ThemeRecommendation.objects.all().delete()
+        ThemeRecommendation.objects.bulk_create(objs, batch_size=2000)
+
+    logger.info(
+        "Built %d theme recommendations (%.2fs)", len(objs), time.monotonic() - started,
+    )
+    return len(objs)
+
+
+def recommendations_for_theme(theme, limit=None):
+    """테마 상세 화면용 추천 테마 목록"""
+    limit = limit or getattr(settings, 'RECOMMENDATION_TOP_K', 5)
+    return [
+        rec.recommended for rec in
+        ThemeRecommendation.objects.filter(
+            theme=theme,
+            recommended__is_active=True,
+        ).select_related('recommended', 'recommended__branch').order_by('rank')[:limit]
+    ]
+
+
+def recommendations_for_member(played_theme_ids, limit=None):
+    """최근 이용한 테마들의 추천을 합쳐서 (이미 이용한 테마 제외) 점수순으로 반환"""
+    limit = limit or getattr(settings, 'RECOMMENDATION_TOP_K', 5)
+    played = set(played_theme_ids)
+    if not played:
+        return []
+
+    seen = set()
+    result = []
+    recs = sharding.gather_queryset(ThemeRecommendation.objects.filter(
+        theme_id__in=played,
+        recommended__is_active=True,
+    ).exclude(
+        recommended_id__in=played
+    ).select_related('recommended', 'recommended__branch').order_by('-score')[:limit * 4])
+    if sharding.enabled():
+        # 추천은 샤드 안의 테마끼리만 계산되므로 샤드별 결과를 점수순으로 합침
+        recs.sort(key=lambda rec: rec.score, reverse=True)
+    for rec in recs:
+        if rec.recommended_id in seen:
+            continue
+        seen.add(rec.recommended_id)
+        result.append(rec.recommended)
+        if len(result) >= limit:
+            break
+    return result
@@ -0,0 +1,116 @@
+# booking/reviews.py
+"""
+테마 상세 리뷰 피드
+
+- 리뷰 수 / 평균 / 별점 분포는 ThemeReviewSummary에 미리 계산 (리뷰 변경 시 해당 테마만 갱신)
+  보관된 예약(booking/archive.py)의 리뷰는 ThemeArchiveTotals의 누적값을 더함
+- 리뷰 목록은 최신순 / 도움돼요순 커서 페이지네이션 (Review.theme 인덱스 사용, 작성자는 같은 쿼리에서 조인)
+"""
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, NullIf
+
+from . import sharding
+from .models import Review, ReviewHelpful, ThemeReviewSummary, ThemeArchiveTotals
+
+SORTS = ('newest', 'helpful')
+
+
+def _page_size():
+    return getattr(settings, 'REVIEW_PAGE_SIZE', 10)
+
+
+def refresh_rating_summary(theme_id):
+    """테마의 리뷰 요약을 다시 계산 (별점별 GROUP BY 한 번)"""
+    values = {'review_count': 0, 'rating_sum': 0, **{f'rating_{i}': 0 for i in range(1, 6)}}
+    rows = Review.objects.filter(theme_id=theme_id).values('rating').annotate(
+        count=Count('review_id'), total=Sum('rating')
+    ).order_by()
+    for row in rows:
+        values['review_count'] += row['count']
+        values['rating_sum'] += row['total']
+        values[f"rating_{row['rating']}"] = row['count']
+    archived = ThemeArchiveTotals.objects.filter(theme_id=theme_id).first()
+    if archived:
+        for field in values:
+            values[field] += getattr(archived, field)
+    ThemeReviewSummary.objects.update_or_create(theme_id=theme_id, defaults=values)
+
+
+def summary_avg_rating(prefix='review_summary__'):
+    """테마 쿼리셋용 평균 별점 식 (리뷰 테이블 집계 대신 요약 테이블 조인, 리뷰가 없으면 NULL)"""
+    return Cast(F(f'{prefix}rating_sum'), FloatField()) / NullIf(F(f'{prefix}review_count'), 0)
+
+
+def rating_summary(theme):
+    """리뷰 수, 평균 별점, 별점 분포 (5점 -> 1점)"""
+    summary = ThemeReviewSummary.objects.filter(theme=theme).first() or ThemeReviewSummary(theme=theme)
+    count = summary.review_count
+    return {
+        'count': count,
+        'avg': round(summary.avg_rating, 1),
+        'histogram': [
+            {
+                'rating': rating,
+                'count': getattr(summary, f'rating_{rating}'),
+                'percent': round(getattr(summary, f'rating_{rating}') * 100 / count) if count else 0,
+            }
+            for rating in range(5, 0, -1)
+        ],
+    }
+
+
+def _encode(review, sort):
+    return f"{review.helpful_count}-{review.review_id}" if sort == 'helpful' else str(review.review_id)
+
+
+def _decode(cursor, sort):
+    try:
+        if sort == 'helpful':
+            helpful_count, review_id = cursor.split('-')
+            return int(helpful_count), int(review_id)
+        return int(cursor)
+    except (AttributeError, ValueError):
+        return None
+
+
+def review_page(theme, sort='newest', cursor=None, limit=None):
+    """(리뷰 목록, 다음 페이지 커서)"""
+    sort = sort if sort in SORTS else 'newest'
+    limit = limit or _page_size()
+    reviews = sharding.join_global(Review.objects.filter(theme=theme), 'member')
+
+    position = _decode(cursor, sort) if cursor else None
+    if sort == 'helpful':
+        if position:
+            helpful_count, review_id = position
+            reviews = reviews.filter(
+                Q(helpful_count__lt=helpful_count) | Q(helpful_count=helpful_count, review_id__lt=review_id)
+            )
+        reviews = reviews.order_by('-helpful_count', '-review_id')
+    else:
+        if position:
+            reviews = reviews.filter(review_id__lt=position)
+        reviews = reviews.order_by('-review_id')
+
+    page = list(reviews[:limit + 1])
+    next_cursor = _encode(page[limit - 1], sort) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def toggle_helpful(review, member):
+    """도움돼요 등록/취소 - 등록되었으면 True"""
+    with sharding.atomic():
+        deleted, _ = ReviewHelpful.objects.filter(review=review, member=member).delete()
+        if deleted:
+            Review.objects.filter(pk=review.pk).update(helpful_count=F('helpful_count') - 1)
+            return False
+        try:
+            with sharding.atomic():
+                ReviewHelpful.objects.create(review=review, member=member)
+        except IntegrityError:
+            # 동시에 두 번 누른 경우 - 이미 등록됨
+            return True
+        Review.objects.filter(pk=review.pk).update(helpful_count=F('helpful_count') + 1)
+        return True
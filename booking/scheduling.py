@@ -0,0 +1,160 @@
+# booking/scheduling.py
+"""
+직원 스케줄 충돌 검사 및 주 단위 일괄 등록
+
+- 직원별 / 배정 테마별로 근무 구간을 IntervalTree에 올려 겹치는 근무를 찾음
+- 검사 대상 기간의 스케줄은 한 번의 쿼리로 불러옴 (지점-주 단위)
+- 충돌은 한 건씩 실패시키지 않고 전부 모아서 반환
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Q
+from intervaltree import IntervalTree
+
+from . import sharding
+from .models import Branch, Schedule
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _shift_interval(schedule):
+    """근무를 (시작, 종료) 분 단위 정수 구간으로 변환 (종료가 시작보다 이르면 다음 날 종료로 간주)"""
+    day = schedule.work_date.toordinal() * MINUTES_PER_DAY
+    begin = day + schedule.start_time.hour * 60 + schedule.start_time.minute
+    end = day + schedule.end_time.hour * 60 + schedule.end_time.minute
+    if end <= begin:
+        end += MINUTES_PER_DAY
+    return begin, end
+
+
+def _interval_key(interval):
+    return interval.begin, interval.end
+
+
+def _describe(schedule):
+    return (
+        f"{schedule.work_date:%Y.%m.%d} "
+        f"{schedule.start_time:%H:%M}~{schedule.end_time:%H:%M}"
+    )
+
+
+class ScheduleConflictIndex:
+    """직원별, 테마별 근무 구간 인덱스"""
+
+    def __init__(self, schedules=()):
+        self.by_member = defaultdict(IntervalTree)
+        self.by_theme = defaultdict(IntervalTree)
+        for schedule in schedules:
+            self.add(schedule)
+
+    @classmethod
+    def load(cls, start_date, end_date, branch_ids=(), member_ids=(), exclude_ids=()):
+        """
+        기간 내 해당 지점의 스케줄과, 대상 직원의 (다른 지점 포함) 스케줄을 한 번에 불러옴
+        자정을 넘기는 근무를 고려하여 시작일 하루 전부터 조회
+        """
+        schedules = sharding.join_global(Schedule.objects.filter(
+            Q(branch_id__in=branch_ids) | Q(member_id__in=member_ids),
+            work_date__gte=start_date - timedelta(days=1),
+            work_date__lte=end_date,
+        ).exclude(
+            schedule_id__in=exclude_ids
+        ), 'member').select_related('assigned_theme')
+        return cls(schedules)
+
+    def add(self, schedule):
+        begin, end = _shift_interval(schedule)
+        self.by_member[schedule.member_id].addi(begin, end, schedule)
+        if schedule.assigned_theme_id:
+            self.by_theme[schedule.assigned_theme_id].addi(begin, end, schedule)
+
+    def conflicts_for(self, schedule):
+        """schedule과 겹치는 기존 근무에 대한 오류 메시지 목록"""
+        begin, end = _shift_interval(schedule)
+        messages = []
+        for interval in sorted(self.by_member[schedule.member_id].overlap(begin, end), key=_interval_key):
+            messages.append(
+                f"[{_describe(schedule)}] {schedule.member.name}님은 "
+                f"{_describe(interval.data)}에 이미 근무가 있습니다."
+            )
+        if schedule.assigned_theme_id:
+            for interval in sorted(self.by_theme[schedule.assigned_theme_id].overlap(begin, end), key=_interval_key):
+                messages.append(
+                    f"[{_describe(schedule)}] '{schedule.assigned_theme.name}' 테마는 "
+                    f"{_describe(interval.data)}에 {interval.data.member.name}님이 이미 배정되어 있습니다."
+                )
+        return messages
+
+    def check_all(self, schedules):
+        """
+        여러 스케줄을 순서대로 검사하면서 인덱스에 추가
+        (새로 등록하려는 스케줄끼리의 충돌도 함께 검출)
+        """
+        messages = []
+        for schedule in schedules:
+            messages.extend(self.conflicts_for(schedule))
+            self.add(schedule)
+        return messages
+
+
+def find_schedule_conflicts(schedules, exclude_ids=()):
+    """저장 전 스케줄 목록의 충돌을 모두 찾아 메시지 목록으로 반환"""
+    schedules = list(schedules)
+    if not schedules:
+        return []
+    index = ScheduleConflictIndex.load(
+        start_date=min(s.work_date for s in schedules),
+        end_date=max(s.work_date for s in schedules) + timedelta(days=1),
+        branch_ids={s.branch_id for s in schedules},
+        member_ids={s.member_id for s in schedules},
+        exclude_ids=exclude_ids,
+    )
+    return index.check_all(schedules)
+
+
+def build_week_copies(branch, source_week_start, target_week_start, weeks):
+    """source 주(7일)의 스케줄을 target 주부터 weeks 주 동안 반복 적용한 (저장 전) 스케줄 목록"""
+    template = list(
+        sharding.join_global(Schedule.objects.filter(
+            branch=branch,
+            work_date__gte=source_week_start,
+            work_date__lt=source_week_start + timedelta(days=7),
+        ), 'member').select_related('assigned_theme').order_by('work_date', 'start_time')
+    )
+
+    copies = []
+    for week in range(weeks):
+        offset = (target_week_start - source_week_start) + timedelta(weeks=week)
+        for schedule in template:
+            copies.append(Schedule(
+                member=schedule.member,
+                branch=branch,
+                work_date=schedule.work_date + offset,
+                start_time=schedule.start_time,
+                end_time=schedule.end_time,
+                assigned_theme=schedule.assigned_theme,
+            ))
+    return copies
+
+
+def copy_week_schedules(branch, source_week_start, target_week_start, weeks):
+    """
+    주간 스케줄 일괄 복사
+    - 충돌이 하나라도 있으면 아무것도 저장하지 않고 (0, 충돌 메시지 목록) 반환
+    - 충돌이 없으면 한 트랜잭션에서 bulk_create 후 (생성 건수, []) 반환
+    """
+    with sharding.atomic():
+        # 같은 지점에 대한 일괄 등록이 동시에 실행되지 않도록 지점 행을 잠금
+        Branch.objects.select_for_update().get(pk=branch.pk)
+
+        copies = build_week_copies(branch, source_week_start, target_week_start, weeks)
+        if not copies:
+            return 0, ["복사할 원본 주의 스케줄이 없습니다."]
+
+        conflicts = find_schedule_conflicts(copies)
+        if conflicts:
+            return 0, conflicts
+
+        Schedule.objects.bulk_create(copies, batch_size=500)
+    return len(copies), []
@@ -0,0 +1,391 @@
+# booking/sharding.py
+"""
+지점 기준 수평 샤딩 (선택 사항, BRANCH_SHARDS가 비어 있으면 단일 DB)
+
+- 전역 DB(default): 회원, 지점, 지점 배정, 공지, 가격 캠페인, 세션/관리자 등 Django 기본 테이블
+- 샤드 DB: 테마와 테마에 딸린 데이터(예약, 결제, 리뷰, 스케줄, 문제 보고, 가격, 추천, 보관, 이벤트 로그, 슬롯 선점, 가격 변경 이력)
+  지점은 크기가 작으므로 모든 샤드에 복제 (샤드 안에서 테마-지점 JOIN 가능)
+- 지점 -> 샤드: BRANCH_SHARD_MAP에 지정된 값, 없으면 branch_id % 샤드 수
+- 샤드 모델의 PK는 샤드마다 구간을 나눠서 발급 (샤드 i: i * SHARD_ID_SPAN + 1 부터, `init_shards` 명령)
+  -> URL의 theme_id / reservation_id 만으로 샤드를 알 수 있음
+- 요청/작업 단위로 샤드를 지정(use_shard)하면 그 안의 샤드 모델 쿼리는 해당 샤드로 라우팅
+  전체 지점 화면(테마 목록, 전체 통계, 마이페이지)은 gather()로 모든 샤드에 나눠 조회 후 합침
+
+로컬 테스트: DATABASES에 SQLite DB를 여러 개 정의하고 BRANCH_SHARDS에 별칭을 나열한 뒤
+`migrate --database=<별칭>`(각 DB), `init_shards` 실행
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import Http404
+from django.urls import Resolver404, resolve
+
+# 샤드에 저장하는 모델 (booking 앱, 소문자 모델명)
+SHARDED_MODELS = {
+    'theme', 'reservation', 'payment', 'review', 'reviewhelpful', 'schedule', 'issuereport',
+    'pricerule', 'themeprice', 'themerecommendation', 'themereviewsummary',
+    'archivesegment', 'archivedreservation', 'themearchivetotals', 'event', 'eventcursor', 'slothold',
+    'themepricehistory',
+}
+# 전역 DB에 쓰고 모든 샤드에 복제하는 모델
+REPLICATED_MODELS = {'branch'}
+# 샤드에는 테이블만 생성 (초기 마이그레이션의 회원 FK 생성용, 0013 이후 샤드 모델의 회원 FK는 제약 없음)
+SCHEMA_ONLY_MODELS = {'member'}
+
+# URL 인자 -> 샤드 (PK 구간)
+ID_KWARGS = ('theme_id', 'reservation_id', 'review_id', 'schedule_id', 'report_id', 'hold_id')
+STAFF_ROLES = ('ThemeManager', 'BranchManager')
+# 관리자 사이트 목록 / 추가 화면의 샤드 (?shard=별칭으로 선택, 세션에 저장)
+ADMIN_SHARD_PARAM = 'shard'
+ADMIN_SHARD_SESSION_KEY = 'admin_shard'
+
+_local = threading.local()
+
+
+class ShardNotSelected(RuntimeError):
+    """샤드를 지정하지 않고 샤드 모델을 조회한 경우"""
+
+
+class ShardMismatch(RuntimeError):
+    """새 객체의 샤드(소속 지점 / 관련 객체)가 지정된 샤드와 다른 경우 - 다른 샤드에 잘못 저장하지 않도록"""
+
+
+def shards():
+    return list(getattr(settings, 'BRANCH_SHARDS', []))
+
+
+def enabled():
+    return bool(shards())
+
+
+def id_span():
+    return getattr(settings, 'SHARD_ID_SPAN', 100_000_000)
+
+
+def shard_for_branch(branch_id):
+    aliases = shards()
+    explicit = getattr(settings, 'BRANCH_SHARD_MAP', {}).get(int(branch_id))
+    return explicit or aliases[int(branch_id) % len(aliases)]
+
+
+def shard_for_id(pk):
+    """샤드 모델 PK -> 샤드 (구간 밖이면 None)"""
+    aliases = shards()
+    index = int(pk) // id_span()
+    return aliases[index] if 0 <= index < len(aliases) else None
+
+
+def id_floor():
+    """현재 샤드 PK 구간의 시작 직전 값 (샤딩을 쓰지 않으면 0)"""
+    alias = current_shard()
+    return shards().index(alias) * id_span() if alias in shards() else 0
+
+
+def current_shard():
+    return getattr(_local, 'shard', None)
+
+
+def db_alias():
+    """샤드 모델을 읽고 쓸 DB 별칭 (샤딩을 쓰지 않으면 default)"""
+    return current_shard() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_shard(alias):
+    """with 블록 안의 샤드 모델 쿼리를 alias 샤드로 라우팅 (alias가 None이면 변경 없음)"""
+    previous = current_shard()
+    _local.shard = alias or previous
+    try:
+        yield
+    finally:
+        _local.shard = previous
+
+
+def atomic(func=None, **kwargs):
+    """현재 샤드 DB의 transaction.atomic - with 문과 데코레이터 모두 사용 가능"""
+    if func is None:
+        return transaction.atomic(using=db_alias(), **kwargs)
+
+    @wraps(func)
+    def inner(*args, **kw):
+        with transaction.atomic(using=db_alias(), **kwargs):
+            return func(*args, **kw)
+    return inner
+
+
+def on_commit(func, using=None):
+    """
+    using(기본: 현재 샤드) DB 트랜잭션이 커밋된 뒤 실행
+    - 커밋 후 작업도 같은 샤드를 조회하도록 샤드 지정을 유지
+    """
+    alias = using or db_alias()
+    shard = alias if alias in shards() else None
+
+    def run():
+        with use_shard(shard):
+            func()
+    transaction.on_commit(run, using=alias)
+
+
+def local_branch_ids(branch_ids):
+    """현재 샤드에 있는 지점만 (샤딩을 쓰지 않거나 샤드가 지정되지 않았으면 그대로)"""
+    alias = current_shard()
+    if not enabled() or alias is None:
+        return list(branch_ids)
+    return [branch_id for branch_id in branch_ids if shard_for_branch(branch_id) == alias]
+
+
+def join_global(queryset, *fields):
+    """전역 DB 모델(회원) FK - 샤딩 시에는 다른 DB이므로 JOIN 대신 prefetch"""
+    return queryset.prefetch_related(*fields) if enabled() else queryset.select_related(*fields)
+
+
+# ----------------------------------------------------------------------
+# 여러 샤드 조회
+# ----------------------------------------------------------------------
+def each_shard(func, *args, **kwargs):
+    """모든 샤드에서 차례로 실행한 결과 목록 (샤딩을 쓰지 않으면 [func()])"""
+    if not enabled():
+        return [func(*args, **kwargs)]
+    results = []
+    for alias in shards():
+        with use_shard(alias):
+            results.append(func(*args, **kwargs))
+    return results
+
+
+def gather(func, *args, **kwargs):
+    """모든 샤드에서 동시에 실행한 결과 목록 (scatter-gather, 샤드 순서)"""
+    aliases = shards()
+    if len(aliases) <= 1:
+        return each_shard(func, *args, **kwargs)
+
+    def run(alias):
+        try:
+            with use_shard(alias):
+                return func(*args, **kwargs)
+        finally:
+            # 작업 스레드의 DB 연결은 여기서 닫음 (요청 종료 시 정리 대상이 아님)
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=len(aliases), thread_name_prefix='shard') as pool:
+        return list(pool.map(run, aliases))
+
+
+def gather_list(func, *args, **kwargs):
+    """각 샤드 결과(목록)를 이어 붙임"""
+    return [item for result in gather(func, *args, **kwargs) for item in result]
+
+
+def gather_queryset(queryset):
+    """쿼리셋을 모든 샤드에서 실행한 결과 (정렬은 샤드 안에서만 유지됨)"""
+    # 스레드마다 복제본을 실행 (같은 쿼리셋의 결과 캐시를 공유하지 않도록)
+    return gather_list(lambda: list(queryset.all()))
+
+
+def gather_page(func, key, limit, encode, ascending=False):
+    """
+    커서 페이지네이션 결과 (목록, 다음 커서)를 샤드별로 받아 합침
+    - 각 샤드의 상위 limit개 안에 전체 상위 limit개가 모두 있으므로 같은 커서로 이어서 조회 가능
+    """
+    if not enabled():
+        return func()
+    results = gather(func)
+    items = sorted((item for page, _ in results for item in page), key=key, reverse=not ascending)
+    more = len(items) > limit or any(next_cursor for _, next_cursor in results)
+    page = items[:limit]
+    return page, (encode(page[-1]) if more and page else None)
+
+
+# ----------------------------------------------------------------------
+# 라우터
+# ----------------------------------------------------------------------
+def _shard_from_instance(instance):
+    """새로 만드는 객체의 샤드 - 소속 지점 또는 이미 읽어 온 관련 객체의 DB"""
+    for name in ('theme', 'reservation', 'review', 'recommended', 'assigned_theme'):
+        related = instance._state.fields_cache.get(name)
+        if related is not None and related._state.db:
+            return related._state.db
+    branch_id = getattr(instance, 'branch_id', None)
+    if branch_id:
+        return shard_for_branch(branch_id)
+    for name in ('theme_id', 'reservation_id', 'review_id'):
+        pk = getattr(instance, name, None)
+        if pk:
+            return shard_for_id(pk)
+    return None
+
+
+class BranchShardRouter:
+    """BRANCH_SHARDS가 설정된 경우에만 동작 (비어 있으면 모든 판단을 Django 기본값에 맡김)"""
+
+    def _db(self, model, hints):
+        if not enabled() or model._meta.app_label != 'booking':
+            return None
+        name = model._meta.model_name
+        instance = hints.get('instance')
+        if name in SHARDED_MODELS:
+            if instance is not None and not isinstance(instance, model):
+                # 관련 객체 지정(theme.branch = ...) - 관련 객체의 샤드, 정할 수 없으면 저장할 때 다시 결정
+                if instance._state.db in shards():
+                    return instance._state.db
+                if instance._meta.model_name == 'branch' and instance.pk:
+                    return shard_for_branch(instance.pk)
+                return current_shard()
+            if instance is not None and instance._state.adding:
+                # 새 객체는 소속 지점 / 관련 객체의 샤드 - 지정된 샤드와 다르면 잘못 저장하지 않도록 오류
+                alias = _shard_from_instance(instance)
+                if alias is not None:
+                    if current_shard() not in (None, alias):
+                        raise ShardMismatch(
+                            f"{model.__name__}: 객체의 샤드({alias})가 지정된 샤드({current_shard()})와 다릅니다."
+                        )
+                    return alias
+            if instance is not None and instance._state.db in shards():
+                return instance._state.db
+            alias = current_shard()
+            if alias is None:
+                raise ShardNotSelected(
+                    f"{model.__name__}: 샤드가 지정되지 않았습니다. use_shard() 또는 gather() 안에서 조회하세요."
+                )
+            return alias
+        return None
+
+    def db_for_read(self, model, **hints):
+        alias = self._db(model, hints)
+        if alias is None and enabled() and model._meta.app_label == 'booking':
+            # 복제된 지점은 현재 샤드에서 읽고, 나머지 전역 모델은 항상 default
+            if model._meta.model_name in REPLICATED_MODELS and current_shard():
+                return current_shard()
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        alias = self._db(model, hints)
+        if alias is None and enabled() and model._meta.app_label == 'booking':
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if enabled() and obj1._meta.app_label == obj2._meta.app_label == 'booking':
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if not enabled():
+            return None
+        if app_label != 'booking':
+            return db == DEFAULT_DB_ALIAS
+        if model_name is None:
+            return None
+        if model_name in SHARDED_MODELS:
+            return db in shards()
+        if model_name in REPLICATED_MODELS or model_name in SCHEMA_ONLY_MODELS:
+            return True
+        return db == DEFAULT_DB_ALIAS
+
+
+def sync_branches(branch_ids=None):
+    """전역 DB의 지점을 모든 샤드에 복사 (시그널 없이 update / insert)"""
+    from .models import Branch
+
+    branches = Branch.objects.using(DEFAULT_DB_ALIAS).order_by('branch_id')
+    if branch_ids is not None:
+        branches = branches.filter(branch_id__in=branch_ids)
+    branches = list(branches)
+    fields = [f.name for f in Branch._meta.concrete_fields if not f.primary_key]
+    for alias in shards():
+        if alias == DEFAULT_DB_ALIAS:
+            continue
+        existing = set(
+            Branch.objects.using(alias).filter(branch_id__in=[b.branch_id for b in branches])
+            .values_list('branch_id', flat=True)
+        )
+        with transaction.atomic(using=alias):
+            Branch.objects.using(alias).bulk_update([b for b in branches if b.branch_id in existing], fields)
+            Branch.objects.using(alias).bulk_create([b for b in branches if b.branch_id not in existing])
+    return len(branches)
+
+
+# ----------------------------------------------------------------------
+# 요청별 샤드 지정
+# ----------------------------------------------------------------------
+def admin_shard(request):
+    """관리자 사이트에서 선택한 샤드 (기본: 첫 번째 샤드)"""
+    alias = request.session.get(ADMIN_SHARD_SESSION_KEY) if hasattr(request, 'session') else None
+    return alias if alias in shards() else shards()[0]
+
+
+def select_admin_shard(request, alias):
+    if alias in shards():
+        request.session[ADMIN_SHARD_SESSION_KEY] = alias
+
+
+def _admin_shard_for_request(request, match):
+    """
+    관리자 사이트 (한 번에 샤드 하나)
+    - 샤드 모델의 수정 / 삭제 / 이력 화면(booking_<모델>_change 등)은 URL의 object_id(PK 구간)로 샤드를 찾음
+    - 그 밖의 화면(목록, 추가, 자동완성)은 선택한 샤드
+    """
+    app_label, _, rest = (match.url_name or '').partition('_')
+    model_name = rest.rpartition('_')[0]
+    object_id = match.kwargs.get('object_id', '')
+    if app_label == 'booking' and model_name in SHARDED_MODELS and object_id.isdigit():
+        alias = shard_for_id(object_id)
+        if alias is None:
+            raise Http404("존재하지 않는 항목입니다.")
+        return alias
+    return admin_shard(request)
+
+
+def shard_for_request(request, kwargs):
+    for name in ID_KWARGS:
+        if name in kwargs:
+            alias = shard_for_id(kwargs[name])
+            if alias is None:
+                raise Http404("존재하지 않는 항목입니다.")
+            return alias
+    if 'branch_id' in kwargs:
+        return shard_for_branch(kwargs['branch_id'])
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    if user.role in STAFF_ROLES:
+        # 직원 화면은 담당 지점의 샤드 (한 직원의 담당 지점은 같은 샤드에 배치)
+        from .models import BranchAssignment
+        branch_id = BranchAssignment.objects.filter(member=user).values_list('branch_id', flat=True).first()
+        if branch_id:
+            return shard_for_branch(branch_id)
+    elif user.role == 'Admin':
+        # 총괄 관리자의 지점 화면은 ?branch= 로 지정한 지점의 샤드 (기본: 첫 번째 샤드)
+        branch_id = request.GET.get('branch', '')
+        return shard_for_branch(branch_id) if branch_id.isdigit() else shards()[0]
+    return None
+
+
+class ShardMiddleware:
+    """
+    URL 인자(theme_id 등)나 직원의 담당 지점으로 요청의 샤드를 지정 (AuthenticationMiddleware 다음)
+    관리자 사이트는 object_id 또는 관리자가 선택한 샤드 (_admin_shard_for_request)
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not enabled():
+            return self.get_response(request)
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            match = None
+        if match is not None and match.namespace == 'admin':
+            alias = _admin_shard_for_request(request, match)
+        else:
+            alias = shard_for_request(request, match.kwargs if match is not None else {})
+        with use_shard(alias):
+            return self.get_response(request)
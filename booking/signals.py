@@ -0,0 +1,254 @@
+# booking/signals.py
+"""모델 변경 시 파생 데이터(가격 캘린더, 필터 개수, API 버전 스탬프, 이벤트 로그 등)를 갱신하는 시그널 핸들러"""
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .facets import invalidate_facets
+from .models import Branch, Theme, PriceRule, Reservation, Payment, Review, Notice, BranchAssignment, ThemePriceHistory
+from .pricing import build_price_calendar
+from .reviews import refresh_rating_summary
+from .stamps import bump
+from .timeline import invalidate_member_counters
+from . import events, object_cache, sharding, typeahead
+
+
+@receiver(post_save, sender=Theme)
+def rebuild_theme_price_calendar(sender, instance, created=False, raw=False, using=None, **kwargs):
+    """테마 가격/할인율이 바뀌면 해당 테마의 가격 캘린더만 다시 계산 (새 테마, 활성 상태 변경 포함)"""
+    if raw:
+        return
+    if not created and not {'price', 'discount_rate', 'is_active'} & instance.tracked_changes().keys():
+        return
+    theme_id = instance.theme_id
+    sharding.on_commit(lambda: build_price_calendar(theme_ids=[theme_id]), using=using)
+
+
+@receiver(post_save, sender=Theme)
+def record_theme_price_history(sender, instance, created, raw=False, using=None, **kwargs):
+    """기본 가격 / 할인율을 직접 수정한 경우 변경 이력 (캠페인 적용 / 종료는 booking/campaigns.py에서 기록)"""
+    if raw:
+        return
+    changes = instance.tracked_changes()
+    if not created and 'price' not in changes and 'discount_rate' not in changes:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    # 테마와 같은 DB(샤드)에 기록
+    ThemePriceHistory.objects.using(using).create(
+        theme=instance, reason='manual', campaign_id=instance.campaign_id,
+        previous_price=loaded.get('price'), previous_discount_rate=loaded.get('discount_rate'),
+        price=instance.price, discount_rate=instance.discount_rate,
+    )
+
+
+@receiver(pre_save, sender=PriceRule)
+def remember_rule_target(sender, instance, raw=False, using=None, **kwargs):
+    """규칙의 대상(테마 / 지점)을 바꾸는 경우 이전 대상도 다시 계산하도록 저장 전 값을 보관"""
+    if raw or instance._state.adding:
+        return
+    instance._previous_target = PriceRule.objects.using(using).filter(pk=instance.pk).values_list(
+        'theme_id', 'branch_id',
+    ).first()
+
+
+def _rule_theme_ids(theme_id, branch_id, using=None):
+    """규칙이 적용되는 테마 ID 목록 (지점/테마 지정이 없는 전체 규칙이면 None)"""
+    if theme_id:
+        return [theme_id]
+    if branch_id:
+        return list(Theme.objects.using(using).filter(branch_id=branch_id).values_list('theme_id', flat=True))
+    return None
+
+
+@receiver(post_save, sender=PriceRule)
+@receiver(post_delete, sender=PriceRule)
+def rebuild_rule_price_calendar(sender, instance, raw=False, using=None, **kwargs):
+    """가격 규칙이 바뀌면 규칙이 적용되는(적용되던) 테마들의 가격 캘린더를 다시 계산"""
+    if raw:
+        return
+    targets = {(instance.theme_id, instance.branch_id)}
+    previous = getattr(instance, '_previous_target', None)
+    if previous is not None:
+        targets.add(previous)
+        instance._previous_target = None
+    theme_ids = set()
+    for theme_id, branch_id in targets:
+        ids = _rule_theme_ids(theme_id, branch_id, using)
+        if ids is None:
+            theme_ids = None
+            break
+        theme_ids.update(ids)
+    theme_ids = sorted(theme_ids) if theme_ids is not None else None
+    sharding.on_commit(lambda: build_price_calendar(theme_ids=theme_ids), using=using)
+
+
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+def invalidate_theme_facets(sender, using=None, **kwargs):
+    """테마 목록 필터 개수 캐시 무효화"""
+    sharding.on_commit(invalidate_facets, using=using)
+
+
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+def refresh_theme_typeahead(sender, instance, using=None, **kwargs):
+    """자동완성 인덱스에서 해당 테마만 갱신"""
+    theme_id = instance.theme_id
+    sharding.on_commit(lambda: typeahead.theme_changed(theme_id), using=using)
+
+
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+def refresh_branch_typeahead(sender, using=None, **kwargs):
+    """지점명은 테마 항목에도 표시되므로 자동완성 인덱스 전체를 다시 생성"""
+    sharding.on_commit(typeahead.branch_changed, using=using)
+
+
+@receiver(post_save, sender=Branch)
+def replicate_branch(sender, instance, raw=False, using=None, **kwargs):
+    """샤딩 시 지점 변경을 모든 샤드에 복제 (booking/sharding.py)"""
+    if raw or not sharding.enabled() or using != DEFAULT_DB_ALIAS:
+        return
+    branch_id = instance.branch_id
+    sharding.on_commit(lambda: sharding.sync_branches([branch_id]), using=using)
+
+
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+def bump_theme_stamp(sender, instance, raw=False, using=None, **kwargs):
+    """API 테마 목록/상세의 ETag 갱신"""
+    if raw:
+        return
+    theme_id = instance.theme_id
+    sharding.on_commit(lambda: bump('themes', f'theme:{theme_id}'), using=using)
+
+
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+def bump_branch_stamp(sender, raw=False, using=None, **kwargs):
+    """지점명은 테마 응답에도 포함되므로 테마 목록 스탬프도 함께 갱신"""
+    if raw:
+        return
+    sharding.on_commit(lambda: bump('branches', 'themes'), using=using)
+
+
+@receiver(post_save, sender=Theme)
+@receiver(post_delete, sender=Theme)
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+def invalidate_local_theme_cache(sender, instance, raw=False, using=None, **kwargs):
+    """테마 객체 캐시의 프로세스 내 L1 삭제 (공유 캐시는 위에서 올린 스탬프로 무효화)"""
+    if raw:
+        return
+    theme_ids = [instance.theme_id] if sender is Theme else None
+    sharding.on_commit(lambda: object_cache.invalidate_local(theme_ids), using=using)
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def bump_slot_stamp(sender, instance, raw=False, using=None, **kwargs):
+    """예약 생성/상태 변경 시 해당 테마의 슬롯 예약 가능 여부 ETag 갱신"""
+    if raw:
+        return
+    theme_id = instance.theme_id
+    sharding.on_commit(lambda: bump(f'theme:{theme_id}:slots'), using=using)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def bump_review_stamp(sender, instance, raw=False, using=None, **kwargs):
+    """리뷰 변경 시 해당 테마의 리뷰 목록/요약과 테마 목록(평점) 스탬프 갱신"""
+    if raw:
+        return
+    theme_id = instance.theme_id
+    names = ['reviews'] + ([f'theme:{theme_id}:reviews'] if theme_id is not None else [])
+    sharding.on_commit(lambda: bump(*names), using=using)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_theme_review_summary(sender, instance, raw=False, using=None, **kwargs):
+    """테마 상세의 리뷰 수 / 별점 분포를 같은 트랜잭션에서 갱신"""
+    if raw or instance.theme_id is None:
+        return
+    refresh_rating_summary(instance.theme_id)
+
+
+@receiver(post_save, sender=Notice)
+@receiver(post_delete, sender=Notice)
+@receiver(post_save, sender=BranchAssignment)
+@receiver(post_delete, sender=BranchAssignment)
+def bump_notice_stamp(sender, raw=False, using=None, **kwargs):
+    """공지사항 페이지 캐시 / 안 읽은 공지 수 무효화 (지점 배정이 바뀌면 직원이 볼 수 있는 공지도 바뀜)"""
+    if raw:
+        return
+    sharding.on_commit(lambda: bump('notices'), using=using)
+
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def invalidate_reservation_member_counters(sender, instance, raw=False, using=None, **kwargs):
+    """마이페이지 상단 요약(방문/탈출/리뷰 대기) 캐시 삭제"""
+    if raw or not instance.member_id:
+        return
+    member_id = instance.member_id
+    sharding.on_commit(lambda: invalidate_member_counters([member_id]), using=using)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review_member_counters(sender, instance, raw=False, using=None, **kwargs):
+    """리뷰 작성/삭제 시 리뷰 작성 대기 수가 바뀜"""
+    if raw:
+        return
+    member_ids = [instance.member_id] + list(
+        Reservation.objects.filter(pk=instance.reservation_id).values_list('member_id', flat=True)
+    )
+    sharding.on_commit(lambda: invalidate_member_counters(member_ids), using=using)
+
+
+# ---- 이벤트 로그 (booking/events.py) - 원본 변경과 같은 트랜잭션에서 기록 ----
+@receiver(post_save, sender=Reservation)
+def log_reservation_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    events.record_save('reservation', instance, created, theme_id=instance.theme_id, member_id=instance.member_id)
+
+
+@receiver(post_save, sender=Payment)
+def log_payment_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    if created:
+        events.record('payment', 'created', instance.pk, payment_status=instance.payment_status,
+                      amount=instance.amount, reservation_id=instance.reservation_id)
+    else:
+        events.record_save('payment', instance, created, reservation_id=instance.reservation_id)
+
+
+@receiver(post_save, sender=Review)
+def log_review_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    events.record_save('review', instance, created, theme_id=instance.theme_id, member_id=instance.member_id)
+
+
+@receiver(post_save, sender=Theme)
+def log_theme_saved(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    events.record_save('theme', instance, created, theme_id=instance.theme_id)
+
+
+@receiver(post_delete, sender=Reservation)
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Theme)
+def log_deleted(sender, instance, using=None, **kwargs):
+    events.record(
+        sender._meta.model_name, events.delete_action(), instance.pk,
+        theme_id=getattr(instance, 'theme_id', None), member_id=getattr(instance, 'member_id', None),
+        **{f: getattr(instance, f) for f in instance.tracked_fields},
+    )
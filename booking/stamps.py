@@ -0,0 +1,43 @@
+# booking/stamps.py
+"""
+리소스별 버전 스탬프 (마지막 변경 시각, ms)
+
+모델이 바뀔 때 시그널에서 bump()로 스탬프를 올리고, API는 스탬프만 읽어서
+ETag / Last-Modified를 만들기 때문에 변경이 없으면 본 쿼리 없이 304를 응답할 수 있습니다.
+"""
+import time
+
+from django.core.cache import cache
+
+KEY = 'stamp:{}'
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def get_stamps(*names):
+    """{이름: 스탬프} - 스탬프가 없으면(캐시 초기화 등) 현재 시각으로 초기화"""
+    keys = {KEY.format(name): name for name in names}
+    values = cache.get_many(keys)
+    missing = [key for key in keys if key not in values]
+    if missing:
+        now = _now_ms()
+        for key in missing:
+            cache.add(key, now, None)
+        values.update(cache.get_many(missing))
+    return {keys[key]: values.get(key, 0) for key in keys}
+
+
+def latest_stamp(*names):
+    return max(get_stamps(*names).values())
+
+
+def bump(*names):
+    """스탬프를 현재 시각(이전 값보다 항상 크게)으로 올림"""
+    if not names:
+        return
+    keys = [KEY.format(name) for name in names]
+    current = cache.get_many(keys)
+    now = _now_ms()
+    cache.set_many({key: max(now, current.get(key, 0) + 1) for key in keys}, None)
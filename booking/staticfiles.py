@@ -0,0 +1,124 @@
+# booking/staticfiles.py
+"""
+운영용 정적 파일 빌드 / 서빙
+
+- collectstatic 시 파일명에 내용 해시를 붙이고 (ManifestStaticFilesStorage),
+  텍스트 파일은 .gz / .zst 압축본을 미리 만들어 둠
+- 해시가 붙은 파일은 내용이 바뀌지 않으므로 1년 immutable 캐시 -> 재방문 시 다운로드 없음
+- STATIC_SERVE_IN_APP = True 이면 앱에서 직접 서빙 (Accept-Encoding에 맞는 압축본을 FileResponse로 전송,
+  WSGI 서버가 wsgi.file_wrapper를 지원하면 sendfile로 복사 없이 전송)
+"""
+import gzip
+import mimetypes
+import os
+
+import zstandard
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# (확장자, Content-Encoding, Accept-Encoding 토큰) - 우선순위 순
+ENCODINGS = [('.zst', 'zstd', 'zstd'), ('.gz', 'gzip', 'gzip')]
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def _compressible(name):
+    extensions = getattr(settings, 'STATIC_COMPRESS_EXTENSIONS', ['.css', '.js', '.svg', '.json', '.map', '.txt'])
+    return os.path.splitext(name)[1].lower() in extensions
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """해시 파일명 + gzip / zstd 압축본 생성"""
+
+    # 매니페스트에 없는 파일(collectstatic 이후 추가)은 STATIC_ROOT의 파일로 해시 계산
+    manifest_strict = False
+
+    def stored_name(self, name):
+        # collectstatic 전이라 파일도 없으면 500 대신 해시 없는 이름 (check --deploy의 booking.W002로 확인)
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if _compressible(name) and self.exists(name):
+                self._write_compressed(name)
+
+    def _write_compressed(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < getattr(settings, 'STATIC_COMPRESS_MIN_SIZE', 256):
+            return
+        variants = {
+            # mtime=0: 같은 입력이면 항상 같은 결과 (빌드 재현성)
+            '.gz': gzip.compress(data, compresslevel=9, mtime=0),
+            '.zst': zstandard.ZstdCompressor(level=19).compress(data),
+        }
+        for suffix, compressed in variants.items():
+            # 압축 효과가 없으면 만들지 않음 (서빙 시 원본 사용)
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+
+
+def _accepted_encodings(request):
+    """Accept-Encoding 헤더에서 허용된(q > 0) 인코딩 목록"""
+    accepted = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        token, _, params = item.strip().lower().partition(';')
+        q = params.strip()
+        if token and not (q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000')):
+            accepted.add(token.strip())
+    return accepted
+
+
+# 매니페스트의 해시 파일명 목록 (배포 시 프로세스가 재시작되므로 한 번만 읽음)
+_hashed_names = {}
+
+
+def _is_hashed(path):
+    if 'names' not in _hashed_names:
+        _hashed_names['names'] = set((getattr(staticfiles_storage, 'hashed_files', None) or {}).values())
+    return path in _hashed_names['names']
+
+
+def serve_static(request, path):
+    """STATIC_ROOT의 파일을 압축본 우선으로 서빙"""
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404("잘못된 경로입니다.")
+    if not os.path.isfile(fullpath):
+        raise Http404("파일이 없습니다.")
+
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    accepted = _accepted_encodings(request)
+    serve_path, encoding = fullpath, None
+    for suffix, content_encoding, token in ENCODINGS:
+        if token in accepted and os.path.isfile(fullpath + suffix):
+            serve_path, encoding = fullpath + suffix, content_encoding
+            break
+
+    response = FileResponse(open(serve_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if _is_hashed(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -0,0 +1,211 @@
+# booking/template_profiler.py
+"""
+템플릿 렌더링 프로파일러 (opt-in)
+
+- 템플릿 / include / block 별 렌더링 시간 (하위 템플릿 시간 포함)
+- 렌더링 중 실행된 쿼리를 템플릿 파일:줄 번호 단위로 집계
+  (예: {% for r in reservations %} 안의 {{ r.theme.name }} 처럼 지연 로딩으로 반복 실행되는 쿼리)
+- 뷰(ORM) 시간과 템플릿 시간을 나눠서 Server-Timing 헤더와 로그로 출력
+
+사용: TEMPLATE_PROFILER_ENABLED = True 설정 후, 관리자 계정(또는 DEBUG)에서 URL에 ?_profile 추가
+"""
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.base import Node, Template
+from django.template.loader_tags import BlockNode
+from django.template.utils import get_app_template_dirs
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_installed = []
+
+
+class RenderProfile:
+    """한 요청(또는 한 번의 측정) 동안의 렌더링 / 쿼리 기록"""
+
+    def __init__(self):
+        self.timings = {}   # (종류, 이름) -> [횟수, 누적 시간]
+        self.queries = {}   # (템플릿, 줄) -> [횟수, 누적 시간, 예시 SQL]
+        self.location = []  # 렌더링 중인 (템플릿, 줄) 스택
+        self.depth = 0
+        self.render_time = 0.0
+        self.render_query_time = 0.0
+        self.query_count = 0
+        self.query_time = 0.0
+
+    def add_timing(self, kind, name, elapsed):
+        entry = self.timings.setdefault((kind, name), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def add_query(self, sql, elapsed):
+        location = self.location[-1] if self.location else ('(view)', 0)
+        entry = self.queries.setdefault(location, [0, 0.0, sql])
+        entry[0] += 1
+        entry[1] += elapsed
+        self.query_count += 1
+        self.query_time += elapsed
+        if self.depth:
+            self.render_query_time += elapsed
+
+    def report(self, limit=15):
+        lines = [
+            f"템플릿 렌더링 {self.render_time * 1000:.1f}ms "
+            f"(그중 쿼리 {self.render_query_time * 1000:.1f}ms), "
+            f"전체 쿼리 {self.query_count}개 {self.query_time * 1000:.1f}ms",
+            "-- 템플릿/블록 (하위 포함 시간)",
+        ]
+        for (kind, name), (count, total) in sorted(self.timings.items(), key=lambda i: -i[1][1])[:limit]:
+            lines.append(f"  {total * 1000:8.1f}ms  x{count:<4} {kind:8} {name}")
+        lines.append("-- 쿼리 발생 위치")
+        for (template, line), (count, total, sql) in sorted(self.queries.items(), key=lambda i: -i[1][0])[:limit]:
+            where = template if not line else f"{template}:{line}"
+            lines.append(f"  {count:4}회 {total * 1000:8.1f}ms  {where}  {sql[:80]}")
+        return '\n'.join(lines)
+
+
+def _current():
+    return getattr(_local, 'profile', None)
+
+
+def install():
+    """Template / BlockNode / Node 렌더링 함수에 측정 코드 연결 (프로파일 중이 아니면 원래 함수만 호출)"""
+    if _installed:
+        return
+    _installed.append(True)
+
+    original_render = Template._render
+    original_block = BlockNode.render
+    original_annotated = Node.render_annotated
+
+    def _render(self, context):
+        profile = _current()
+        if profile is None:
+            return original_render(self, context)
+        started = time.perf_counter()
+        profile.depth += 1
+        try:
+            return original_render(self, context)
+        finally:
+            profile.depth -= 1
+            elapsed = time.perf_counter() - started
+            name = self.origin.template_name if self.origin and self.origin.template_name else (self.name or '<string>')
+            profile.add_timing('template', name, elapsed)
+            if not profile.depth:
+                profile.render_time += elapsed
+
+    def block_render(self, context):
+        profile = _current()
+        if profile is None:
+            return original_block(self, context)
+        started = time.perf_counter()
+        try:
+            return original_block(self, context)
+        finally:
+            template = self.origin.template_name if getattr(self, 'origin', None) else '?'
+            profile.add_timing('block', f"{template} {{% block {self.name} %}}", time.perf_counter() - started)
+
+    def render_annotated(self, context):
+        profile = _current()
+        if profile is None:
+            return original_annotated(self, context)
+        origin, token = getattr(self, 'origin', None), getattr(self, 'token', None)
+        profile.location.append((
+            origin.template_name if origin else '?',
+            token.lineno if token else 0,
+        ))
+        try:
+            return original_annotated(self, context)
+        finally:
+            profile.location.pop()
+
+    Template._render = _render
+    BlockNode.render = block_render
+    Node.render_annotated = render_annotated
+
+
+@contextmanager
+def profile_render():
+    """with 블록 안의 템플릿 렌더링 / 쿼리를 기록"""
+    install()
+    profile = RenderProfile()
+
+    def query_wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            profile.add_query(sql, time.perf_counter() - started)
+
+    previous = _current()
+    _local.profile = profile
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_wrapper))
+            yield profile
+    finally:
+        _local.profile = previous
+
+
+class TemplateProfilerMiddleware:
+    """?_profile 요청에 대해 렌더링 프로파일을 Server-Timing 헤더와 로그로 출력"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TEMPLATE_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install()
+
+    def __call__(self, request):
+        param = getattr(settings, 'TEMPLATE_PROFILER_PARAM', '_profile')
+        user = getattr(request, 'user', None)
+        if param not in request.GET or not (settings.DEBUG or (user and user.is_staff)):
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with profile_render() as profile:
+            response = self.get_response(request)
+            if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                response.render()
+        total = time.perf_counter() - started
+
+        view_time = total - profile.render_time
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={total * 1000:.1f}',
+            f'view;desc="view+orm";dur={view_time * 1000:.1f}',
+            f'template;dur={profile.render_time * 1000:.1f}',
+            f'db;desc="{profile.query_count} queries";dur={profile.query_time * 1000:.1f}',
+        ])
+        logger.info("Template profile %s %s (%.1fms)\n%s", request.method, request.path, total * 1000, profile.report())
+        return response
+
+
+def precompile_templates():
+    """
+    운영 환경 시작 시 모든 템플릿을 미리 컴파일하여 cached loader에 적재
+    (첫 요청에서 템플릿 파싱 비용이 들지 않도록). 컴파일한 템플릿 수를 반환
+    """
+    engine = engines['django'].engine
+    dirs = list(engine.dirs)
+    if engine.app_dirs or any('app_directories' in str(loader) for loader in engine.loaders):
+        dirs.extend(get_app_template_dirs('templates'))
+
+    count = 0
+    for directory in map(Path, dirs):
+        for path in sorted(directory.rglob('*.html')):
+            try:
+                engine.get_template(path.relative_to(directory).as_posix())
+                count += 1
+            except TemplateSyntaxError as e:
+                logger.warning("Failed to precompile template %s: %s", path, e)
+    return count
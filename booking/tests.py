@@ -1,3 +1,1156 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from decimal import Decimal
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import admission, events, facets, forecast, holds, metrics, notices, object_cache, reviews, sharding, timeline, typeahead
+from .archive import archive_reservations, restore_reservations
+from .campaigns import end_campaign, run_price_campaigns, start_campaign
+from .group_booking import GroupBookingError, book_group
+from .models import (
+    Branch, BranchAssignment, Theme, Member, Notice, Reservation, Payment, PriceRule, Review, ReviewHelpful, Schedule,
+    SlotHold, ThemePrice, ArchiveSegment, ArchivedReservation, ThemeArchiveTotals, Event, EventCursor,
+    PriceCampaign, ThemePriceHistory,
+)
+from .pricing import build_price_calendar, lowest_upcoming_price, price_for_slot
+from .scheduling import copy_week_schedules, find_schedule_conflicts
+from .stamps import bump
+from .sweeper import sweep_stale_reservations
+
+
+def _slot(days=1, hour=14):
+    """정각 단위 예약 시각 (내일 14시 등)"""
+    today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today + timedelta(days=days, hours=hour)
+
+
+def _use_temp_archive_root(testcase):
+    """보관 세그먼트를 임시 디렉터리에 쓰도록 설정 (테스트 종료 시 삭제)"""
+    root = tempfile.mkdtemp()
+    testcase.addCleanup(shutil.rmtree, root, ignore_errors=True)
+    override = override_settings(ARCHIVE_ROOT=root)
+    override.enable()
+    testcase.addCleanup(override.disable)
+    return root
+
+
+class BookingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Branch.objects.create(branch_name='강남점', location='서울', phone='1')
+        cls.themes = [
+            Theme.objects.create(
+                branch=cls.branch, name=f'테마{i}', genre='공포', difficulty=3, duration=60,
+                price=20000, description='d',
+            )
+            for i in range(3)
+        ]
+        cls.alice = Member.objects.create_user('alice', '고객1', '1001', password='pw')
+        cls.bob = Member.objects.create_user('bob', '고객2', '1002', password='pw')
+
+    def setUp(self):
+        cache.clear()
+
+
+class SweeperTests(BookingTestCase):
+    """지난 예약 자동 정리 (booking/sweeper.py) - 유예 시간 30분, 테마 소요 시간 60분"""
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+
+    def _reserve(self, minutes_ago, status, theme=None):
+        return Reservation.objects.create(
+            member=self.alice, theme=theme or self.themes[0], num_of_participants=2, total_price=40000,
+            reservation_time=self.now - timedelta(minutes=minutes_ago), status=status,
+        )
+
+    def assertStatus(self, reservation, status):
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.status, status)
+
+    def test_status_transitions(self):
+        no_show = self._reserve(40, 'Confirmed')
+        in_grace = self._reserve(10, 'Confirmed')
+        completed = self._reserve(100, 'CheckedIn')
+        playing = self._reserve(80, 'CheckedIn')
+        cancelled = self._reserve(200, 'Cancelled')
+
+        result = sweep_stale_reservations(now=self.now)
+        self.assertEqual((result['no_show'], result['completed']), (1, 1))
+        self.assertStatus(no_show, 'NoShow')
+        self.assertStatus(in_grace, 'Confirmed')
+        self.assertStatus(completed, 'Completed')
+        self.assertStatus(playing, 'CheckedIn')
+        self.assertStatus(cancelled, 'Cancelled')
+
+    def test_branch_policy(self):
+        self.branch.noshow_grace_minutes = 60
+        self.branch.save()
+        waiting = self._reserve(40, 'Confirmed')
+        other = Branch.objects.create(branch_name='홍대점', location='서울', phone='2', auto_sweep=False)
+        theme = Theme.objects.create(branch=other, name='t', genre='g', difficulty=1, duration=60,
+                                     price=10000, description='d')
+        skipped = self._reserve(300, 'Confirmed', theme=theme)
+
+        self.assertEqual(sweep_stale_reservations(now=self.now)['no_show'], 0)
+        self.assertStatus(waiting, 'Confirmed')
+        self.assertStatus(skipped, 'Confirmed')
+
+    def test_batches_and_rerun(self):
+        stale = [self._reserve(60 + i, 'Confirmed') for i in range(5)]
+        self.assertEqual(sweep_stale_reservations(now=self.now, batch_size=2)['no_show'], 5)
+        self.assertEqual(sweep_stale_reservations(now=self.now, batch_size=2)['no_show'], 0)
+        for reservation in stale:
+            self.assertStatus(reservation, 'NoShow')
+
+
+class ScheduleConflictTests(BookingTestCase):
+    """직원 스케줄 충돌 검사 / 주간 일괄 복사 (booking/scheduling.py)"""
+
+    MONDAY = date(2030, 1, 7)
+
+    def _shift(self, member, day, start, end, theme=None, save=False):
+        schedule = Schedule(member=member, branch=self.branch, work_date=self.MONDAY + timedelta(days=day),
+                            start_time=dtime(start), end_time=dtime(end), assigned_theme=theme)
+        if save:
+            schedule.save()
+        return schedule
+
+    def test_member_overlap(self):
+        self._shift(self.alice, 0, 9, 13, save=True)
+        self.assertEqual(len(find_schedule_conflicts([self._shift(self.alice, 0, 12, 18)])), 1)
+        self.assertEqual(find_schedule_conflicts([self._shift(self.alice, 0, 13, 18)]), [])  # 이어지는 근무
+        self.assertEqual(find_schedule_conflicts([self._shift(self.bob, 0, 12, 18)]), [])
+
+    def test_theme_overlap(self):
+        theme = self.themes[0]
+        self._shift(self.alice, 0, 9, 13, theme=theme, save=True)
+        conflicts = find_schedule_conflicts([self._shift(self.bob, 0, 10, 11, theme=theme)])
+        self.assertEqual(len(conflicts), 1)
+        self.assertIn(theme.name, conflicts[0])
+
+    def test_overnight_shift(self):
+        self._shift(self.alice, 0, 22, 2, save=True)
+        self.assertEqual(len(find_schedule_conflicts([self._shift(self.alice, 1, 1, 5)])), 1)
+        self.assertEqual(find_schedule_conflicts([self._shift(self.alice, 1, 2, 5)]), [])
+
+    def test_conflicts_within_new_schedules(self):
+        conflicts = find_schedule_conflicts([self._shift(self.alice, 2, 9, 12), self._shift(self.alice, 2, 11, 15)])
+        self.assertEqual(len(conflicts), 1)
+
+    def test_exclude_edited_schedule(self):
+        existing = self._shift(self.alice, 0, 9, 13, save=True)
+        existing.end_time = dtime(15)
+        self.assertEqual(find_schedule_conflicts([existing], exclude_ids=[existing.pk]), [])
+
+    def test_copy_week(self):
+        self._shift(self.alice, 0, 9, 13, save=True)
+        self._shift(self.bob, 3, 14, 20, theme=self.themes[1], save=True)
+        created, conflicts = copy_week_schedules(self.branch, self.MONDAY, self.MONDAY + timedelta(weeks=1), 3)
+        self.assertEqual((created, conflicts), (6, []))
+        self.assertEqual(Schedule.objects.filter(member=self.bob, assigned_theme=self.themes[1]).count(), 4)
+        self.assertEqual(
+            sorted(Schedule.objects.filter(member=self.alice).values_list('work_date', flat=True)),
+            [self.MONDAY + timedelta(weeks=week) for week in range(4)],
+        )
+
+    def test_copy_week_with_conflict_saves_nothing(self):
+        self._shift(self.alice, 0, 9, 13, save=True)
+        self._shift(self.alice, 14, 12, 16, save=True)  # 2주 뒤 월요일 복사본과 겹침
+        created, conflicts = copy_week_schedules(self.branch, self.MONDAY, self.MONDAY + timedelta(weeks=1), 3)
+        self.assertEqual(created, 0)
+        self.assertEqual(len(conflicts), 1)
+        self.assertEqual(Schedule.objects.count(), 2)
+
+    def test_copy_empty_week(self):
+        created, conflicts = copy_week_schedules(self.branch, self.MONDAY, self.MONDAY + timedelta(weeks=1), 1)
+        self.assertEqual(created, 0)
+        self.assertEqual(len(conflicts), 1)
+
+
+@override_settings(TIME_ZONE='Asia/Seoul')
+class ForecastTests(BookingTestCase):
+    """수요 예측 이력 집계 (booking/forecast.py) - 현지 시각 기준 (테마 x 일 x 시간)"""
+
+    MONDAY = date(2030, 1, 7)
+
+    def _reserve(self, theme, day, hour, minute=30, status='Confirmed'):
+        when = datetime.combine(self.MONDAY + timedelta(days=day), dtime(hour, minute), tzinfo=ZoneInfo('Asia/Seoul'))
+        Reservation.objects.create(member=self.alice, theme=theme, reservation_time=when,
+                                   num_of_participants=2, total_price=40000, status=status)
+
+    def test_history_counts_by_local_day_and_hour(self):
+        first, second = self.themes[0], self.themes[1]
+        self._reserve(first, 1, 19)
+        self._reserve(first, 1, 19, minute=0)
+        self._reserve(first, 0, 0)  # UTC로는 전날
+        self._reserve(first, 2, 10, status='Cancelled')
+        self._reserve(second, 13, 23)
+
+        counts = forecast._history_tensor([first.pk, second.pk], self.MONDAY, 2)
+        self.assertEqual(counts.shape, (2, 14, 24))
+        self.assertEqual(counts[0, 1, 19], 2)
+        self.assertEqual(counts[0, 0, 0], 1)
+        self.assertEqual(counts[0].sum(), 3)
+        self.assertEqual(counts[1, 13, 23], 1)
+        self.assertEqual(counts[1].sum(), 1)
+
+    def test_build_forecasts(self):
+        for week in range(4):
+            self._reserve(self.themes[0], 7 * week + 5, 20)
+        results = forecast.build_forecasts(today=self.MONDAY + timedelta(weeks=4))
+        themes = {t['theme_id']: t for t in results[self.branch.pk]['themes']}
+        self.assertEqual((themes[self.themes[0].pk]['peak_weekday'], themes[self.themes[0].pk]['peak_hour']), ('토', 20))
+        self.assertIsNone(themes[self.themes[1].pk]['peak_hour'])
+
+
+@override_settings(PRICE_CALENDAR_DAYS=2)
+class PriceCalendarTests(BookingTestCase):
+    """테마 가격 캘린더 / 가격대 필터 (booking/pricing.py, booking/signals.py)"""
+
+    def _theme(self, index):
+        return Theme.objects.get(pk=self.themes[index].pk)
+
+    def test_build_applies_discount_and_rules(self):
+        theme = self._theme(0)
+        theme.discount_rate = Decimal(10)
+        theme.save()
+        PriceRule.objects.create(name='야간', theme=theme, start_hour=20, end_hour=24, adjust_rate=50)
+
+        self.assertEqual(build_price_calendar(theme_ids=[theme.pk]), 2 * 14)
+        self.assertEqual(price_for_slot(theme, _slot(hour=10)), 18000)
+        self.assertEqual(price_for_slot(theme, _slot(hour=21)), 27000)
+        # 캘린더 밖의 시간대는 할인 적용 기본 가격
+        self.assertEqual(price_for_slot(theme, _slot(hour=3)), theme.final_price)
+
+    def test_rebuild_replaces_previous_prices(self):
+        theme = self._theme(0)
+        build_price_calendar(theme_ids=[theme.pk])
+        Theme.objects.filter(pk=theme.pk).update(price=30000)
+        build_price_calendar(theme_ids=[theme.pk])
+        self.assertEqual(ThemePrice.objects.filter(theme=theme).count(), 2 * 14)
+        self.assertEqual(set(ThemePrice.objects.filter(theme=theme).values_list('price', flat=True)), {30000})
+
+    @mock.patch('booking.signals.build_price_calendar')
+    def test_theme_save_rebuilds_only_on_price_change(self, build):
+        theme = self._theme(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            theme.description = '설명 수정'
+            theme.status = 'Maintenance'
+            theme.save()
+        build.assert_not_called()
+        with self.captureOnCommitCallbacks(execute=True):
+            theme.discount_rate = Decimal(5)
+            theme.save()
+        build.assert_called_once_with(theme_ids=[theme.pk])
+
+    @mock.patch('booking.signals.build_price_calendar')
+    def test_rule_retarget_rebuilds_both_targets(self, build):
+        with self.captureOnCommitCallbacks(execute=True):
+            rule = PriceRule.objects.create(name='주말', theme=self.themes[0], adjust_rate=20)
+        build.assert_called_with(theme_ids=[self.themes[0].pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            rule.theme = self.themes[1]
+            rule.save()
+        build.assert_called_with(theme_ids=sorted([self.themes[0].pk, self.themes[1].pk]))
+
+    def test_max_price_filter(self):
+        cheap = self._theme(0)
+        PriceRule.objects.create(name='오전 할인', theme=cheap, start_hour=10, end_hour=12, adjust_rate=-50)
+        build_price_calendar(theme_ids=[cheap.pk])
+        # 캘린더가 없는 테마는 할인 적용 기본 가격으로 비교
+        discounted = self._theme(1)
+        Theme.objects.filter(pk=discounted.pk).update(discount_rate=20)
+
+        matching = Theme.objects.annotate(lowest_price=lowest_upcoming_price()).filter(lowest_price__lte=16000)
+        self.assertEqual(set(matching.values_list('pk', flat=True)), {cheap.pk, discounted.pk})
+
+        response = self.client.get('/themes/', {'max_price': 10000})
+        self.assertEqual([t.pk for t in response.context['themes']], [cheap.pk])
+
+
+class FacetCountTests(BookingTestCase):
+    """테마 목록 필터별 개수 (booking/facets.py)"""
+
+    def setUp(self):
+        super().setUp()
+        facets._local_index.update(version=None, index=None)
+        Theme.objects.filter(pk=self.themes[1].pk).update(genre='SF', difficulty=5)
+        Theme.objects.filter(pk=self.themes[2].pk).update(discount_rate=50)
+        self.other = Branch.objects.create(branch_name='홍대점', location='서울', phone='2')
+
+    def _counts(self, result, name, key):
+        return {item[key]: item['count'] for item in result[name]}
+
+    def test_counts_exclude_own_filter(self):
+        result = facets.facet_counts(genre='공포')
+        # 장르 개수는 장르 필터를 빼고, 나머지 개수는 장르 필터를 적용해서 셈
+        self.assertEqual(self._counts(result, 'genres', 'genre'), {'공포': 2, 'SF': 1})
+        self.assertEqual(self._counts(result, 'branches', 'branch_id'), {self.branch.pk: 2, self.other.pk: 0})
+        self.assertEqual(self._counts(result, 'difficulties', 'value')[3], 2)
+        self.assertEqual(self._counts(result, 'difficulties', 'value')[5], 0)
+
+    def test_price_bands(self):
+        result = facets.facet_counts(difficulty='3')
+        self.assertEqual(self._counts(result, 'price_bands', 'max_price'), {20000: 2, 25000: 2, 30000: 2, 40000: 2})
+        result = facets.facet_counts(max_price='10000')
+        self.assertEqual(self._counts(result, 'price_bands', 'max_price')[20000], 3)
+        self.assertEqual(self._counts(result, 'genres', 'genre'), {'공포': 1})
+
+    def test_search_and_invalid_filters(self):
+        self.assertEqual(self._counts(facets.facet_counts(search_query='sf'), 'genres', 'genre'), {'SF': 1})
+        # 숫자가 아닌 값은 필터 없음으로 처리
+        self.assertEqual(sum(self._counts(facets.facet_counts(difficulty='x'), 'genres', 'genre').values()), 3)
+
+    def test_theme_changes_invalidate_counts(self):
+        self.assertEqual(self._counts(facets.facet_counts(), 'branches', 'branch_id')[self.other.pk], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Theme.objects.create(branch=self.other, name='새 테마', genre='SF', difficulty=2, duration=60,
+                                 price=20000, description='d')
+        self.assertEqual(self._counts(facets.facet_counts(), 'branches', 'branch_id')[self.other.pk], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            theme = Theme.objects.get(pk=self.themes[0].pk)
+            theme.status = 'Maintenance'
+            theme.save()
+        self.assertEqual(self._counts(facets.facet_counts(), 'branches', 'branch_id')[self.branch.pk], 2)
+
+
+class TypeaheadTests(BookingTestCase):
+    """자동완성 인덱스 (booking/typeahead.py)"""
+
+    def setUp(self):
+        super().setUp()
+        typeahead._state.update(index=None, version=None)
+
+    def _labels(self, query):
+        return [item['label'] for item in typeahead.suggest(query)]
+
+    def test_index_built_on_first_lookup(self):
+        self.assertEqual(self._labels('테마1'), ['테마1'])
+        self.assertEqual(self._labels('ㅌㅁ'), ['테마0', '테마1', '테마2'])
+        self.assertIn('강남점', self._labels('강ㄴ'))
+
+    def test_theme_change_updates_index(self):
+        self._labels('테마')
+        with self.captureOnCommitCallbacks(execute=True):
+            Theme.objects.create(branch=self.branch, name='저주받은 저택', genre='공포', difficulty=3, duration=60,
+                                 price=20000, description='d')
+        self.assertEqual(self._labels('ㅈㅈㅂ'), ['저주받은 저택'])
+
+    def test_warm_up_without_database(self):
+        with mock.patch('booking.typeahead.build_index', side_effect=DatabaseError), \
+                self.assertLogs('booking.typeahead', 'WARNING'):
+            typeahead.warm_up()
+        self.assertEqual(self._labels('테마0'), ['테마0'])
+
+
+class ApiTests(BookingTestCase):
+    """읽기 전용 JSON API - 조건부 GET / 키셋 페이지네이션 (booking/api.py)"""
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get('/api/v1/branches/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/v1/branches/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # 쿼리 파라미터가 다르면 다른 ETag
+        self.assertNotEqual(self.client.get('/api/v1/branches/', {'fields': 'branch_id'})['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Branch.objects.create(branch_name='홍대점', location='서울', phone='2')
+        response = self.client.get('/api/v1/branches/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_time_dependent_etag_changes_each_slot(self):
+        now = timezone.now()
+        with mock.patch('booking.api.timezone.now', return_value=now):
+            etag = self.client.get('/api/v1/themes/')['ETag']
+            self.assertEqual(self.client.get('/api/v1/themes/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch('booking.api.timezone.now', return_value=now + timedelta(hours=1)):
+            self.assertEqual(self.client.get('/api/v1/themes/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_cursor_paging(self):
+        ids = sorted(theme.pk for theme in self.themes)
+        first = self.client.get('/api/v1/themes/', {'limit': 2}).json()
+        self.assertEqual([t['theme_id'] for t in first['results']], ids[:2])
+        self.assertEqual(first['next'], ids[1])
+        second = self.client.get('/api/v1/themes/', {'limit': 2, 'after': first['next']}).json()
+        self.assertEqual([t['theme_id'] for t in second['results']], ids[2:])
+        self.assertIsNone(second['next'])
+
+    def test_filters_and_fields(self):
+        Theme.objects.filter(pk=self.themes[0].pk).update(difficulty=5)
+        response = self.client.get('/api/v1/themes/', {'difficulty': 5, 'branch': self.branch.pk, 'fields': 'theme_id,name'})
+        self.assertEqual(response.json()['results'], [{'theme_id': self.themes[0].pk, 'name': '테마0'}])
+
+    def test_bad_parameters(self):
+        for params in ({'difficulty': 'abc'}, {'branch': 'abc'}):
+            self.assertEqual(self.client.get('/api/v1/themes/', params).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/themes/', {'limit': 'x'}).status_code, 404)
+
+    def test_availability_marks_booked_and_held_slots(self):
+        theme = self.themes[0]
+        Reservation.objects.create(member=self.bob, theme=theme, reservation_time=_slot(hour=14),
+                                   num_of_participants=2, total_price=40000)
+        holds.acquire(theme, _slot(hour=15), self.alice, 2)
+        response = self.client.get(f'/api/v1/themes/{theme.pk}/availability/',
+                                   {'date': _slot().date().isoformat()})
+        available = {slot['slot_start']: slot['available'] for slot in response.json()['slots']}
+        self.assertFalse(available[_slot(hour=14).isoformat()])
+        self.assertFalse(available[_slot(hour=15).isoformat()])
+        self.assertTrue(available[_slot(hour=16).isoformat()])
+
+
+class PageCacheTests(BookingTestCase):
+    """비로그인 페이지 캐시 (booking/page_cache.py)"""
+
+    def _status(self, path, params=None):
+        response = self.client.get(path, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.get('X-Page-Cache')
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self._status('/themes/'), 'MISS')
+        self.assertEqual(self._status('/themes/'), 'HIT')
+        # 기본값 / 허용되지 않은 파라미터는 같은 페이지
+        self.assertEqual(self._status('/themes/', {'sort': 'latest', 'utm_source': 'x'}), 'HIT')
+        self.assertEqual(self._status('/themes/', {'sort': 'rating'}), 'MISS')
+
+    def test_stamp_bump_invalidates(self):
+        self._status('/themes/')
+        self._status('/notices/')
+        bump('themes')
+        self.assertEqual(self._status('/themes/'), 'MISS')
+        self.assertEqual(self._status('/notices/'), 'HIT')
+
+    def test_model_change_invalidates(self):
+        self.assertNotContains(self.client.get('/themes/'), '새 테마')
+        with self.captureOnCommitCallbacks(execute=True):
+            Theme.objects.create(branch=self.branch, name='새 테마', genre='공포', difficulty=3, duration=60,
+                                 price=20000, description='d')
+        response = self.client.get('/themes/')
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, '새 테마')
+
+    def test_logged_in_not_cached(self):
+        self.client.force_login(self.alice)
+        response = self.client.get('/themes/')
+        self.assertNotIn('X-Page-Cache', response)
+        self.assertIn('private', response['Cache-Control'])
+
+
+class NoticeUnreadTests(BookingTestCase):
+    """회원별 공지 피드 / 안 읽은 공지 수 (booking/notices.py)"""
+
+    def setUp(self):
+        super().setUp()
+        self.other = Branch.objects.create(branch_name='홍대점', location='서울', phone='2')
+        self.staff = Member.objects.create_user('staff', '직원', '2001', role='ThemeManager', password='pw')
+        BranchAssignment.objects.create(branch=self.branch, member=self.staff)
+
+    def _post(self, title, branch=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notice.objects.create(title=title, content='c', target_branch=branch)
+
+    def test_visibility_by_role(self):
+        self._post('전체')
+        self._post('강남', self.branch)
+        self._post('홍대', self.other)
+        self.assertEqual(notices.unread_count(self.alice), 3)
+        self.assertEqual(notices.unread_count(self.staff), 2)
+        self.assertEqual([n.title for n in notices.visible_notices(self.staff).order_by('notice_id')], ['전체', '강남'])
+
+    def test_cached_until_new_notice(self):
+        self._post('첫 공지')
+        self.assertEqual(notices.unread_count(self.alice), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(notices.unread_count(self.alice), 1)
+        self._post('두 번째 공지')
+        self.assertEqual(notices.unread_count(self.alice), 2)
+
+    def test_mark_read(self):
+        first = self._post('첫 공지')
+        second = self._post('두 번째 공지')
+        notices.mark_read(self.alice, first.pk)
+        self.assertEqual(notices.unread_count(self.alice), 1)
+        notices.mark_read(self.alice, second.pk)
+        notices.mark_read(self.alice, first.pk)  # 이전 공지를 다시 읽어도 기준은 그대로
+        self.assertEqual(notices.unread_count(self.alice), 0)
+        self.assertEqual(Member.objects.get(pk=self.alice.pk).last_read_notice_id, second.pk)
+
+    @override_settings(NOTICE_UNREAD_MAX=2)
+    def test_count_capped(self):
+        for i in range(4):
+            self._post(f'공지 {i}')
+        self.assertEqual(notices.unread_count(self.alice), 2)
+
+    def test_feed_paging(self):
+        posted = [self._post(f'공지 {i}') for i in range(5)]
+        page, cursor = notices.notice_feed(self.alice, limit=3)
+        self.assertEqual([n.pk for n in page], [n.pk for n in posted[:1:-1]])
+        page, cursor = notices.notice_feed(self.alice, after=cursor, limit=3)
+        self.assertEqual([n.pk for n in page], [posted[1].pk, posted[0].pk])
+        self.assertIsNone(cursor)
+
+
+class TimelineTests(BookingTestCase):
+    """마이페이지 지난 예약 / 상단 요약 (booking/timeline.py) - 보관된 예약 포함"""
+
+    def setUp(self):
+        super().setUp()
+        _use_temp_archive_root(self)
+        self.now = timezone.now()
+
+    def _reserve(self, when, status='Completed', is_success=True):
+        return Reservation.objects.create(
+            member=self.alice, theme=self.themes[0], num_of_participants=2, total_price=40000,
+            reservation_time=when, status=status, is_success=is_success,
+        )
+
+    def test_past_paging_across_archived_rows(self):
+        old = [self._reserve(self.now - timedelta(days=400 + i)) for i in range(3)]
+        recent = [self._reserve(self.now - timedelta(days=1 + i)) for i in range(3)]
+        self._reserve(self.now + timedelta(days=1), status='Confirmed', is_success=None)
+        self.assertEqual(archive_reservations(now=self.now)['reservations'], 3)
+
+        rows, cursor = [], None
+        while True:
+            page, cursor = timeline.past_reservations(self.alice, cursor=cursor, now=self.now, limit=2)
+            rows += page
+            if cursor is None:
+                break
+        self.assertEqual([r.reservation_id for r in rows], [r.reservation_id for r in recent + old])
+        self.assertEqual([getattr(r, 'is_archived', False) for r in rows], [False] * 3 + [True] * 3)
+        self.assertTrue(all(r.payment_info is None and not r.has_review for r in rows))
+
+    def test_invalid_cursor_returns_first_page(self):
+        self._reserve(self.now - timedelta(days=1))
+        self.assertIsNone(timeline.decode_cursor('garbage'))
+        page, cursor = timeline.past_reservations(self.alice, cursor='garbage', now=self.now)
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(cursor)
+
+    def test_counters_include_archived(self):
+        self._reserve(self.now - timedelta(days=400))
+        self._reserve(self.now - timedelta(days=401), is_success=False)
+        self._reserve(self.now - timedelta(days=1))
+        archive_reservations(now=self.now)
+        self.assertEqual(timeline.member_counters(self.alice), {'visits': 3, 'escapes': 2, 'reviews_pending': 1})
+
+    def test_counters_invalidated_on_change(self):
+        reservation = self._reserve(self.now - timedelta(days=1))
+        self.assertEqual(timeline.member_counters(self.alice)['visits'], 1)
+        with self.assertNumQueries(0):
+            timeline.member_counters(self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.status = 'NoShow'
+            reservation.save()
+        self.assertEqual(timeline.member_counters(self.alice)['visits'], 0)
+
+
+class ReviewSummaryTests(BookingTestCase):
+    """테마 리뷰 요약 / 리뷰 목록 (booking/reviews.py)"""
+
+    def setUp(self):
+        super().setUp()
+        self.theme = self.themes[0]
+
+    def _review(self, rating, member=None, days=1):
+        reservation = Reservation.objects.create(
+            member=member or self.alice, theme=self.theme, num_of_participants=2, total_price=40000,
+            reservation_time=timezone.now() - timedelta(days=days), status='Completed',
+        )
+        return Review.objects.create(reservation=reservation, member=member or self.alice, rating=rating)
+
+    def test_summary_refreshed_on_change(self):
+        first = self._review(5)
+        second = self._review(3, days=2)
+        summary = reviews.rating_summary(self.theme)
+        self.assertEqual((summary['count'], summary['avg']), (2, 4.0))
+        self.assertEqual([row['count'] for row in summary['histogram']], [1, 0, 1, 0, 0])
+
+        second.rating = 4
+        second.save()
+        first.delete()
+        summary = reviews.rating_summary(self.theme)
+        self.assertEqual((summary['count'], summary['avg']), (1, 4.0))
+        self.assertEqual([row['percent'] for row in summary['histogram']], [0, 100, 0, 0, 0])
+        self.assertEqual(reviews.rating_summary(self.themes[1])['count'], 0)
+
+    def test_newest_paging(self):
+        posted = [self._review(4, days=i + 1) for i in range(5)]
+        page, cursor = reviews.review_page(self.theme, limit=3)
+        self.assertEqual([r.pk for r in page], [r.pk for r in posted[:1:-1]])
+        page, cursor = reviews.review_page(self.theme, cursor=cursor, limit=3)
+        self.assertEqual([r.pk for r in page], [posted[1].pk, posted[0].pk])
+        self.assertIsNone(cursor)
+
+    def test_helpful_toggle_and_sort(self):
+        first = self._review(4)
+        second = self._review(4, days=2)
+        self.assertTrue(reviews.toggle_helpful(first, self.bob))
+        self.assertTrue(reviews.toggle_helpful(first, self.alice))
+        self.assertTrue(reviews.toggle_helpful(second, self.bob))
+        self.assertFalse(reviews.toggle_helpful(second, self.bob))
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.helpful_count, second.helpful_count), (2, 0))
+
+        page, cursor = reviews.review_page(self.theme, sort='helpful', limit=1)
+        self.assertEqual([r.pk for r in page], [first.pk])
+        page, cursor = reviews.review_page(self.theme, sort='helpful', cursor=cursor, limit=1)
+        self.assertEqual([r.pk for r in page], [second.pk])
+        self.assertIsNone(cursor)
+
+
+class ArchiveTests(BookingTestCase):
+    """오래된 종료 예약 보관 / 복원 (booking/archive.py) - 보관 기준 365일"""
+
+    TOTAL_FIELDS = ('reservation_count', 'completed_count', 'success_count', 'paid_count', 'paid_amount',
+                    'review_count', 'rating_sum', 'rating_4')
+
+    def setUp(self):
+        super().setUp()
+        self.root = _use_temp_archive_root(self)
+        self.now = timezone.now()
+        self.theme = self.themes[0]
+        self.carol = Member.objects.create_user('carol', '고객3', '1003', password='pw')
+
+        self.completed = self._reserve(days=400, status='Completed', is_success=True)
+        self.payment = Payment.objects.create(reservation=self.completed, payment_method='card', amount=40000,
+                                              payment_status='Paid')
+        self.review = Review.objects.create(reservation=self.completed, member=self.alice, rating=4)
+        for member in (self.bob, self.carol):
+            reviews.toggle_helpful(self.review, member)
+        self.cancelled = self._reserve(days=500, status='Cancelled')
+        self.recent = self._reserve(days=10, status='Completed', is_success=False)
+
+    def _reserve(self, days, status, is_success=None):
+        return Reservation.objects.create(
+            member=self.alice, theme=self.theme, num_of_participants=2, total_price=40000,
+            reservation_time=self.now - timedelta(days=days), status=status, is_success=is_success,
+        )
+
+    def _totals(self):
+        totals = ThemeArchiveTotals.objects.get(theme=self.theme)
+        return [getattr(totals, field) for field in self.TOTAL_FIELDS]
+
+    def test_archive_moves_old_closed_reservations(self):
+        result = archive_reservations(now=self.now)
+        self.assertEqual((result['reservations'], result['segments']), (2, 1))
+        self.assertEqual(list(Reservation.objects.values_list('pk', flat=True)), [self.recent.pk])
+        self.assertFalse(Payment.objects.exists() or Review.objects.exists() or ReviewHelpful.objects.exists())
+        self.assertEqual(ArchivedReservation.objects.count(), 2)
+        self.assertEqual(self._totals(), [2, 1, 1, 1, 40000, 1, 4, 1])
+        # 보관된 리뷰도 테마 리뷰 요약에 포함
+        self.assertEqual(reviews.rating_summary(self.theme)['count'], 1)
+
+    def test_restore_round_trip(self):
+        archive_reservations(now=self.now)
+        segment = ArchiveSegment.objects.get()
+        path = os.path.join(self.root, segment.file_name)
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(restore_reservations(member_id=self.alice.pk), 2)
+        self.assertEqual(self._totals(), [0] * len(self.TOTAL_FIELDS))
+        self.assertEqual(reviews.rating_summary(self.theme)['count'], 1)
+        self.assertEqual(set(Reservation.objects.values_list('pk', flat=True)),
+                         {self.completed.pk, self.cancelled.pk, self.recent.pk})
+        restored = Reservation.objects.get(pk=self.completed.pk)
+        self.assertEqual((restored.reservation_time, restored.status), (self.completed.reservation_time, 'Completed'))
+        self.assertEqual(Payment.objects.get(reservation=restored).pk, self.payment.pk)
+        review = Review.objects.get(reservation=restored)
+        self.assertEqual((review.pk, review.created_at, review.helpful_count), (self.review.pk, self.review.created_at, 2))
+        self.assertFalse(ArchivedReservation.objects.exists() or ArchiveSegment.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_restore_drops_votes_of_deleted_members(self):
+        archive_reservations(now=self.now)
+        self.carol.delete()
+        restore_reservations(reservation_ids=[self.completed.pk])
+        review = Review.objects.get(pk=self.review.pk)
+        self.assertEqual(review.helpful_count, 1)
+        self.assertEqual(list(review.helpful_votes.values_list('member_id', flat=True)), [self.bob.pk])
+        # 아직 보관 중인 예약이 남아 있으므로 세그먼트 유지
+        self.assertEqual(list(ArchivedReservation.objects.values_list('pk', flat=True)), [self.cancelled.pk])
+        self.assertTrue(ArchiveSegment.objects.exists())
+
+
+class EventLogTests(BookingTestCase):
+    """이벤트 로그 / 소비자 커서 (booking/events.py)"""
+
+    def setUp(self):
+        super().setUp()
+        # 테스트 데이터(테마 생성) 이벤트는 이미 처리한 것으로
+        last = Event.objects.order_by('-event_id').values_list('event_id', flat=True).first() or 0
+        EventCursor.objects.create(name='test', position=last)
+
+    def _record(self, count):
+        return [events.record('reservation', 'created', i) for i in range(count)]
+
+    def test_records_model_changes(self):
+        reservation = Reservation.objects.create(
+            member=self.alice, theme=self.themes[0], num_of_participants=2, total_price=40000, reservation_time=_slot(),
+        )
+        reservation.status = 'Cancelled'
+        reservation.save()
+        reservation.delete()
+        rows = list(Event.objects.filter(topic='reservation').order_by('event_id').values_list('action', 'data'))
+        self.assertEqual([action for action, _ in rows], ['created', 'changed', 'deleted'])
+        self.assertEqual(rows[1][1], {'status': ['Confirmed', 'Cancelled']})
+
+    def test_consume_in_batches_and_resume(self):
+        recorded = self._record(5)
+        seen = []
+        self.assertEqual(events.consume('test', lambda batch: seen.append([e.pk for e in batch]), batch_size=2), 5)
+        self.assertEqual(seen, [[e.pk for e in recorded[i:i + 2]] for i in range(0, 5, 2)])
+        self.assertEqual(EventCursor.objects.get(name='test').position, recorded[-1].pk)
+
+        more = self._record(1)
+        self.assertEqual([e.pk for e in events.read_events('test')], [more[0].pk])
+        self.assertEqual(events.consume('test', lambda batch: None), 1)
+        self.assertEqual(events.consume('test', lambda batch: None), 0)
+
+    def test_failed_batch_is_retried(self):
+        recorded = self._record(2)
+
+        def fail(batch):
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            events.consume('test', fail)
+        self.assertEqual([e.pk for e in events.read_events('test')], [e.pk for e in recorded])
+
+    def test_commit_order_by_txid(self):
+        # 먼저 ID를 받은 트랜잭션(txid 10)이 나중에 커밋된 경우 -> (txid, event_id) 순서, xmin 이후 트랜잭션은 대기
+        first, second, third = self._record(3)
+        for event, txid in ((first, 10), (second, 7), (third, 12)):
+            Event.objects.filter(pk=event.pk).update(txid=txid)
+        with mock.patch('booking.events._snapshot_xmin', return_value=11):
+            self.assertEqual([e.pk for e in events.read_events('test')], [second.pk, first.pk])
+            seen = []
+            events.consume('test', lambda batch: seen.extend(e.pk for e in batch))
+            self.assertEqual(seen, [second.pk, first.pk])
+        with mock.patch('booking.events._snapshot_xmin', return_value=13):
+            self.assertEqual([e.pk for e in events.read_events('test')], [third.pk])
+
+
+@override_settings(BRANCH_SHARDS=['shard_0', 'shard_1'], BRANCH_SHARD_MAP={}, SHARD_ID_SPAN=100_000_000)
+class ShardRouterTests(SimpleTestCase):
+    """지점 기준 샤드 배치 (booking/sharding.py) - DB 접속 없이 라우터 판단만 확인"""
+
+    def setUp(self):
+        self.router = sharding.BranchShardRouter()
+
+    def test_branch_to_shard(self):
+        self.assertEqual(sharding.shard_for_branch(1), 'shard_1')
+        self.assertEqual(sharding.shard_for_branch(2), 'shard_0')
+        with override_settings(BRANCH_SHARD_MAP={2: 'shard_1'}):
+            self.assertEqual(sharding.shard_for_branch(2), 'shard_1')
+
+    def test_id_to_shard(self):
+        self.assertEqual(sharding.shard_for_id(5), 'shard_0')
+        self.assertEqual(sharding.shard_for_id(100_000_001), 'shard_1')
+        self.assertIsNone(sharding.shard_for_id(200_000_001))
+
+    def test_new_object_goes_to_branch_shard(self):
+        for branch_id, alias in ((1, 'shard_1'), (2, 'shard_0')):
+            theme = Theme(branch_id=branch_id, name='t')
+            self.assertEqual(self.router.db_for_write(Theme, instance=theme), alias)
+            # 지점의 샤드가 지정된 샤드보다 우선하되, 같으면 그대로
+            with sharding.use_shard(alias):
+                self.assertEqual(self.router.db_for_write(Theme, instance=theme), alias)
+
+    def test_new_object_follows_related_object(self):
+        theme = Theme(theme_id=100_000_001, branch_id=1)
+        theme._state.db = 'shard_1'
+        theme._state.adding = False
+        reservation = Reservation(theme=theme, member_id=1)
+        self.assertEqual(reservation._state.db, 'shard_1')
+        self.assertEqual(self.router.db_for_write(Reservation, instance=Reservation(theme_id=100_000_001)), 'shard_1')
+        self.assertEqual(self.router.db_for_write(Reservation, instance=Reservation(theme_id=7)), 'shard_0')
+
+    def test_shard_mismatch_raises(self):
+        with sharding.use_shard('shard_0'):
+            with self.assertRaises(sharding.ShardMismatch):
+                self.router.db_for_write(Theme, instance=Theme(branch_id=1, name='t'))
+
+    def test_query_without_shard_raises(self):
+        with self.assertRaises(sharding.ShardNotSelected):
+            self.router.db_for_read(Theme)
+        with sharding.use_shard('shard_1'):
+            self.assertEqual(self.router.db_for_read(Theme), 'shard_1')
+
+    def test_global_models_stay_on_default(self):
+        with sharding.use_shard('shard_1'):
+            self.assertEqual(self.router.db_for_write(Member), 'default')
+            self.assertEqual(self.router.db_for_read(Branch), 'shard_1')
+        self.assertEqual(self.router.db_for_read(Branch), 'default')
+
+
+class ObjectCacheTests(BookingTestCase):
+    """테마 객체 캐시 (booking/object_cache.py) - L1 + 버전 스탬프 키"""
+
+    def setUp(self):
+        super().setUp()
+        object_cache.invalidate_local()
+        self.addCleanup(object_cache.invalidate_local)
+        self.theme = self.themes[0]
+
+    def test_read_through(self):
+        with self.assertNumQueries(1):
+            themes = object_cache.get_themes([self.theme.pk, self.themes[1].pk, 999999])
+        self.assertEqual(set(themes), {self.theme.pk, self.themes[1].pk})
+        self.assertEqual(themes[self.theme.pk].branch.branch_name, '강남점')
+        # 반환값은 복사본
+        themes[self.theme.pk].name = '바뀜'
+        with self.assertNumQueries(0):
+            self.assertEqual(object_cache.get_theme(self.theme.pk).name, '테마0')
+
+    def test_shared_cache_after_l1_cleared(self):
+        object_cache.get_theme(self.theme.pk)
+        object_cache.invalidate_local()
+        with self.assertNumQueries(0):
+            self.assertEqual(object_cache.get_theme(self.theme.pk).name, '테마0')
+
+    def test_theme_save_invalidates(self):
+        object_cache.get_theme(self.theme.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            theme = Theme.objects.get(pk=self.theme.pk)
+            theme.price = 25000
+            theme.save()
+        self.assertEqual(object_cache.get_theme(self.theme.pk).price, 25000)
+
+    def test_branch_save_invalidates(self):
+        object_cache.get_themes([theme.pk for theme in self.themes])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.branch.branch_name = '강남역점'
+            self.branch.save()
+        self.assertEqual({t.branch.branch_name for t in object_cache.get_themes([t.pk for t in self.themes]).values()},
+                         {'강남역점'})
+
+    @override_settings(THEME_CACHE_L1_SECONDS=0)
+    def test_other_process_change_after_stamp_bump(self):
+        # 다른 프로세스의 변경: 이 프로세스의 L1은 그대로, 공유 스탬프만 올라감
+        object_cache.get_theme(self.theme.pk)
+        Theme.objects.filter(pk=self.theme.pk).update(name='변경')
+        self.assertEqual(object_cache.get_theme(self.theme.pk).name, '테마0')
+        bump(f'theme:{self.theme.pk}')
+        self.assertEqual(object_cache.get_theme(self.theme.pk).name, '변경')
+
+    def test_get_theme_or_404(self):
+        self.assertEqual(object_cache.get_theme_or_404(self.theme.pk, is_active=True).pk, self.theme.pk)
+        with self.assertRaises(Http404):
+            object_cache.get_theme_or_404(self.theme.pk, is_active=False)
+        with self.assertRaises(Http404):
+            object_cache.get_theme_or_404(999999)
+
+
+class TokenBucketTests(SimpleTestCase):
+    """토큰 버킷 요청 제한 (booking/admission.py take_token)"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = time.time()
+        patcher = mock.patch('booking.admission.time.time', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def take(self, identity='1.2.3.4'):
+        # 10초마다 2개 충전 (5초에 1개)
+        return admission.take_token('login', 'ip', identity, 2, 10)
+
+    def test_burst_then_limited(self):
+        self.assertEqual(self.take(), 0)
+        self.assertEqual(self.take(), 0)
+        retry_after = self.take()
+        self.assertGreater(retry_after, 0)
+        self.assertLessEqual(retry_after, 5)
+
+    def test_refills_over_time(self):
+        self.take()
+        self.take()
+        self.assertGreater(self.take(), 0)
+        self.now += 5
+        self.assertEqual(self.take(), 0)
+        self.assertGreater(self.take(), 0)
+
+    def test_refill_capped_at_burst(self):
+        self.take()
+        self.now += 3600
+        self.assertEqual(self.take(), 0)
+        self.assertEqual(self.take(), 0)
+        self.assertGreater(self.take(), 0)
+
+    def test_identities_are_independent(self):
+        self.take()
+        self.take()
+        self.assertGreater(self.take(), 0)
+        self.assertEqual(self.take('5.6.7.8'), 0)
+
+
+class ClientIpTests(SimpleTestCase):
+    """요청 제한 대상 IP (booking/admission.py client_ip)"""
+
+    def ip(self, **meta):
+        return admission.client_ip(RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', **meta))
+
+    def test_remote_addr_by_default(self):
+        self.assertEqual(self.ip(HTTP_X_FORWARDED_FOR='1.1.1.1'), '10.0.0.1')
+
+    @override_settings(RATE_LIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR', RATE_LIMIT_TRUSTED_PROXY_HOPS=1)
+    def test_spoofed_forwarded_for_ignored(self):
+        # 클라이언트가 보낸 값 뒤에 프록시가 실제 주소를 덧붙임
+        self.assertEqual(self.ip(HTTP_X_FORWARDED_FOR='6.6.6.6, 2.2.2.2'), '2.2.2.2')
+        self.assertEqual(self.ip(HTTP_X_FORWARDED_FOR='2.2.2.2'), '2.2.2.2')
+        self.assertEqual(self.ip(), '10.0.0.1')
+
+    @override_settings(RATE_LIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR', RATE_LIMIT_TRUSTED_PROXY_HOPS=2)
+    def test_multiple_trusted_proxies(self):
+        self.assertEqual(self.ip(HTTP_X_FORWARDED_FOR='6.6.6.6, 2.2.2.2, 172.16.0.1'), '2.2.2.2')
+        self.assertEqual(self.ip(HTTP_X_FORWARDED_FOR='2.2.2.2'), '2.2.2.2')
+
+
+@override_settings(RATE_LIMITS={'reservation': {'member': (1, 60)}})
+class BookingAdmissionTests(BookingTestCase):
+    """예약 POST 요청 제한 (booking/admission.py admit_booking)"""
+
+    def test_checkout_confirm_rate_limited(self):
+        hold = holds.acquire(self.themes[0], _slot(), self.alice, 2)
+        self.client.force_login(self.alice)
+        url = f'/reservation/checkout/{hold.pk}/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.post(url, {'action': 'cancel'}).status_code, 302)
+        hold = holds.acquire(self.themes[0], _slot(), self.alice, 2)
+        response = self.client.post(f'/reservation/checkout/{hold.pk}/')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertFalse(Reservation.objects.exists())
+
+
+class SlotHoldTests(BookingTestCase):
+    """결제 중 슬롯 선점 (booking/holds.py)"""
+
+    def test_second_customer_cannot_acquire_held_slot(self):
+        theme, when = self.themes[0], _slot()
+        hold = holds.acquire(theme, when, self.alice, 2)
+        self.assertIsNotNone(hold)
+        self.assertIsNone(holds.acquire(theme, when, self.bob, 2))
+        self.assertEqual(SlotHold.objects.filter(theme=theme, slot_time=when).count(), 1)
+
+    def test_same_customer_reacquire_updates_hold(self):
+        theme, when = self.themes[0], _slot()
+        hold = holds.acquire(theme, when, self.alice, 2)
+        again = holds.acquire(theme, when, self.alice, 4)
+        self.assertEqual(again.pk, hold.pk)
+        self.assertEqual(again.num_of_participants, 4)
+        self.assertEqual(again.total_price, hold.total_price * 2)
+
+    def test_new_hold_releases_previous_one(self):
+        holds.acquire(self.themes[0], _slot(), self.alice, 2)
+        holds.acquire(self.themes[1], _slot(), self.alice, 2)
+        self.assertEqual(list(SlotHold.objects.filter(member=self.alice).values_list('theme_id', flat=True)),
+                         [self.themes[1].pk])
+
+    def test_confirm_creates_reservation_and_payment(self):
+        hold = holds.acquire(self.themes[0], _slot(), self.alice, 2)
+        reservation = holds.confirm(hold, self.alice)
+        self.assertIsNotNone(reservation)
+        self.assertEqual(reservation.total_price, hold.total_price)
+        self.assertTrue(Payment.objects.filter(reservation=reservation, payment_status='Paid').exists())
+        self.assertFalse(SlotHold.objects.filter(pk=hold.pk).exists())
+
+    def test_confirm_after_expiry_fails(self):
+        theme, when = self.themes[0], _slot()
+        hold = holds.acquire(theme, when, self.alice, 2)
+        SlotHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(holds.get_active(hold.pk, self.alice))
+        self.assertIsNone(holds.confirm(hold, self.alice))
+        self.assertFalse(Reservation.objects.filter(theme=theme, reservation_time=when).exists())
+        # 만료된 슬롯은 다른 고객이 선점 가능
+        self.assertIsNotNone(holds.acquire(theme, when, self.bob, 2))
+
+    def test_confirm_after_slot_taken_by_other_customer_fails(self):
+        theme, when = self.themes[0], _slot()
+        hold = holds.acquire(theme, when, self.alice, 2)
+        SlotHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        other = holds.acquire(theme, when, self.bob, 2)
+        self.assertIsNotNone(holds.confirm(other, self.bob))
+        self.assertIsNone(holds.confirm(hold, self.alice))
+        self.assertEqual(Reservation.objects.filter(theme=theme, reservation_time=when).count(), 1)
+
+    def test_booked_slot_cannot_be_acquired(self):
+        theme, when = self.themes[0], _slot()
+        Reservation.objects.create(member=self.bob, theme=theme, reservation_time=when,
+                                   num_of_participants=2, total_price=40000)
+        self.assertIsNone(holds.acquire(theme, when, self.alice, 2))
+
+    def test_expire_holds(self):
+        hold = holds.acquire(self.themes[0], _slot(), self.alice, 2)
+        holds.acquire(self.themes[1], _slot(), self.bob, 2)
+        SlotHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(holds.expire_holds(), 1)
+        self.assertEqual(list(SlotHold.objects.values_list('member_id', flat=True)), [self.bob.pk])
+
+
+class GroupBookingTests(BookingTestCase):
+    """단체 예약 - 전부 성공 또는 전부 실패 (booking/group_booking.py)"""
+
+    def _items(self, hour=14):
+        return [(theme, _slot(hour=hour), 3) for theme in self.themes]
+
+    def assertNothingBooked(self, items, member):
+        for theme, when, _ in items:
+            self.assertFalse(Reservation.objects.filter(theme=theme, reservation_time=when, member=member).exists())
+        self.assertFalse(SlotHold.objects.filter(member=member).exists())
+        self.assertFalse(Payment.objects.filter(reservation__member=member).exists())
+
+    def test_books_all_rooms(self):
+        items = self._items()
+        reservations = book_group(self.alice, items)
+        self.assertEqual([r.theme_id for r in reservations], [theme.pk for theme in self.themes])
+        self.assertEqual(Payment.objects.filter(reservation__in=reservations).count(), len(items))
+        self.assertFalse(SlotHold.objects.filter(member=self.alice).exists())
+
+    def test_partial_conflict_books_nothing(self):
+        items = self._items()
+        taken_theme, taken_time, _ = items[1]
+        Reservation.objects.create(member=self.bob, theme=taken_theme, reservation_time=taken_time,
+                                   num_of_participants=2, total_price=40000)
+        with self.assertRaises(GroupBookingError) as raised:
+            book_group(self.alice, items)
+        self.assertEqual([(theme.pk, when) for theme, when in raised.exception.slots], [(taken_theme.pk, taken_time)])
+        self.assertNothingBooked(items, self.alice)
+
+    def test_slot_held_by_other_customer_books_nothing(self):
+        # 다른 고객의 선점과 유니크 제약이 충돌하는 경우 (IntegrityError)
+        items = self._items()
+        held_theme, held_time, _ = items[2]
+        self.assertIsNotNone(holds.acquire(held_theme, held_time, self.bob, 2))
+        with self.assertRaises(GroupBookingError):
+            book_group(self.alice, items)
+        self.assertNothingBooked(items, self.alice)
+        self.assertTrue(SlotHold.objects.filter(member=self.bob, theme=held_theme).exists())
+
+    def test_replaces_expired_and_own_holds(self):
+        items = self._items()
+        own = holds.acquire(items[0][0], items[0][1], self.alice, 2)
+        expired = holds.acquire(items[1][0], items[1][1], self.bob, 2)
+        SlotHold.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(book_group(self.alice, items)), len(items))
+        self.assertFalse(SlotHold.objects.filter(pk__in=[own.pk, expired.pk]).exists())
+
+    def test_duplicate_slots_rejected(self):
+        theme, when = self.themes[0], _slot()
+        with self.assertRaises(GroupBookingError):
+            book_group(self.alice, [(theme, when, 2), (theme, when, 3)])
+
+
+class PriceCampaignTests(BookingTestCase):
+    """가격 캠페인 시작 / 종료 (booking/campaigns.py)"""
+
+    def setUp(self):
+        super().setUp()
+        Theme.objects.filter(pk=self.themes[0].pk).update(discount_rate=10)
+        self.now = timezone.now()
+
+    def _campaign(self, rule='add', rate=20, theme_ids=None, branches=(), starts=-1, ends=1):
+        campaign = PriceCampaign.objects.create(
+            name='캠페인', rule=rule, discount_rate=rate, theme_ids=theme_ids or [],
+            starts_at=self.now + timedelta(hours=starts), ends_at=self.now + timedelta(hours=ends),
+        )
+        campaign.branches.set(branches)
+        return campaign
+
+    def rates(self):
+        return [Theme.objects.get(pk=theme.pk).discount_rate for theme in self.themes]
+
+    def test_add_rule_then_restore(self):
+        campaign = self._campaign(branches=[self.branch])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(start_campaign(campaign), 3)
+        self.assertEqual(self.rates(), [30, 20, 20])
+        self.assertEqual(set(Theme.objects.values_list('campaign_id', flat=True)), {campaign.pk})
+        self.assertEqual(ThemePriceHistory.objects.filter(campaign_id=campaign.pk, reason='campaign_start').count(), 3)
+        # 커밋 후 가격 캘린더도 캠페인 할인율로
+        lowest = Theme.objects.annotate(lowest_price=lowest_upcoming_price()).get(pk=self.themes[1].pk).lowest_price
+        self.assertEqual(lowest, 16000)
+
+        self.assertEqual(end_campaign(campaign), 3)
+        self.assertEqual(self.rates(), [10, 0, 0])
+        self.assertFalse(Theme.objects.filter(campaign__isnull=False).exists())
+        self.assertEqual(PriceCampaign.objects.get(pk=campaign.pk).status, 'Ended')
+
+    def test_set_rule_on_selected_themes(self):
+        campaign = self._campaign(rule='set', rate=50, theme_ids=[self.themes[2].pk])
+        self.assertEqual(start_campaign(campaign), 1)
+        self.assertEqual(self.rates(), [10, 0, 50])
+
+    def test_theme_in_other_campaign_skipped(self):
+        first = self._campaign(rule='set', rate=50, theme_ids=[self.themes[2].pk])
+        start_campaign(first)
+        second = self._campaign(branches=[self.branch])
+        self.assertEqual(start_campaign(second), 2)
+        self.assertEqual(self.rates(), [30, 20, 50])
+        self.assertEqual(Theme.objects.get(pk=self.themes[2].pk).campaign_id, first.pk)
+
+    def test_manual_edit_during_campaign_kept(self):
+        campaign = self._campaign(branches=[self.branch])
+        start_campaign(campaign)
+        theme = Theme.objects.get(pk=self.themes[1].pk)
+        theme.discount_rate = 5
+        theme.save()
+        self.assertEqual(end_campaign(campaign), 2)
+        self.assertEqual(self.rates(), [10, 5, 0])
+        self.assertEqual(
+            ThemePriceHistory.objects.filter(theme=self.themes[1]).order_by('history_id').last().reason, 'manual',
+        )
+
+    def test_scheduler(self):
+        campaign = self._campaign(branches=[self.branch])
+        expired = self._campaign(rule='set', rate=90, starts=-3, ends=-2)
+        later = self._campaign(starts=1, ends=2)
+        self.assertEqual(run_price_campaigns(now=self.now), (1, 0))
+        self.assertEqual([PriceCampaign.objects.get(pk=c.pk).status for c in (campaign, expired, later)],
+                         ['Active', 'Ended', 'Scheduled'])
+        self.assertEqual(self.rates(), [30, 20, 20])
+        self.assertEqual(run_price_campaigns(now=self.now + timedelta(hours=1)), (1, 1))
+        self.assertEqual(PriceCampaign.objects.get(pk=campaign.pk).status, 'Ended')
+        self.assertEqual(self.rates(), [10, 0, 0])
+
+
+class MetricsTests(BookingTestCase):
+    """모니터링 지표 /metrics (booking/metrics.py)"""
+
+    def test_exposition(self):
+        self.client.get('/themes/')
+        metrics.cache_lookup('theme', hits=2, misses=1)
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('booking_http_requests_total{method="GET",status="200",view="theme-list"}', body)
+        self.assertIn('booking_db_queries_per_request_bucket{le="1.0",view="theme-list"}', body)
+        self.assertIn('booking_cache_lookups_total{cache="theme",result="hit"}', body)
+
+    def test_allowlist_uses_remote_addr(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='8.8.8.8').status_code, 403)
+        with override_settings(RATE_LIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR'):
+            # 클라이언트가 보낸 X-Forwarded-For로는 통과할 수 없음
+            response = self.client.get('/metrics', REMOTE_ADDR='8.8.8.8', HTTP_X_FORWARDED_FOR='127.0.0.1')
+            self.assertEqual(response.status_code, 403)
+        with override_settings(METRICS_ALLOWED_IPS=None):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='8.8.8.8').status_code, 200)
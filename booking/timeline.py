@@ -0,0 +1,177 @@
+# booking/timeline.py
+"""
+마이페이지 회원 타임라인
+
+- 다가오는 예약 / 지난 예약을 결제, 리뷰 정보와 함께 한 번의 쿼리로 조회
+  (테마 + 지점은 테마 객체 캐시(booking/object_cache.py)에서 채움)
+- 지난 예약과 작성한 리뷰는 커서 기반 페이지네이션 (이전 페이지를 다시 읽지 않음)
+- 보관된 예약(booking/archive.py)은 지난 예약 목록에 시간 순서대로 이어서 표시
+- 샤딩(booking/sharding.py) 시 회원의 예약은 여러 샤드에 있으므로 샤드별로 조회하여 합침
+- 상단 요약(방문 수, 탈출 성공 수, 리뷰 작성 대기 수)은 회원별로 캐시하고,
+  예약/리뷰가 바뀌면 해당 회원의 캐시만 삭제
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import metrics, sharding
+from .archive import archived_index, load_archived, retention_horizon
+from .object_cache import get_themes
+from .models import Reservation, Review, ArchivedReservation
+
+COUNTERS_KEY = 'timeline:counters:{}'
+
+
+def _page_size():
+    return getattr(settings, 'TIMELINE_PAGE_SIZE', 10)
+
+
+def _with_details(queryset):
+    # 리뷰/결제는 역방향 1:1 관계 -> select_related로 같은 쿼리에서 조인
+    return queryset.select_related('review', 'payment')
+
+
+def _annotate_rows(reservations):
+    themes = get_themes({r.theme_id for r in reservations})
+    for r in reservations:
+        r.theme = themes[r.theme_id]
+        r.has_review = hasattr(r, 'review')
+        r.payment_info = r.payment if hasattr(r, 'payment') else None
+    return reservations
+
+
+def encode_cursor(reservation):
+    when = int(reservation.reservation_time.timestamp() * 1_000_000)
+    return f"{when}-{reservation.reservation_id}"
+
+
+def decode_cursor(cursor):
+    """'마이크로초 타임스탬프-예약ID' -> (datetime, 예약ID), 잘못된 값이면 None"""
+    try:
+        when, reservation_id = cursor.split('-')
+        when = datetime.fromtimestamp(int(when) / 1_000_000, tz=dt_timezone.utc)
+        return when, int(reservation_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def _sort_key(reservation):
+    return reservation.reservation_time, reservation.reservation_id
+
+
+def upcoming_reservations(member, now=None):
+    """예약 시간이 지나지 않은 예약 (가까운 순)"""
+    now = now or timezone.now()
+    limit = getattr(settings, 'TIMELINE_UPCOMING_LIMIT', 20)
+    reservations = sharding.gather_queryset(_with_details(
+        Reservation.objects.filter(member=member, reservation_time__gte=now)
+    ).order_by('reservation_time', 'reservation_id')[:limit])
+    if sharding.enabled():
+        reservations = sorted(reservations, key=_sort_key)[:limit]
+    return _annotate_rows(reservations)
+
+
+def recent_theme_ids(member, limit=20):
+    """최근 이용한(취소 제외) 테마 ID (최근 순, 추천용)"""
+    rows = sharding.gather_list(lambda: list(
+        Reservation.objects.filter(member=member)
+        .exclude(status='Cancelled')
+        .order_by('-reservation_time')
+        .values_list('reservation_time', 'theme_id')[:limit]
+    ))
+    if sharding.enabled():
+        rows = sorted(rows, reverse=True)[:limit]
+    return [theme_id for _, theme_id in rows]
+
+
+def past_reservations(member, cursor=None, now=None, limit=None):
+    """지난 예약 (최근 순) - (예약 목록, 다음 페이지 커서)"""
+    now = now or timezone.now()
+    limit = limit or _page_size()
+    return sharding.gather_page(
+        lambda: _past_page(member, cursor, now, limit), key=_sort_key, limit=limit, encode=encode_cursor,
+    )
+
+
+def _past_page(member, cursor, now, limit):
+    reservations = Reservation.objects.filter(member=member, reservation_time__lt=now)
+
+    position = decode_cursor(cursor) if cursor else None
+    if position:
+        when, reservation_id = position
+        reservations = reservations.filter(
+            Q(reservation_time__lt=when) | Q(reservation_time=when, reservation_id__lt=reservation_id)
+        )
+
+    page = _annotate_rows(list(
+        _with_details(reservations).order_by('-reservation_time', '-reservation_id')[:limit + 1]
+    ))
+
+    # 보관된 예약은 모두 보관 기준일 이전 -> 이번 페이지가 기준일 이후로 채워지면 색인 조회 생략
+    if len(page) <= limit or page[-1].reservation_time < retention_horizon(now):
+        archived = archived_index(member, position, limit + 1)
+        if archived:
+            merged = sorted(page + archived, key=_sort_key, reverse=True)[:limit + 1]
+            loaded = iter(load_archived([r for r in merged if isinstance(r, ArchivedReservation)]))
+            page = [next(loaded) if isinstance(r, ArchivedReservation) else r for r in merged]
+
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def member_reviews(member, after=None, limit=None):
+    """작성한 리뷰 (최근 순) - (리뷰 목록, 다음 페이지 커서)"""
+    limit = limit or _page_size()
+    return sharding.gather_page(
+        lambda: _review_page(member, after, limit),
+        key=lambda review: review.review_id, limit=limit, encode=lambda review: review.review_id,
+    )
+
+
+def _review_page(member, after, limit):
+    reviews = Review.objects.filter(member=member)
+    if after:
+        reviews = reviews.filter(review_id__lt=after)
+    page = list(reviews.select_related('reservation').order_by('-review_id')[:limit + 1])
+    themes = get_themes({review.reservation.theme_id for review in page})
+    for review in page:
+        review.reservation.theme = themes[review.reservation.theme_id]
+    next_cursor = page[limit - 1].review_id if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def member_counters(member):
+    """방문(이용 완료) 수, 탈출 성공 수, 리뷰 작성 대기 수 (회원별 캐시)"""
+    key = COUNTERS_KEY.format(member.pk)
+    counters = cache.get(key)
+    metrics.cache_lookup('member_counters', hits=int(counters is not None), misses=int(counters is None))
+    if counters is None:
+        counters = {'visits': 0, 'escapes': 0, 'reviews_pending': 0}
+        for shard_counters in sharding.gather(_count, member):
+            for name, value in shard_counters.items():
+                counters[name] += value
+        cache.set(key, counters, getattr(settings, 'TIMELINE_COUNTERS_CACHE_SECONDS', 60 * 60))
+    return counters
+
+
+def _count(member):
+    counters = Reservation.objects.filter(member=member).aggregate(
+        visits=Count('reservation_id', filter=Q(status='Completed')),
+        escapes=Count('reservation_id', filter=Q(status='Completed', is_success=True)),
+        reviews_pending=Count('reservation_id', filter=Q(status='Completed', review__isnull=True)),
+    )
+    # 보관된 예약은 방문 / 탈출 수에만 합산 (리뷰는 더 이상 작성할 수 없음)
+    archived = ArchivedReservation.objects.filter(member=member, status='Completed').aggregate(
+        visits=Count('reservation_id'),
+        escapes=Count('reservation_id', filter=Q(is_success=True)),
+    )
+    counters['visits'] += archived['visits']
+    counters['escapes'] += archived['escapes']
+    return counters
+
+
+def invalidate_member_counters(member_ids):
+    cache.delete_many([COUNTERS_KEY.format(member_id) for member_id in set(member_ids) if member_id])
@@ -0,0 +1,249 @@
+# booking/typeahead.py
+"""
+테마/지점/장르 자동완성 (프로세스 내 접두어 인덱스)
+
+- 이름을 한글 자모 단위로 분해하여 접두어 색인 -> 입력 중인 글자("저ㅈ", "젖")도 "저주..."와 매칭
+- 초성 검색 지원 ("ㅈㅈㅂ" -> "저주받은 저택")
+- 프로세스의 첫 자동완성 요청 시 한 번 만들고, 테마가 바뀌면 해당 테마만 갱신
+  (다른 프로세스는 캐시의 버전/변경 목록을 보고 바뀐 테마만 다시 불러옴)
+- 조회는 DB를 사용하지 않음
+"""
+import bisect
+import logging
+import threading
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.urls import reverse
+
+from . import sharding
+from .models import Branch, Theme
+
+logger = logging.getLogger(__name__)
+
+MAX_PREFIX = 20
+VERSION_KEY = 'typeahead:version'
+CHANGE_KEY = 'typeahead:change:{}'
+CHANGE_TTL = 60 * 60
+
+CHO = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ',
+        'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ', 'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+JONG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ',
+        'ㄹㅍ', 'ㄹㅎ', 'ㅁ', 'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 입력기에서 직접 입력되는 겹자모(호환용 자모)도 낱자로 분해
+COMPAT = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ', 'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ',
+    'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+
+def decompose(text):
+    """한글 음절을 자모로 분해 (공백 제거, 소문자)"""
+    result = []
+    for ch in text.lower():
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            result.append(CHO[code // 588] + JUNG[(code % 588) // 28] + JONG[code % 28])
+        elif not ch.isspace():
+            result.append(COMPAT.get(ch, ch))
+    return ''.join(result)
+
+
+def initials(text):
+    """초성 문자열 ("저주받은 저택" -> "ㅈㅈㅂㅇㅈㅌ")"""
+    return ''.join(
+        CHO[(ord(ch) - 0xAC00) // 588] if 0 <= ord(ch) - 0xAC00 < 11172 else ch
+        for ch in text.lower() if not ch.isspace()
+    )
+
+
+class TypeaheadIndex:
+    """접두어 -> 항목 키 목록"""
+
+    def __init__(self):
+        self.entries = {}   # key -> {'label', 'sub', 'kind', 'url', 'rank', 'genre'}
+        self.prefixes = {}  # prefix -> [key, ...] (rank, label 순)
+        self.entry_prefixes = {}  # key -> {prefix, ...} (갱신 시 제거용)
+
+    def _sort_key(self, key):
+        entry = self.entries[key]
+        return entry['rank'], entry['label']
+
+    def _keys_for(self, label):
+        """이름 전체와 각 단어의 자모 분해, 초성 문자열의 접두어"""
+        terms = {decompose(label), initials(label)}
+        terms.update(decompose(word) for word in label.split())
+        prefixes = set()
+        for term in terms:
+            for i in range(1, min(len(term), MAX_PREFIX) + 1):
+                prefixes.add(term[:i])
+        return prefixes
+
+    def add(self, key, label, sub, kind, url, rank, genre=None, sort=True):
+        """항목 추가 (sort=False는 일괄 생성용 - 마지막에 finalize() 호출)"""
+        self.remove(key)
+        self.entries[key] = {'label': label, 'sub': sub, 'kind': kind, 'url': url, 'rank': rank, 'genre': genre}
+        prefixes = self._keys_for(label)
+        self.entry_prefixes[key] = prefixes
+        for prefix in prefixes:
+            bucket = self.prefixes.setdefault(prefix, [])
+            if sort:
+                bisect.insort(bucket, key, key=self._sort_key)
+            else:
+                bucket.append(key)
+
+    def finalize(self):
+        for bucket in self.prefixes.values():
+            bucket.sort(key=self._sort_key)
+
+    def remove(self, key):
+        for prefix in self.entry_prefixes.pop(key, ()):
+            bucket = self.prefixes.get(prefix)
+            if bucket and key in bucket:
+                bucket.remove(key)
+        self.entries.pop(key, None)
+
+    def search(self, query, limit=10):
+        prefix = decompose(query)[:MAX_PREFIX]
+        if not prefix:
+            return []
+        return [
+            {field: self.entries[k][field] for field in ('label', 'sub', 'kind', 'url')}
+            for k in self.prefixes.get(prefix, ())[:limit]
+        ]
+
+
+# 항목 종류별 정렬 우선순위 (테마 > 지점 > 장르)
+RANK_THEME, RANK_BRANCH, RANK_GENRE = 0, 1, 2
+
+_lock = threading.Lock()
+_state = {'index': None, 'version': None}
+
+
+def _add_theme(index, theme, sort=True):
+    index.add(
+        ('theme', theme.theme_id), theme.name,
+        f"{theme.branch.branch_name} · {theme.genre}", 'theme',
+        reverse('theme-detail', args=[theme.theme_id]), RANK_THEME,
+        genre=theme.genre, sort=sort,
+    )
+
+
+def _refresh_genres(index, sort=True):
+    """장르 항목은 현재 색인된 테마의 장르로 다시 구성"""
+    genres = {e['genre'] for k, e in index.entries.items() if k[0] == 'theme'}
+    for key in [k for k in index.entries if k[0] == 'genre' and k[1] not in genres]:
+        index.remove(key)
+    for genre in genres:
+        if ('genre', genre) not in index.entries:
+            index.add(('genre', genre), genre, '장르', 'genre',
+                      f"{reverse('theme-list')}?{urlencode({'genre': genre})}", RANK_GENRE, sort=sort)
+
+
+def _bookable_themes(theme_ids=None):
+    """예약 가능한 테마 (샤딩 시 모든 샤드에서 조회)"""
+    themes = Theme.objects.filter(is_active=True, status='Ready').select_related('branch')
+    if theme_ids is not None:
+        themes = themes.filter(theme_id__in=theme_ids)
+    return sharding.gather_queryset(themes)
+
+
+def build_index():
+    """전체 인덱스 생성"""
+    index = TypeaheadIndex()
+    for theme in _bookable_themes():
+        _add_theme(index, theme, sort=False)
+    for branch in Branch.objects.filter(is_active=True):
+        index.add(('branch', branch.branch_id), branch.branch_name, '지점', 'branch',
+                  f"{reverse('theme-list')}?branch={branch.branch_id}", RANK_BRANCH, sort=False)
+    _refresh_genres(index, sort=False)
+    index.finalize()
+    return index
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 0, None)
+        version = cache.get(VERSION_KEY) or 0
+    return version
+
+
+def _apply_theme_changes(index, theme_ids):
+    themes = {t.theme_id: t for t in _bookable_themes(theme_ids)}
+    for theme_id in theme_ids:
+        if theme_id in themes:
+            _add_theme(index, themes[theme_id])
+        else:
+            index.remove(('theme', theme_id))
+    _refresh_genres(index)
+
+
+def warm_up():
+    """
+    인덱스를 미리 생성 (선택 - gunicorn post_fork 훅 등에서 호출)
+    DB에 접속할 수 없으면 건너뛰고 첫 자동완성 요청 시 생성
+    """
+    try:
+        with _lock:
+            _state['version'] = _current_version()
+            _state['index'] = build_index()
+    except DatabaseError:
+        logger.warning("Typeahead warm-up skipped: database unavailable", exc_info=True)
+
+
+def get_index():
+    """
+    현재 프로세스의 인덱스 반환
+    다른 프로세스에서 테마가 바뀌었으면(버전 증가) 바뀐 테마만 다시 불러오고,
+    변경 목록이 만료되었으면 전체를 다시 생성
+    """
+    version = _current_version()
+    if _state['index'] is not None and _state['version'] == version:
+        return _state['index']
+
+    with _lock:
+        if _state['index'] is None or _state['version'] is None or version < _state['version']:
+            _state['index'] = build_index()
+        elif version > _state['version']:
+            keys = [CHANGE_KEY.format(v) for v in range(_state['version'] + 1, version + 1)]
+            changes = cache.get_many(keys)
+            if len(changes) == len(keys):
+                _apply_theme_changes(_state['index'], set(changes.values()))
+            else:
+                _state['index'] = build_index()
+        _state['version'] = version
+    return _state['index']
+
+
+def theme_changed(theme_id):
+    """테마 저장/삭제 시 호출 - 이 프로세스 인덱스를 즉시 갱신하고 다른 프로세스에 변경을 알림"""
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 0, None)
+        version = cache.incr(VERSION_KEY)
+    cache.set(CHANGE_KEY.format(version), theme_id, CHANGE_TTL)
+
+    with _lock:
+        if _state['index'] is not None and _state['version'] == version - 1:
+            _apply_theme_changes(_state['index'], {theme_id})
+            _state['version'] = version
+
+
+def branch_changed():
+    """지점 변경은 드물기 때문에 전체 재생성으로 처리 (변경 목록 없이 버전만 올림)"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+    # 다른 프로세스도 변경 목록이 없으므로 전체를 다시 생성
+    with _lock:
+        _state['index'] = None
+
+
+def suggest(query, limit=10):
+    return get_index().search(query, limit=limit)
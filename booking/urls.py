@@ -1,7 +1,7 @@
 # booking/urls.py
 from django.urls import path
 from django.contrib.auth import views as auth_views
-from . import views
+from . import views, api
 
 urlpatterns = [
     # 메인 페이지 (접속 시 바로 테마 목록 보여주기)
@@ -16,13 +16,19 @@ urlpatterns = [
     # 테마 및 리뷰
     path('themes/', views.theme_list_view, name='theme-list'),
     path('themes/<int:theme_id>/', views.theme_detail_view, name='theme-detail'),
+    path('themes/suggest/', views.theme_suggest_view, name='theme-suggest'),
+    path('themes/<int:theme_id>/reviews/', views.theme_reviews_view, name='theme-reviews'),
     path('review/create/<int:reservation_id>/', views.review_create_view, name='review-create'),
     path('review/update/<int:review_id>/', views.review_update_view, name='review-update'),
     path('review/delete/<int:review_id>/', views.review_delete_view, name='review-delete'),
+    path('review/helpful/<int:review_id>/', views.review_helpful_view, name='review-helpful'),
     
     # 예약
     path('reservation/create/<int:theme_id>/', views.reservation_create_view, name='reservation-create'),
+    path('reservation/checkout/<int:hold_id>/', views.reservation_checkout_view, name='reservation-checkout'),
     path('reservation/complete/<int:reservation_id>/', views.reservation_complete_view, name='reservation-complete'),
+    path('reservation/group/<int:branch_id>/', views.group_reservation_create_view, name='reservation-group-create'),
+    path('reservation/group/<int:branch_id>/complete/', views.group_reservation_complete_view, name='reservation-group-complete'),
     path('reservation/cancel/<int:reservation_id>/', views.reservation_cancel_view, name='reservation-cancel'),
     
     # 관리자 대시보드 (기본)
@@ -39,6 +45,7 @@ urlpatterns = [
     path('manager/schedule/create/', views.schedule_create_view, name='schedule-create'),
     path('manager/schedule/update/<int:schedule_id>/', views.schedule_update_view, name='schedule-update'), # [추가]
     path('manager/schedule/delete/<int:schedule_id>/', views.schedule_delete_view, name='schedule-delete'), # [추가]    
+    path('manager/schedule/copy/', views.schedule_copy_view, name='schedule-copy'),
     
     # 공지사항
     path('notices/', views.notice_list_view, name='notice-list'),
@@ -54,4 +61,14 @@ urlpatterns = [
 
     # 전체 통계 분석
     path('statistics/', views.admin_global_stats_view, name='admin-global-stats'),
+
+    # JSON API (읽기 전용, v1)
+    path('api/v1/branches/', api.branch_list_api, name='api-branches'),
+    path('api/v1/themes/', api.theme_list_api, name='api-themes'),
+    path('api/v1/themes/<int:theme_id>/', api.theme_detail_api, name='api-theme-detail'),
+    path('api/v1/themes/<int:theme_id>/availability/', api.theme_availability_api, name='api-theme-availability'),
+    path('api/v1/themes/<int:theme_id>/reviews/', api.theme_reviews_api, name='api-theme-reviews'),
+
+    # 모니터링 지표 (Prometheus)
+    path('metrics', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
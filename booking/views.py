@@ -1,33 +1,58 @@
 # booking/views.py
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
-from django.db.models import Count, Sum, Q, Avg, DecimalField, Value
+from django.db.models import Count, Sum, Q, DecimalField, Value, OuterRef, Subquery
 from django.db.models.functions import TruncDate, Coalesce
 from django.contrib.auth import logout, login, authenticate
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.exceptions import PermissionDenied
-from django.http import Http404
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
 from django.utils import timezone
 from django.contrib import messages
 from django.views.decorators.http import require_POST
+from collections import Counter
 from datetime import date, timedelta
+from operator import attrgetter
 
 # 모델과 폼 import
 from .models import *
-from .forms import ReviewForm, ReservationForm, IssueReportForm, ScheduleForm, BranchThemeUpdateForm, NoticeForm
+from . import sharding
+from .forms import ReviewForm, ReservationForm, IssueReportForm, ScheduleForm, ScheduleWeekCopyForm, BranchThemeUpdateForm, NoticeForm, group_reservation_formset
+from .scheduling import find_schedule_conflicts, copy_week_schedules
+from .forecast import get_branch_forecasts
+from .pricing import slot_start, upcoming_price_range, lowest_upcoming_price
+from .recommendation import recommendations_for_theme, recommendations_for_member
+from .facets import facet_counts
+from .typeahead import suggest
+from .page_cache import anonymous_page_cache
+from .notices import notice_feed, mark_read
+from .timeline import upcoming_reservations, past_reservations, member_reviews, member_counters, recent_theme_ids
+from .reviews import review_page, rating_summary, toggle_helpful, summary_avg_rating
+from .stamps import bump
+from .object_cache import get_theme, get_theme_or_404
+from .admission import rate_limit, login_id_and_ip, admit_booking
+from . import holds, metrics
+from .group_booking import book_group, GroupBookingError
 
 # 메인 & 테마 (Theme)
+@anonymous_page_cache(
+    ['themes', 'branches', 'reviews'],
+    params=('search_query', 'branch', 'genre', 'sort', 'difficulty', 'max_price'),
+    defaults={'sort': 'latest'},
+)
 def theme_list_view(request):
     search_query = request.GET.get('search_query', '')
     branch_id = request.GET.get('branch', '')
+    genre_filter = request.GET.get('genre', '')
     sort_by = request.GET.get('sort', 'latest')
     difficulty_filter = request.GET.get('difficulty', '')
     max_price_filter = request.GET.get('max_price', '')
     
     # 기본 쿼리셋
-    themes = Theme.objects.filter(is_active=True, status='Ready').annotate(
-        avg_rating=Coalesce(Avg('reservation__review__rating'), Value(0.0)),
-        review_count=Count('reservation__review')
+    themes = Theme.objects.filter(is_active=True, status='Ready').select_related('branch').annotate(
+        avg_rating=Coalesce(summary_avg_rating(), Value(0.0)),
+        review_count=Coalesce('review_summary__review_count', 0)
     )
     
     if search_query:
@@ -39,11 +64,18 @@ def theme_list_view(request):
     if branch_id:
         themes = themes.filter(branch_id=branch_id)
         
+    if genre_filter:
+        themes = themes.filter(genre=genre_filter)
+
     if difficulty_filter:
         themes = themes.filter(difficulty=difficulty_filter)
         
+    # 가격 캘린더 기준: 앞으로 예약 가능한 슬롯 중 최저 1인 가격 (캘린더가 없으면 할인 적용 기본 가격)
+    themes = themes.annotate(lowest_price=lowest_upcoming_price())
+
     if max_price_filter:
-        themes = themes.filter(price__lte=max_price_filter)
+        # 최저 가격이 상한 이하 = 상한 이하로 예약 가능한 슬롯이 있음
+        themes = themes.filter(lowest_price__lte=max_price_filter)
         
     if sort_by == 'rating':
         themes = themes.order_by('-avg_rating')
@@ -51,13 +83,26 @@ def theme_list_view(request):
         themes = themes.order_by('-review_count')
     else:
         themes = themes.order_by('-theme_id')
+
+    if sharding.enabled():
+        # 샤딩 시 모든 샤드에서 조회하여 같은 기준으로 다시 정렬
+        sort_field = {'rating': 'avg_rating', 'reviews': 'review_count'}.get(sort_by, 'theme_id')
+        themes = sorted(sharding.gather_queryset(themes), key=attrgetter(sort_field), reverse=True)
         
-    branches = Branch.objects.filter(is_active=True)
+    # 필터 항목별 테마 수 (지점 목록 포함, 필터 조합별 캐시)
+    facets = facet_counts(
+        search_query=search_query,
+        branch_id=branch_id,
+        genre=genre_filter,
+        difficulty=difficulty_filter,
+        max_price=max_price_filter,
+    )
 
     context = {
         'themes': themes,
-        'branches': branches,
+        'facets': facets,
         'selected_branch': branch_id,
+        'selected_genre': genre_filter,
         'search_query': search_query,
         'sort_by': sort_by,
         'selected_difficulty': difficulty_filter,
@@ -65,16 +110,57 @@ def theme_list_view(request):
     }
     return render(request, 'booking/theme_list.html', context)
 
+def theme_suggest_view(request):
+    """검색창 자동완성 (DB 조회 없이 메모리 인덱스에서 응답)"""
+    query = request.GET.get('q', '').strip()
+    results = suggest(query) if query else []
+    return JsonResponse({'query': query, 'results': results})
+
+@anonymous_page_cache(lambda theme_id: ['themes', f'theme:{theme_id}:reviews'], params=('sort',), defaults={'sort': 'newest'})
 def theme_detail_view(request, theme_id):
-    theme = get_object_or_404(Theme, theme_id=theme_id, is_active=True)
-    reviews = Review.objects.filter(reservation__theme=theme)
+    theme = get_theme_or_404(theme_id, is_active=True)
+    sort = request.GET.get('sort', 'newest')
+    reviews, next_cursor = review_page(theme, sort=sort)
     
     context = {
         'theme': theme,
         'reviews': reviews,
+        'next_cursor': next_cursor,
+        'review_sort': sort,
+        'rating_summary': rating_summary(theme),
+        'price_range': upcoming_price_range(theme),
+        'recommended_themes': recommendations_for_theme(theme),
     }
     return render(request, 'booking/theme_detail.html', context)
 
+def theme_reviews_view(request, theme_id):
+    """테마 상세 리뷰 '더 보기' (다음 페이지 HTML 조각)"""
+    theme = get_theme_or_404(theme_id, is_active=True)
+    sort = request.GET.get('sort', 'newest')
+    reviews, next_cursor = review_page(theme, sort=sort, cursor=request.GET.get('cursor'))
+    context = {
+        'theme': theme,
+        'reviews': reviews,
+        'next_cursor': next_cursor,
+        'review_sort': sort,
+    }
+    return render(request, 'booking/_review_items.html', context)
+
+@login_required
+@require_POST
+def review_helpful_view(request, review_id):
+    """리뷰 '도움돼요' 등록/취소"""
+    review = get_object_or_404(Review, review_id=review_id)
+    if review.member_id == request.user.pk:
+        messages.error(request, "본인의 리뷰에는 도움돼요를 누를 수 없습니다.")
+    elif toggle_helpful(review, request.user):
+        messages.success(request, "도움돼요를 눌렀습니다.")
+    else:
+        messages.success(request, "도움돼요를 취소했습니다.")
+    theme_id = review.theme_id
+    sharding.on_commit(lambda: bump(f'theme:{theme_id}:reviews'))
+    return redirect('theme-detail', theme_id=theme_id)
+
 # 회원 (Member: Signup, Login, Logout, MyPage)
 def signup_view(request):
     if request.method == 'POST':
@@ -121,6 +207,7 @@ def signup_view(request):
     else:
         return render(request, 'booking/signup.html')
 
+@rate_limit('login', login_id_and_ip)
 def login_view(request):
     context = {}
     if request.method == 'POST':
@@ -149,25 +236,35 @@ def logout_view(request):
 
 @login_required 
 def my_page_view(request):
-    reservations = Reservation.objects.filter(
-        member=request.user
-    ).order_by('-reservation_time')
+    try:
+        review_after = int(request.GET.get('review_after') or 0)
+    except ValueError:
+        raise Http404("잘못된 페이지입니다.")
 
-    reviews = Review.objects.filter(
-        member=request.user
-    ).order_by('-created_at')
+    past, next_cursor = past_reservations(request.user, cursor=request.GET.get('before'))
+    reviews, next_review_cursor = member_reviews(request.user, after=review_after)
+    upcoming = upcoming_reservations(request.user)
+
+    # 최근 이용한 테마 기준 추천
+    played_theme_ids = recent_theme_ids(request.user)
 
     context = {
-        'reservations': reservations,
+        'upcoming_reservations': upcoming,
+        'past_reservations': past,
+        'next_cursor': next_cursor,
         'reviews': reviews,
+        'next_review_cursor': next_review_cursor,
+        'counters': member_counters(request.user),
+        'recommended_themes': recommendations_for_member(played_theme_ids),
     }
     return render(request, 'booking/my_page.html', context)
 
 # 예약 (Reservation)
+# 예약 폼 제출 시 슬롯을 잠시 선점하고(booking/holds.py) 결제 화면에서 확정 - 결제 중에는 DB 트랜잭션을 열어 두지 않음
 @login_required
-@transaction.atomic
+@admit_booking
 def reservation_create_view(request, theme_id):
-    theme = get_object_or_404(Theme, theme_id=theme_id, is_active=True, status='Ready')
+    theme = get_theme_or_404(theme_id, is_active=True, status='Ready')
     
     if request.method == 'POST':
         form = ReservationForm(request.POST)
@@ -178,44 +275,12 @@ def reservation_create_view(request, theme_id):
             if reservation_time < timezone.now():
                 messages.error(request, '예약 시간은 현재 시간보다 이후여야 합니다.')
                 form.add_error('reservation_time', '지난 시간은 예약할 수 없습니다.')
-                
-            existing_reservation = Reservation.objects.filter(
-                theme=theme,
-                reservation_time=reservation_time,
-                status__in=['Confirmed', 'CheckedIn']
-            ).exists()
-            
-            if existing_reservation:
-                messages.error(request, '해당 시간은 이미 예약이 마감되었습니다.')
+            else:
+                hold = holds.acquire(theme, reservation_time, request.user, num_of_participants)
+                if hold is not None:
+                    return redirect('reservation-checkout', hold_id=hold.hold_id)
+                messages.error(request, '해당 시간은 이미 예약이 마감되었거나 다른 고객이 결제 중입니다.')
                 form.add_error('reservation_time', '이미 예약된 시간입니다.')
-
-            if form.errors:
-                 context = {'form': form, 'theme': theme}
-                 return render(request, 'booking/reservation_form.html', context)
-
-            try:
-                reservation = form.save(commit=False)
-                reservation.member = request.user
-                reservation.theme = theme
-                
-                total_price = theme.final_price * num_of_participants 
-                reservation.total_price = total_price
-                
-                reservation.save()
-                
-                Payment.objects.create(
-                    reservation=reservation,
-                    payment_method='가상 카드',
-                    amount=total_price,
-                    payment_status='Paid'
-                )
-                
-                messages.success(request, f'"{theme.name}" 예약이 완료되었습니다.')
-                return redirect('reservation-complete', reservation_id=reservation.reservation_id)
-            
-            except Exception as e:
-                messages.error(request, f'예약 중 오류가 발생했습니다. (Error: {e})')
-                
     else:
         form = ReservationForm()
     
@@ -225,6 +290,33 @@ def reservation_create_view(request, theme_id):
     }
     return render(request, 'booking/reservation_form.html', context)
 
+@login_required
+@admit_booking
+def reservation_checkout_view(request, hold_id):
+    """선점한 슬롯 결제 (확정 / 취소) - 선점 시간이 지나면 다시 예약 폼으로"""
+    hold = holds.get_active(hold_id, request.user)
+    if hold is None:
+        messages.error(request, '결제 가능 시간이 지났습니다. 다시 예약해주세요.')
+        return redirect('theme-list')
+
+    if request.method == 'POST':
+        if request.POST.get('action') == 'cancel':
+            holds.release(hold)
+            return redirect('theme-detail', theme_id=hold.theme_id)
+        reservation = holds.confirm(hold, request.user)
+        if reservation is None:
+            messages.error(request, '결제 가능 시간이 지나 다른 고객이 예약했습니다. 다른 시간을 선택해주세요.')
+            return redirect('reservation-create', theme_id=hold.theme_id)
+        messages.success(request, f'"{hold.theme.name}" 예약이 완료되었습니다.')
+        return redirect('reservation-complete', reservation_id=reservation.reservation_id)
+
+    context = {
+        'hold': hold,
+        'theme': hold.theme,
+        'remaining_seconds': max(0, int((hold.expires_at - timezone.now()).total_seconds())),
+    }
+    return render(request, 'booking/reservation_checkout.html', context)
+
 @login_required
 def reservation_complete_view(request, reservation_id):
     reservation = get_object_or_404(
@@ -237,6 +329,58 @@ def reservation_complete_view(request, reservation_id):
     }
     return render(request, 'booking/reservation_complete.html', context)
 
+# 단체 예약 - 한 지점의 여러 방을 한 번에 (전부 성공 또는 전부 실패, booking/group_booking.py)
+@login_required
+@admit_booking
+def group_reservation_create_view(request, branch_id):
+    branch = get_object_or_404(Branch, branch_id=branch_id, is_active=True)
+    max_rooms = getattr(settings, 'GROUP_BOOKING_MAX_ROOMS', 10)
+    rooms = request.GET.get('rooms', '')
+    rooms = min(int(rooms), max_rooms) if rooms.isdigit() and int(rooms) > 0 else 3
+    GroupReservationFormSet = group_reservation_formset(rooms, max_rooms)
+
+    if request.method == 'POST':
+        formset = GroupReservationFormSet(request.POST, form_kwargs={'branch': branch})
+        if formset.is_valid():
+            try:
+                reservations = book_group(request.user, formset.items())
+            except GroupBookingError as e:
+                messages.error(request, str(e))
+                failed = {(theme.pk, when) for theme, when in e.slots}
+                for form in formset.forms:
+                    if form.has_changed() and (form.cleaned_data['theme'].pk, form.cleaned_data['reservation_time']) in failed:
+                        form.add_error('reservation_time', '이미 예약된 시간입니다.')
+            else:
+                messages.success(request, f'{len(reservations)}개 방의 예약이 완료되었습니다.')
+                ids = ','.join(str(r.reservation_id) for r in reservations)
+                return redirect(f"{reverse('reservation-group-complete', args=[branch.branch_id])}?ids={ids}")
+    else:
+        formset = GroupReservationFormSet(form_kwargs={'branch': branch})
+
+    context = {
+        'branch': branch,
+        'formset': formset,
+        'rooms': rooms,
+        'max_rooms': max_rooms,
+    }
+    return render(request, 'booking/group_reservation_form.html', context)
+
+@login_required
+def group_reservation_complete_view(request, branch_id):
+    ids = [int(i) for i in request.GET.get('ids', '').split(',') if i.isdigit()]
+    reservations = list(Reservation.objects.filter(
+        reservation_id__in=ids, member=request.user, theme__branch_id=branch_id,
+    ).select_related('theme__branch').order_by('reservation_time', 'theme__name'))
+    if not reservations:
+        raise Http404("예약을 찾을 수 없습니다.")
+    context = {
+        'branch': reservations[0].theme.branch,
+        'reservations': reservations,
+        'total_price': sum(r.total_price for r in reservations),
+        'total_participants': sum(r.num_of_participants for r in reservations),
+    }
+    return render(request, 'booking/group_reservation_complete.html', context)
+
 @login_required
 @require_POST
 def reservation_cancel_view(request, reservation_id):
@@ -276,14 +420,14 @@ def review_create_view(request, reservation_id):
             review.member = request.user
             review.reservation = reservation
             review.save()
-            return redirect('theme-detail', theme_id=reservation.theme.theme_id)
+            return redirect('theme-detail', theme_id=reservation.theme_id)
     else:
         form = ReviewForm()
 
     context = {
         'form': form,
         'reservation': reservation,
-        'theme': reservation.theme,
+        'theme': get_theme(reservation.theme_id),
     }
     return render(request, 'booking/review_form.html', context)
 
@@ -298,14 +442,14 @@ def review_update_view(request, review_id):
         form = ReviewForm(request.POST, instance=review)
         if form.is_valid():
             form.save()
-            return redirect('theme-detail', theme_id=review.reservation.theme.theme_id)
+            return redirect('theme-detail', theme_id=review.reservation.theme_id)
     else:
         form = ReviewForm(instance=review) 
 
     context = {
         'form': form,
         'review': review,
-        'theme': review.reservation.theme,
+        'theme': get_theme(review.reservation.theme_id),
     }
     return render(request, 'booking/review_form.html', context)
 
@@ -316,11 +460,15 @@ def theme_manager_dashboard_view(request):
         raise PermissionDenied("테마 관리자 권한이 필요합니다.")
     
     if request.user.role == 'Admin':
-        target_branch_ids = Branch.objects.filter(is_active=True).values_list('branch_id', flat=True)
+        # 샤딩 시에는 현재 샤드(?branch=로 선택)의 지점만
+        target_branch_ids = sharding.local_branch_ids(
+            Branch.objects.filter(is_active=True).values_list('branch_id', flat=True)
+        )
     else:
-        target_branch_ids = BranchAssignment.objects.filter(
+        # 지점 배정은 전역 DB에 있으므로 (샤딩 시) 서브쿼리 대신 ID 목록으로 조회
+        target_branch_ids = list(BranchAssignment.objects.filter(
             member=request.user
-        ).values_list('branch_id', flat=True)
+        ).values_list('branch_id', flat=True))
 
     # 시설 문제 보고 처리 (POST)
     if request.method == 'POST':
@@ -341,10 +489,10 @@ def theme_manager_dashboard_view(request):
 
     today = date.today()
     
-    reservations = Reservation.objects.filter(
+    reservations = sharding.join_global(Reservation.objects.filter(
         reservation_time__date=today,
         theme__branch_id__in=target_branch_ids
-    ).select_related('member', 'theme', 'theme__branch').order_by('reservation_time')
+    ), 'member').select_related('theme', 'theme__branch').order_by('reservation_time')
     
     stats = {
         'total': reservations.count(),
@@ -354,10 +502,10 @@ def theme_manager_dashboard_view(request):
         'cancelled': reservations.filter(status='Cancelled').count(),
     }
     
-    recent_issues = IssueReport.objects.filter(
+    recent_issues = sharding.join_global(IssueReport.objects.filter(
         status__in=['Reported', 'InProgress'],
         theme__branch_id__in=target_branch_ids
-    ).select_related('theme', 'reported_by_member').order_by('-reported_at')[:5]
+    ), 'reported_by_member').select_related('theme').order_by('-reported_at')[:5]
 
     themes = Theme.objects.filter(
         branch_id__in=target_branch_ids
@@ -389,13 +537,17 @@ def branch_manager_dashboard_view(request):
     
     # 접속한 사용자의 권한에 따라 조회할 지점 목록 필터링
     if request.user.role == 'Admin':
-        # 총괄 관리자는 모든 활성 지점 조회
-        branches = Branch.objects.filter(is_active=True)
+        # 총괄 관리자는 모든 활성 지점 조회 (샤딩 시에는 현재 샤드의 지점만)
+        branches = Branch.objects.filter(
+            branch_id__in=sharding.local_branch_ids(
+                Branch.objects.filter(is_active=True).values_list('branch_id', flat=True)
+            )
+        )
     else:
         # 지점 관리자는 본인이 배정된 지점만 조회
-        assigned_branch_ids = BranchAssignment.objects.filter(
+        assigned_branch_ids = list(BranchAssignment.objects.filter(
             member=request.user
-        ).values_list('branch_id', flat=True)
+        ).values_list('branch_id', flat=True))
         
         branches = Branch.objects.filter(
             branch_id__in=assigned_branch_ids,
@@ -433,11 +585,11 @@ def branch_manager_dashboard_view(request):
     week_end = today + timedelta(days=7)
     
     # 스케줄 조회 시 내 지점(branches)에 해당하는 것만 필터링
-    schedules = Schedule.objects.filter(
+    schedules = sharding.join_global(Schedule.objects.filter(
         branch__in=branches,
         work_date__gte=week_start,
         work_date__lte=week_end
-    ).select_related('member', 'branch', 'assigned_theme').order_by('work_date', 'start_time')
+    ), 'member').select_related('branch', 'assigned_theme').order_by('work_date', 'start_time')
     
     # 내 지점(branches)에 해당하는 테마만 필터링
     theme_stats = Theme.objects.filter(
@@ -452,16 +604,17 @@ def branch_manager_dashboard_view(request):
                 reservation__status='Completed'
             )
         ),
-        avg_rating=Avg(
-            'reservation__review__rating',
-            filter=Q(reservation__status='Completed')
-        )
+        avg_rating=summary_avg_rating()
     ).order_by('-reservation_count')[:10]
     
+    # 향후 수요 예측 (지점별 캐시)
+    forecast = get_branch_forecasts([branch.branch_id for branch in branches])
+    
     context = {
         'branch_sales': branch_sales,
         'schedules': schedules,
         'theme_stats': theme_stats,
+        'forecast': forecast,
         'month_start': month_start,
         'month_end': month_end,
         'week_start': week_start,
@@ -475,20 +628,21 @@ def branch_theme_update_view(request, theme_id):
     if request.user.role not in ['BranchManager', 'Admin']:
         raise PermissionDenied("지점 관리자 권한이 필요합니다.")
         
-    theme = get_object_or_404(Theme, theme_id=theme_id)
+    theme = get_theme_or_404(theme_id)
     
     # 담당 지점인지 확인
     if request.user.role == 'BranchManager':
         has_permission = BranchAssignment.objects.filter(
             member=request.user,
-            branch=theme.branch
+            branch_id=theme.branch_id
         ).exists()
         
         if not has_permission:
             raise PermissionDenied("본인이 담당하는 지점의 테마만 수정할 수 있습니다.")
 
     if request.method == 'POST':
-        form = BranchThemeUpdateForm(request.POST, instance=theme)
+        # 저장은 캐시 사본이 아닌 DB의 최신 행으로
+        form = BranchThemeUpdateForm(request.POST, instance=get_object_or_404(Theme, theme_id=theme_id))
         if form.is_valid():
             form.save()
             messages.success(request, "테마 정보가 수정되었습니다.")
@@ -507,37 +661,70 @@ def admin_global_stats_view(request):
     if request.user.role != 'Admin':
         raise PermissionDenied("총괄 관리자 권한이 필요합니다.")
         
-    branch_stats = Branch.objects.filter(is_active=True).annotate(
-        total_sales=Coalesce(
-            Sum('theme__reservation__payment__amount', 
-                filter=Q(theme__reservation__payment__payment_status='Paid')), 
-            0,
-            output_field=DecimalField()
-        ),
-        total_reservations=Count('theme__reservation',
-                                 filter=Q(theme__reservation__status='Completed')),
-        active_theme_count=Count('theme', filter=Q(theme__is_active=True))
-    ).order_by('-total_sales')
-    
-    themes_with_counts = Theme.objects.filter(is_active=True).annotate(
-        res_count=Count('reservation', filter=Q(reservation__status='Completed')),
-        avg_score=Avg('reservation__review__rating')
-    )
-    
-    best_themes = themes_with_counts.order_by('-res_count')[:5]
-    worst_themes = themes_with_counts.order_by('res_count')[:5]
-    
     end_date = timezone.now().date()
     start_date = end_date - timedelta(days=29)
 
-    res_queryset = Reservation.objects.filter(
-        reservation_time__date__range=(start_date, end_date)
-    ).annotate(
-        date=TruncDate('reservation_time')
-    ).values('date').annotate(
-        count=Count('reservation_id')
-    )
-    res_dict = {item['date']: item['count'] for item in res_queryset}
+    def shard_stats():
+        # 보관된 예약(booking/archive.py)은 테마별 누적 통계로 합산
+        archived = ThemeArchiveTotals.objects.filter(theme__branch=OuterRef('pk')).values('theme__branch')
+        branch_stats = Branch.objects.filter(is_active=True).annotate(
+            total_sales=Coalesce(
+                Sum('theme__reservation__payment__amount', 
+                    filter=Q(theme__reservation__payment__payment_status='Paid')), 
+                0,
+                output_field=DecimalField()
+            ) + Coalesce(
+                Subquery(archived.annotate(total=Sum('paid_amount')).values('total')), 0, output_field=DecimalField()
+            ),
+            total_reservations=Count('theme__reservation',
+                                     filter=Q(theme__reservation__status='Completed'))
+            + Coalesce(Subquery(archived.annotate(total=Sum('completed_count')).values('total')), 0),
+            active_theme_count=Count('theme', filter=Q(theme__is_active=True))
+        ).order_by('-total_sales')
+
+        themes_with_counts = Theme.objects.filter(is_active=True).select_related('branch').annotate(
+            res_count=Count('reservation', filter=Q(reservation__status='Completed'))
+            + Coalesce('archive_totals__completed_count', 0),
+            avg_score=summary_avg_rating()
+        )
+
+        res_queryset = Reservation.objects.filter(
+            reservation_time__date__range=(start_date, end_date)
+        ).annotate(
+            date=TruncDate('reservation_time')
+        ).values('date').annotate(
+            count=Count('reservation_id')
+        )
+        return {
+            'branch_stats': list(branch_stats),
+            'best_themes': list(themes_with_counts.order_by('-res_count')[:5]),
+            'worst_themes': list(themes_with_counts.order_by('res_count')[:5]),
+            'daily_reservations': {item['date']: item['count'] for item in res_queryset},
+        }
+
+    # 샤드별 집계를 합침 (샤딩을 쓰지 않으면 결과 하나) - 지점은 모든 샤드에 복제되어 있으므로 지점별로 더함
+    results = sharding.gather(shard_stats)
+    branches = {}
+    for result in results:
+        for stat in result['branch_stats']:
+            merged = branches.setdefault(stat.branch_id, stat)
+            if merged is not stat:
+                merged.total_sales += stat.total_sales
+                merged.total_reservations += stat.total_reservations
+                merged.active_theme_count += stat.active_theme_count
+    branch_stats = sorted(branches.values(), key=attrgetter('total_sales'), reverse=True)
+
+    # 전체 상위/하위 5개는 각 샤드의 상위/하위 5개 안에 있음
+    best_themes = sorted(
+        (t for result in results for t in result['best_themes']), key=attrgetter('res_count'), reverse=True
+    )[:5]
+    worst_themes = sorted(
+        (t for result in results for t in result['worst_themes']), key=attrgetter('res_count')
+    )[:5]
+
+    res_dict = Counter()
+    for result in results:
+        res_dict.update(result['daily_reservations'])
 
     signup_queryset = Member.objects.filter(
         created_at__date__range=(start_date, end_date)
@@ -570,6 +757,7 @@ def admin_global_stats_view(request):
         'worst_themes': worst_themes,
         'daily_reservations': daily_reservations, # 0이 채워진 리스트 전달
         'daily_signups': daily_signups,           # 0이 채워진 리스트 전달
+        'hold_metrics': holds.hold_metrics(),
         'start_date': start_date,
         'end_date': end_date,
     }
@@ -666,18 +854,71 @@ def schedule_create_view(request):
                 if not is_my_branch:
                     raise PermissionDenied("본인이 담당하는 지점의 스케줄만 등록할 수 있습니다.")
             
-            schedule.save()
-            return redirect('branch-manager-stats')
+            # 같은 직원 / 같은 테마의 근무 시간 겹침 확인
+            conflicts = find_schedule_conflicts([schedule])
+            if conflicts:
+                for message in conflicts:
+                    form.add_error(None, message)
+            else:
+                schedule.save()
+                return redirect('branch-manager-stats')
     else:
         form = ScheduleForm(user=request.user)
         
     context = {'form': form}
     return render(request, 'booking/schedule_form.html', context)
 
+@login_required
+def schedule_copy_view(request):
+    """지난 주 스케줄 복사 / 한 주 스케줄을 N주 동안 반복 적용"""
+    if request.user.role not in ['BranchManager', 'Admin']:
+        raise PermissionDenied("지점 관리자 권한이 필요합니다.")
+
+    conflicts = []
+    if request.method == 'POST':
+        form = ScheduleWeekCopyForm(request.POST, user=request.user)
+        if form.is_valid():
+            created, conflicts = copy_week_schedules(
+                branch=form.cleaned_data['branch'],
+                source_week_start=form.cleaned_data['source_week_start'],
+                target_week_start=form.cleaned_data['target_week_start'],
+                weeks=form.cleaned_data['weeks'],
+            )
+            if not conflicts:
+                messages.success(request, f"스케줄 {created}건이 등록되었습니다.")
+                return redirect('branch-manager-stats')
+            messages.error(request, f"충돌하는 스케줄 {len(conflicts)}건이 있어 등록하지 않았습니다.")
+    else:
+        # 기본값: 지난 주(월요일 시작) 스케줄을 이번 주에 복사
+        this_monday = date.today() - timedelta(days=date.today().weekday())
+        form = ScheduleWeekCopyForm(user=request.user, initial={
+            'source_week_start': this_monday - timedelta(days=7),
+            'target_week_start': this_monday,
+            'weeks': 1,
+        })
+
+    context = {'form': form, 'conflicts': conflicts}
+    return render(request, 'booking/schedule_copy_form.html', context)
+
 # 공지사항 (Notice)
+@anonymous_page_cache(['notices', 'branches'], params=('after',))
 def notice_list_view(request):
-    notices = Notice.objects.all().order_by('-created_at')
-    context = {'notices': notices}
+    try:
+        after = int(request.GET.get('after') or 0)
+    except ValueError:
+        raise Http404("잘못된 페이지입니다.")
+
+    notices, next_cursor = notice_feed(request.user, after=after)
+    read_upto = request.user.last_read_notice_id if request.user.is_authenticated else None
+    # 첫 페이지를 보면 최신 공지까지 읽은 것으로 처리
+    if not after and notices:
+        mark_read(request.user, notices[0].notice_id)
+
+    context = {
+        'notices': notices,
+        'next_cursor': next_cursor,
+        'read_upto': read_upto,
+    }
     return render(request, 'booking/notice_list.html', context)
 
 # 리뷰 삭제 (Review Delete)
@@ -689,7 +930,7 @@ def review_delete_view(request, review_id):
     if review.member != request.user:
         raise PermissionDenied("본인의 리뷰만 삭제할 수 있습니다.")
     
-    theme_id = review.reservation.theme.theme_id
+    theme_id = review.reservation.theme_id
     review.delete()
     messages.success(request, "리뷰가 삭제되었습니다.")
 
@@ -797,9 +1038,14 @@ def schedule_update_view(request, schedule_id):
                  if not is_still_my_branch:
                      raise PermissionDenied("본인 담당 지점으로만 설정 가능합니다.")
             
-            updated_schedule.save()
-            messages.success(request, "스케줄이 수정되었습니다.")
-            return redirect('branch-manager-stats')
+            conflicts = find_schedule_conflicts([updated_schedule], exclude_ids=[updated_schedule.schedule_id])
+            if conflicts:
+                for message in conflicts:
+                    form.add_error(None, message)
+            else:
+                updated_schedule.save()
+                messages.success(request, "스케줄이 수정되었습니다.")
+                return redirect('branch-manager-stats')
     else:
         form = ScheduleForm(instance=schedule, user=request.user)
         
@@ -827,4 +1073,13 @@ def schedule_delete_view(request, schedule_id):
     schedule.delete()
     messages.success(request, "스케줄이 삭제되었습니다.")
     
-    return redirect('branch-manager-stats')
\ No newline at end of file
+    return redirect('branch-manager-stats')
+
+# 모니터링 지표 (Prometheus 텍스트 형식, booking/metrics.py)
+def metrics_view(request):
+    allowed = getattr(settings, 'METRICS_ALLOWED_IPS', None)
+    # 요청 제한용 client_ip(프록시 헤더)가 아니라 실제 접속 주소로 확인 (헤더는 클라이언트가 보낼 수 있음)
+    if allowed is not None and request.META.get('REMOTE_ADDR') not in allowed:
+        raise PermissionDenied("지표를 조회할 수 없는 주소입니다.")
+    body, content_type = metrics.exposition()
+    return HttpResponse(body, content_type=content_type)
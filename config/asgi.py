@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# 운영 환경에서는 템플릿을 미리 컴파일하여 첫 요청의 파싱 비용 제거
+from django.conf import settings  # noqa: E402
+
+if settings.TEMPLATE_PRECOMPILE:
+    from booking.template_profiler import precompile_templates  # noqa: E402
+
+    precompile_templates()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,13 +42,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'booking.metrics.MetricsMiddleware',
+    'booking.query_count.QueryCountMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'booking.sharding.ShardMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'booking.template_profiler.TemplateProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -62,6 +67,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'booking.context_processors.notices',
             ],
         },
     },
@@ -84,8 +90,30 @@ DATABASES = {
     }
 }
 
+# Cache
+# 과부하 보호(booking/admission.py), 슬롯 선점 집계, API 스탬프, 페이지 / 테마 / 필터 개수 캐시가 공유하는 상태
+# 워커 프로세스 / 서버가 여러 개이면 REDIS_URL(예: redis://localhost:6379/0)로 공유 캐시를 지정할 것
+# 지정하지 않으면 프로세스별 LocMem (runserver 등 단일 프로세스 전용 - booking.W001 경고)
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 AUTH_USER_MODEL = 'booking.Member'
 
+# 지점 기준 샤딩 (booking/sharding.py) - BRANCH_SHARDS가 비어 있으면 default 하나만 사용
+DATABASE_ROUTERS = ['booking.sharding.BranchShardRouter']
+
 LOGIN_URL = 'login'
 
 # Password validation
@@ -123,10 +151,132 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic 시 해시 파일명 + gzip/zstd 압축본 생성 (booking/staticfiles.py)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'booking.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+STATIC_COMPRESS_EXTENSIONS = ['.css', '.js', '.svg', '.json', '.map', '.txt']
+STATIC_COMPRESS_MIN_SIZE = 256  # 바이트, 이보다 작은 파일은 압축본을 만들지 않음
+# 앞단 웹서버 없이 앱에서 정적 파일을 직접 서빙할 때 True (압축본 선택 + immutable 캐시 헤더)
+STATIC_SERVE_IN_APP = False
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# 지난 예약 자동 정리 (booking/sweeper.py)
+RESERVATION_SWEEP_BATCH_SIZE = 500
+RESERVATION_SWEEP_INTERVAL_MINUTES = 10
+
+
+# 테마 수요 예측 (booking/forecast.py)
+FORECAST_LOOKBACK_WEEKS = 12
+FORECAST_HORIZON_WEEKS = 4
+FORECAST_DECAY = 0.85
+FORECAST_CACHE_SECONDS = 6 * 60 * 60
+FORECAST_REBUILD_HOUR = 4
+
+# 테마 가격 캘린더 (booking/pricing.py)
+PRICE_CALENDAR_DAYS = 30
+PRICE_CALENDAR_HOURS = list(range(10, 24))  # 슬롯 시작 시각 (정시)
+PRICE_DEMAND_SURCHARGE_RATE = 0  # 예상 수요 100%일 때의 할증률 (%), 0이면 미사용
+
+# 테마 추천 (booking/recommendation.py)
+RECOMMENDATION_TOP_K = 5
+RECOMMENDATION_CHUNK_SIZE = 20000  # X^T X 계산 시 한 번에 처리할 회원 수
+RECOMMENDATION_REBUILD_HOUR = 5
+
+# 테마 목록 필터 개수 (booking/facets.py)
+FACET_PRICE_BANDS = [20000, 25000, 30000, 40000]
+FACET_CACHE_SECONDS = 600
+
+# 비로그인 전체 페이지 캐시 (booking/page_cache.py)
+PAGE_CACHE_SECONDS = 300
+PAGE_CACHE_STALE_SECONDS = 30  # 만료 후 다시 렌더링하는 동안 이전 페이지를 응답하는 시간
+PAGE_CACHE_LOCK_SECONDS = 10
+PAGE_CACHE_WAIT_SECONDS = 2
+PAGE_CACHE_PROXY_SECONDS = 30  # 앞단 프록시 캐시 시간 (Cache-Control max-age)
+
+# 템플릿 렌더링 프로파일러 (booking/template_profiler.py)
+TEMPLATE_PROFILER_ENABLED = False  # True이면 관리자(또는 DEBUG) 요청에 ?_profile 을 붙여 측정
+TEMPLATE_PROFILER_PARAM = '_profile'
+TEMPLATE_PRECOMPILE = not DEBUG  # 서버 시작 시 모든 템플릿을 미리 컴파일 (cached loader)
+
+# 공지사항 피드 (booking/notices.py)
+NOTICE_PAGE_SIZE = 20
+NOTICE_UNREAD_MAX = 100  # 안 읽은 공지 수 상한 (초과 시 "99+")
+NOTICE_UNREAD_CACHE_SECONDS = 24 * 60 * 60
+
+# 마이페이지 타임라인 (booking/timeline.py)
+TIMELINE_PAGE_SIZE = 10
+TIMELINE_UPCOMING_LIMIT = 20
+TIMELINE_COUNTERS_CACHE_SECONDS = 60 * 60
+
+# 테마 리뷰 피드 (booking/reviews.py)
+REVIEW_PAGE_SIZE = 10
+
+# 관리자 대용량 목록 (booking/paginators.py)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100_000  # 예상 행 수가 이보다 적으면 정확히 COUNT
+
+# 오래된 종료 예약 보관 (booking/archive.py)
+ARCHIVE_ROOT = BASE_DIR / 'archive'  # 세그먼트 파일 저장 위치 (백업 대상)
+ARCHIVE_RETENTION_DAYS = 365  # 이보다 오래된 이용 완료/취소/노쇼 예약을 보관
+ARCHIVE_BATCH_SIZE = 5000  # 세그먼트(트랜잭션) 하나당 예약 수
+ARCHIVE_COMPRESSION_LEVEL = 10
+ARCHIVE_HOUR = 3
+
+# 이벤트 로그 (booking/events.py)
+EVENT_LOG_BATCH_SIZE = 1000
+EVENT_LOG_RETENTION_DAYS = 90  # 모든 소비자가 처리한 이벤트 중 이보다 오래된 것은 삭제
+
+# 지점 기준 샤딩 (booking/sharding.py)
+# 예) DATABASES에 'shard_0', 'shard_1'(SQLite 파일 또는 PostgreSQL DB)을 추가하고
+#     BRANCH_SHARDS = ['shard_0', 'shard_1'] 로 지정한 뒤
+#     migrate --database=default / shard_0 / shard_1, init_shards 순서로 실행
+BRANCH_SHARDS = []
+BRANCH_SHARD_MAP = {}  # {branch_id: 샤드 별칭} - 없으면 branch_id % 샤드 수
+SHARD_ID_SPAN = 100_000_000  # 샤드 i의 PK는 i * SHARD_ID_SPAN + 1 부터 (PK로 샤드를 찾음)
+
+# 테마 객체 캐시 (booking/object_cache.py)
+THEME_CACHE_SECONDS = 60 * 60  # 공유 캐시 (버전 키이므로 변경 시 자동으로 새 키)
+THEME_CACHE_L1_SECONDS = 5  # 프로세스 내 L1 - 다른 프로세스의 변경은 이 시간 안에 반영
+
+# 부하 테스트 (booking/loadtest.py, booking/query_count.py)
+QUERY_COUNT_HEADER = False  # True이면 응답에 X-Query-Count 헤더 (부하 테스트 대상 서버에서만 켤 것)
+LOAD_TEST_RESULTS_DIR = BASE_DIR / 'loadtest' / 'results'  # 실행 결과(JSON) 저장 위치 - 버전 간 비교용
+
+# 과부하 보호 - 요청 제한 / 예약 동시 실행 제한 (booking/admission.py)
+ADMISSION_ENABLED = True
+RATE_LIMITS = {  # {경로: {범위: (burst, period초)}} - period초마다 burst개 충전되는 토큰 버킷
+    'login': {'ip': (30, 60), 'login_id': (5, 60)},
+    'reservation': {'ip': (60, 60), 'member': (10, 60)},  # 예약 한 건 = 예약 폼 + 결제 확정 POST 두 번
+}
+RATE_LIMIT_IP_HEADER = 'REMOTE_ADDR'  # 프록시 뒤라면 'HTTP_X_FORWARDED_FOR'
+RATE_LIMIT_TRUSTED_PROXY_HOPS = 1  # X-Forwarded-For를 덧붙이는 신뢰하는 프록시 수 (오른쪽에서 이 번째 주소 사용)
+BOOKING_CONCURRENCY = 8  # 모든 서버 합계 동시에 처리할 예약 요청 수
+BOOKING_QUEUE_SIZE = 32  # 자리를 기다릴 수 있는 요청 수 (넘으면 바로 429)
+BOOKING_QUEUE_TIMEOUT = 2.0  # 대기열에서 기다리는 최대 시간 (초)
+BOOKING_SLOT_LEASE_SECONDS = 30  # 요청 처리 중 서버가 죽었을 때 자리가 반환되는 시간
+
+# 결제 중 슬롯 임시 선점 (booking/holds.py)
+SLOT_HOLD_SECONDS = 5 * 60  # 예약 폼 제출 후 결제를 마칠 때까지 슬롯을 확보해 두는 시간
+SLOT_HOLD_SWEEP_INTERVAL_MINUTES = 1
+
+# 단체 예약 (booking/group_booking.py)
+GROUP_BOOKING_MAX_ROOMS = 10  # 한 번에 예약할 수 있는 방(테마 / 시간) 수
+
+# 가격 캠페인 (booking/campaigns.py)
+PRICE_CAMPAIGN_INTERVAL_MINUTES = 1  # 시작 / 종료 시각이 된 캠페인을 확인하는 주기
+
+# 모니터링 지표 - /metrics (booking/metrics.py)
+METRICS_ENABLED = True  # 뷰별 응답 시간 / 요청당 쿼리 수 수집 (MetricsMiddleware)
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']  # /metrics를 조회할 수 있는 접속 주소 (REMOTE_ADDR, None이면 제한 없음)
+# 여러 워커 프로세스 + 스케줄러의 지표를 합산할 공유 디렉터리 (프로세스별 mmap 파일, 서버 시작 전에 비울 것)
+# None이면 환경 변수 PROMETHEUS_MULTIPROC_DIR, 둘 다 없으면 프로세스 내 레지스트리 (runserver 등 단일 프로세스)
+METRICS_MULTIPROC_DIR = None
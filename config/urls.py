@@ -1,10 +1,19 @@
 # escape_room_project/urls.py
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include # include 추가
+from django.urls import path, re_path, include # include 추가
+
+from booking.staticfiles import serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     # '' (루트) 경로를 포함한 모든 booking 관련 URL을
     # booking/urls.py 파일에서 관리하도록 위임
     path('', include('booking.urls')), 
-]
\ No newline at end of file
+]
+
+# 앱에서 정적 파일 직접 서빙 (collectstatic 결과물, 압축본 우선)
+if settings.STATIC_SERVE_IN_APP:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve_static),
+    ]